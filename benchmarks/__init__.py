@@ -0,0 +1,20 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+Performance benchmarks.
+
+These are not run as a part of the test suite.
+Run each one separately, e.g. `python -m benchmarks.properties_parse`.
+"""
+
+from collections.abc import Callable
+from timeit import repeat
+
+
+def best_time(fn: Callable[[], object], number: int = 1, repeats: int = 5) -> float:
+    """
+    The best time in seconds of `repeats` runs, each calling `fn` `number` times.
+    """
+    return min(repeat(fn, number=number, repeat=repeats)) / number
@@ -0,0 +1,73 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+Measure how `add_entries` scales with the size of the merged resources.
+
+The time per source entry should remain roughly constant as size grows.
+"""
+
+from collections.abc import Callable
+
+from moz_l10n import Comment, Entry, Resource, Section, add_entries
+
+from . import best_time
+
+
+def source_resource(size: int, section_size: int) -> Resource[str, None]:
+    sections: list[Section[str, None]] = []
+    for start in range(0, size, section_size):
+        entries: list[Entry[str, None] | Comment] = [
+            Entry([f"entry-{i}"], f"Value {i}")
+            for i in range(start, min(size, start + section_size))
+        ]
+        sections.append(Section([f"section-{start}"], entries))
+    return Resource(sections)
+
+
+def target_resource(source: Resource[str, None], keep: int) -> Resource[str, None]:
+    """
+    A copy of `source` which includes only every `keep`th entry,
+    and no empty sections.
+    """
+    sections: list[Section[str, None]] = []
+    n = 0
+    for section in source.sections:
+        entries: list[Entry[str, None] | Comment] = []
+        for entry in section.entries:
+            assert isinstance(entry, Entry)
+            if n % keep == 0:
+                entries.append(Entry(entry.id, f"Translated {entry.value}"))
+            n += 1
+        if entries:
+            sections.append(Section(section.id, entries))
+    return Resource(sections)
+
+
+def merge(source: Resource[str, None], keep: int) -> Callable[[], int]:
+    def fn() -> int:
+        return add_entries(target_resource(source, keep), source)
+
+    return fn
+
+
+def main() -> None:
+    cases = [
+        ("large", 1, 2),
+        ("sparse", 1, 100),
+        ("sectioned", 5, 20),
+    ]
+    print(f"{'case':>10} {'entries':>8} {'time':>10} {'per entry':>10}")
+    for name, section_size, keep in cases:
+        for size in (1_000, 10_000, 100_000):
+            source = source_resource(size, section_size if section_size > 1 else size)
+            copy_time = best_time(lambda: target_resource(source, keep), repeats=3)
+            time = best_time(merge(source, keep), repeats=3) - copy_time
+            print(
+                f"{name:>10} {size:>8} {time * 1e3:>8.2f}ms {time / size * 1e6:>8.2f}µs"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+Compare merging one source into many locales with `add_entries_bulk`,
+serially and in a process pool, against calling `add_entries` for each locale.
+"""
+
+from time import perf_counter
+
+from moz_l10n import Resource, add_entries, add_entries_bulk
+
+from .add_entries import source_resource, target_resource
+
+
+def locale_targets(
+    source: Resource[str, None], count: int
+) -> list[Resource[str, None]]:
+    return [target_resource(source, 2 + i % 10) for i in range(count)]
+
+
+def main() -> None:
+    source = source_resource(20_000, 20)
+    print(f"{'locales':>8} {'add_entries':>12} {'bulk':>10} {'bulk pool':>10}")
+    for count in (10, 100):
+        targets = locale_targets(source, count)
+        start = perf_counter()
+        for target in targets:
+            add_entries(target, source)
+        t_each = perf_counter() - start
+
+        targets = locale_targets(source, count)
+        start = perf_counter()
+        add_entries_bulk(targets, source)
+        t_bulk = perf_counter() - start
+
+        targets = locale_targets(source, count)
+        start = perf_counter()
+        add_entries_bulk(targets, source, processes=None)
+        t_pool = perf_counter() - start
+
+        print(f"{count:>8} {t_each:>11.2f}s {t_bulk:>9.2f}s {t_pool:>9.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+Measure how `compare_locales()` scales with the number of worker processes,
+comparing a generated tree of files in many locales with its reference.
+"""
+
+from os import cpu_count, makedirs
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+from time import perf_counter
+
+from l10n_parser import compare_locales
+
+from .l10n_parser_walk import dtd_source, properties_source
+
+
+def write_tree(root: str, locales: int, files: int) -> None:
+    sources = {
+        "app.properties": properties_source(200),
+        "app.dtd": dtd_source(200),
+    }
+    for locale in ["en-US"] + [f"locale-{n}" for n in range(locales)]:
+        for n in range(files):
+            dir = join(root, locale, f"dir-{n}")
+            makedirs(dir, exist_ok=True)
+            for name, source in sources.items():
+                if locale != "en-US":
+                    source = source.replace("Value", "Wert")
+                with open(join(dir, name), "w", encoding="utf-8") as file:
+                    file.write(source)
+
+
+def main() -> None:
+    root = mkdtemp()
+    try:
+        locales = 20
+        write_tree(root, locales, 10)
+        dirs = {f"locale-{n}": join(root, f"locale-{n}") for n in range(locales)}
+        cpus = cpu_count() or 1
+        counts = [1]
+        while counts[-1] * 2 <= cpus:
+            counts.append(counts[-1] * 2)
+        if counts[-1] != cpus:
+            counts.append(cpus)
+        print(f"{cpus} CPUs")
+        print(f"{'processes':>9} {'files':>6} {'time':>8} {'speedup':>8}")
+        base = 0.0
+        for processes in counts:
+            start = perf_counter()
+            results = compare_locales(join(root, "en-US"), dirs, processes)
+            time = perf_counter() - start
+            base = base or time
+            files = sum(len(files) for files in results.values())
+            print(f"{processes:>9} {files:>6} {time:>7.2f}s {base / time:>7.1f}x")
+    finally:
+        rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
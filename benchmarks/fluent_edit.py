@@ -0,0 +1,70 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+Compare typing a character into one message of a large .ftl file
+using `FluentParser.edit()` with parsing the whole file again.
+The `edit+walk` column also walks all the entities after the edit.
+
+The edit time should remain roughly constant as the file grows.
+"""
+
+from l10n_parser import FluentParser
+
+from . import best_time
+
+
+def ftl_source(size: int) -> str:
+    lines = ["### Resource comment", ""]
+    for i in range(size):
+        if i % 100 == 0:
+            lines.extend([f"## Group {i}", ""])
+        if i % 3 == 0:
+            lines.append(f"# Comment for message {i}")
+        if i % 10 == 0:
+            lines.extend(
+                [
+                    f"message-{i} = {{ $count ->",
+                    "    [one] One value",
+                    f"   *[other] {{ $count }} values for {i}",
+                    "  }",
+                    f"  .title = Title {i}",
+                ]
+            )
+        else:
+            lines.append(f"message-{i} = Value {{ $arg }} for message {i}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    print(f"{'size':>6} {'parse':>9} {'edit':>9} {'edit+walk':>10}")
+    for size in (1_000, 5_000, 20_000):
+        source = ftl_source(size)
+        pos = source.index(f"message-{size // 2} = ") + len(f"message-{size // 2}")
+        parser = FluentParser()
+        parser.readUnicode(source)
+        parser.getResource()
+
+        def edit() -> None:
+            # type a character, then delete it
+            parser.edit(pos, pos, "x")
+            parser.edit(pos, pos + 1, "")
+
+        def edit_walk() -> None:
+            edit()
+            for _ in parser.walk():
+                pass
+
+        t_parse = best_time(lambda: parser.ftl_parser.parse(source), repeats=3)
+        t_edit = best_time(edit, number=100) / 2
+        t_walk = best_time(edit_walk, repeats=3)
+        print(
+            f"{size:>6} {t_parse * 1e3:>7.1f}ms {t_edit * 1e3:>7.3f}ms"
+            f" {t_walk * 1e3:>8.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+Compare `fluent_parse_message` on deeply nested selectors
+with its previous implementation, which added each pattern element
+separately to every variant that it matched.
+
+The time per variant should remain roughly constant as nesting grows.
+"""
+
+from itertools import product
+
+from fluent.syntax import FluentParser
+from fluent.syntax import ast as ftl
+
+from moz_l10n import Message, PatternMessage, SelectMessage, fluent_parse_message
+from moz_l10n.fluent.parse import (
+    Key,
+    find_selectors,
+    inline_expression,
+    message_key,
+    variant_key,
+)
+
+from . import best_time
+
+plural_keys = ["zero", "one", "two", "few", "many", "other"]
+
+
+def nested_select(depth: int, width: int, indent: str = "    ") -> str:
+    """
+    A pattern with `depth` levels of selectors, each with `width` variants.
+    """
+    if depth == 0:
+        return "text { $user } more text"
+    keys = plural_keys[-width:]
+    lines = [f"pre-{depth} {{ $var{depth} ->"]
+    for key in keys:
+        star = "*" if key == keys[-1] else " "
+        inner = nested_select(depth - 1, width, indent + "    ")
+        lines.append(f"{indent}   {star}[{key}] {inner}")
+    lines.append(f"{indent}}} post-{depth} {{ $user }}")
+    return "\n".join(lines)
+
+
+def previous_parse_message(ftl_pattern: ftl.Pattern) -> Message:
+    sel_data = find_selectors(ftl_pattern, [])
+    selectors = [sd[0] for sd in sel_data]
+    filter: list[Key | None] = [None] * len(selectors)
+    msg_variants: dict[tuple[Key, ...], list[str | object]]
+    if selectors:
+        key_lists = [list(sd[2]) for sd in sel_data]
+        for keys in key_lists:
+            keys.sort(key=lambda k: (k[2], not k[1]))
+        msg_variants = {key: [] for key in product(*key_lists)}
+    else:
+        msg_variants = {(): []}
+
+    def add_pattern(ftl_pattern: ftl.Pattern) -> None:
+        for el in ftl_pattern.elements:
+            while isinstance(el, ftl.Placeable):
+                el = el.expression  # type: ignore[assignment]
+            if isinstance(el, ftl.SelectExpression):
+                msg_sel = next(sd[0] for sd in sel_data if el.selector in sd[1])
+                idx = selectors.index(msg_sel)
+                prev_filt = filter[idx]
+                for v in el.variants:
+                    filter[idx] = variant_key(v)
+                    add_pattern(v.value)
+                filter[idx] = prev_filt
+            else:
+                for keys, msg_pattern in msg_variants.items():
+                    if all(
+                        (filt is None or key == filt) for key, filt in zip(keys, filter)
+                    ):
+                        if isinstance(el, ftl.TextElement):
+                            if msg_pattern and isinstance(msg_pattern[-1], str):
+                                msg_pattern[-1] += el.value
+                            else:
+                                msg_pattern.append(el.value)
+                        else:
+                            msg_pattern.append(inline_expression(el))
+
+    add_pattern(ftl_pattern)
+    if selectors:
+        variants = {
+            tuple(map(message_key, keys)): msg_pattern
+            for keys, msg_pattern in msg_variants.items()
+            if msg_pattern
+        }
+        return SelectMessage(selectors, variants)  # type: ignore[arg-type]
+    else:
+        return PatternMessage(next(iter(msg_variants.values())))  # type: ignore[arg-type]
+
+
+def main() -> None:
+    parser = FluentParser()
+    print(
+        f"{'depth':>5} {'width':>5} {'variants':>8} {'previous':>12} {'current':>12} {'per variant':>12}"
+    )
+    for width, depth in [
+        (2, 2),
+        (2, 4),
+        (2, 6),
+        (2, 8),
+        (3, 3),
+        (3, 5),
+        (6, 2),
+        (6, 3),
+        (6, 4),
+    ]:
+        source = f"msg = {nested_select(depth, width)}\n"
+        entry = parser.parse(source).body[0]
+        assert isinstance(entry, ftl.Message) and entry.value
+        pattern = entry.value
+        assert fluent_parse_message(pattern) == previous_parse_message(pattern)
+        size = width**depth
+        number = max(1, 1_000 // size)
+        t_old = best_time(lambda: previous_parse_message(pattern), number, repeats=3)
+        t_new = best_time(lambda: fluent_parse_message(pattern), number, repeats=3)
+        print(
+            f"{depth:>5} {width:>5} {size:>8} {t_old * 1e3:>10.2f}ms {t_new * 1e3:>10.2f}ms {t_new / size * 1e6:>10.2f}µs"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+Compare `fluent_serialize` with serializing the `fluent_astify` result
+using `fluent.syntax.serialize`, which it previously did.
+"""
+
+from typing import cast
+
+from fluent.syntax import ast as ftl
+from fluent.syntax import serialize
+
+from moz_l10n import (
+    Message,
+    Resource,
+    fluent_astify,
+    fluent_parse,
+    fluent_parse_message,
+    fluent_serialize,
+)
+
+from . import best_time
+
+
+def fluent_source(size: int) -> str:
+    lines = ["### Resource comment", ""]
+    for i in range(size):
+        if i % 100 == 0:
+            lines += ["", f"## Group {i}", ""]
+        if i % 10 == 0:
+            lines.append(f"# Comment for message {i}")
+        if i % 7 == 0:
+            lines += [
+                f"msg-{i} =",
+                "    { $count ->",
+                "        [one] One item for { $user }",
+                "       *[other] { NUMBER($count) } items for { $user }",
+                "    }",
+            ]
+        elif i % 5 == 0:
+            lines += [
+                f"msg-{i} = Value with {{ msg-0 }} and {{ -term }}",
+                f"    .title = Title {i}",
+                "    .label = Label",
+            ]
+        else:
+            lines.append(f"msg-{i} = Message number {i}")
+    return "\n".join(lines) + "\n"
+
+
+def main() -> None:
+    print(f"{'entries':>8} {'astify':>12} {'direct':>12} {'speedup':>8}")
+    for size in (100, 1_000, 10_000):
+        res = cast(
+            Resource[Message | ftl.Pattern, None],
+            fluent_parse(fluent_source(size), fluent_parse_message),
+        )
+        assert "".join(fluent_serialize(res)) == serialize(fluent_astify(res))
+        number = max(1, 10_000 // size)
+        t_old = best_time(lambda: serialize(fluent_astify(res)), number)
+        t_new = best_time(lambda: "".join(fluent_serialize(res)), number)
+        print(
+            f"{size:>8} {t_old * 1e3:>10.2f}ms {t_new * 1e3:>10.2f}ms {t_old / t_new:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
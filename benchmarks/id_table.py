@@ -0,0 +1,71 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+Compare the memory retained by loading the same resources in many locales,
+with and without a shared `IdTable`.
+"""
+
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from moz_l10n import (
+    IdTable,
+    Resource,
+    fluent_parse,
+    fluent_parse_message,
+    ini_parse,
+    properties_parse,
+)
+
+from .fluent_serialize import fluent_source
+from .properties_parse import properties_source
+
+
+def ini_source(size: int) -> str:
+    lines: list[str] = []
+    for i in range(size):
+        if i % 20 == 0:
+            lines.append(f"[Section{i}]")
+        lines.append(f"Key{i}=Value number {i}")
+    return "\n".join(lines) + "\n"
+
+
+def retained(fn: Callable[[], list[Resource[Any, Any]]]) -> int:
+    tracemalloc.start()
+    resources = fn()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del resources
+    return size
+
+
+def main() -> None:
+    locales = 20
+    prop_src = properties_source(1_000)
+    ftl_src = fluent_source(1_000)
+    ini_src = ini_source(1_000)
+
+    def load(ids: IdTable | None) -> list[Resource[Any, Any]]:
+        resources: list[Resource[Any, Any]] = []
+        for _ in range(locales):
+            resources.append(properties_parse(prop_src, id_table=ids))
+            resources.append(fluent_parse(ftl_src, fluent_parse_message, ids))
+            resources.append(ini_parse(ini_src, id_table=ids))
+        return resources
+
+    print(f"Loading 3 resources in {locales} locales")
+    plain = retained(lambda: load(None))
+    print(f"{'without IdTable':>16} {plain / 2**20:>8.2f} MiB")
+    ids = IdTable()
+    interned = retained(lambda: load(ids))
+    print(
+        f"{'with IdTable':>16} {interned / 2**20:>8.2f} MiB"
+        f"  ({len(ids)} ids, {1 - interned / plain:.0%} saved)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+Measure the import time of `moz_l10n` and `l10n_parser`,
+and of the format backends that are loaded on first use,
+using `python -X importtime` in a new process for each case.
+
+The format backends should not be included in the plain import times;
+this is also checked by tests/test_imports.py.
+"""
+
+import sys
+from subprocess import run
+
+cases = [
+    ("import moz_l10n", "import moz_l10n"),
+    ("moz_l10n.fluent_parse", "from moz_l10n import fluent_parse"),
+    ("moz_l10n.ini_parse", "from moz_l10n import ini_parse"),
+    ("moz_l10n.properties_parse", "from moz_l10n import properties_parse"),
+    (
+        "moz_l10n.properties_serialize",
+        "from moz_l10n import Resource, properties_serialize;"
+        "list(properties_serialize(Resource([])))",
+    ),
+    ("moz_l10n.load_resources", "from moz_l10n import load_resources"),
+    ("import l10n_parser", "import l10n_parser"),
+    ("l10n_parser DTD", "import l10n_parser; l10n_parser.getParser('a.dtd')"),
+    ("l10n_parser Fluent", "import l10n_parser; l10n_parser.getParser('a.ftl')"),
+]
+
+
+def import_time(code: str) -> tuple[int, list[tuple[int, str]]]:
+    """
+    The total import time in microseconds of running `code` in a new process,
+    excluding the interpreter's own startup imports,
+    and the cumulative times of its top-level imports.
+    """
+    baseline = set(importtime("pass"))
+    total = 0
+    top: list[tuple[int, str]] = []
+    for name, (cumulative, depth) in importtime(code).items():
+        if name not in baseline and depth == 0:
+            total += cumulative
+            top.append((cumulative, name))
+    return total, sorted(top, reverse=True)
+
+
+def importtime(code: str) -> dict[str, tuple[int, int]]:
+    proc = run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    times: dict[str, tuple[int, int]] = {}
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line[12:].split("|")
+            if cumulative.strip().isdigit():
+                depth = (len(name) - len(name.lstrip()) - 1) // 2
+                times[name.strip()] = (int(cumulative), depth)
+    return times
+
+
+def main() -> None:
+    runs = 5
+    print(f"{'':>30} {'time':>8}  slowest imports")
+    for name, code in cases:
+        results = [import_time(code) for _ in range(runs)]
+        total, top = min(results)
+        slowest = ", ".join(f"{mod} {us / 1e3:.0f}" for us, mod in top[:3])
+        print(f"{name:>30} {total / 1e3:>6.1f}ms  {slowest}")
+
+
+if __name__ == "__main__":
+    main()
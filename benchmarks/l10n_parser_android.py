@@ -0,0 +1,69 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+Measure the time and peak memory use of walking a large Android strings.xml file,
+compared with just parsing it with `xml.dom.minidom`.
+"""
+
+import tracemalloc
+from collections.abc import Callable
+from xml.dom import minidom
+
+from l10n_parser import getParser
+
+from . import best_time
+
+
+def strings_xml_source(size: int) -> str:
+    lines = [
+        '<?xml version="1.0" encoding="utf-8"?>',
+        '<resources xmlns:xliff="urn:oasis:names:tc:xliff:document:1.2">',
+    ]
+    for i in range(size):
+        if i % 10 == 0:
+            lines.extend(["", f"  <!-- Section {i} -->", ""])
+        if i % 3 == 0:
+            lines.append(f"  <!-- Note for string {i} -->")
+        if i % 7 == 0:
+            lines.append(
+                f'  <string name="entity_{i}">Value <xliff:g id="n">%1$d</xliff:g>'
+                f" for {i}</string>"
+            )
+        else:
+            lines.append(f'  <string name="entity_{i}">Value &amp; number {i}</string>')
+    lines.append("</resources>")
+    return "\n".join(lines) + "\n"
+
+
+def peak_memory(fn: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    source = strings_xml_source(20_000)
+    parser = getParser("strings.xml")
+    parser.readUnicode(source)
+
+    def walk() -> int:
+        return sum(1 for _ in parser.walk())
+
+    def dom() -> object:
+        return minidom.parseString(source.encode("utf-8"))
+
+    print(f"source: {len(source.encode()) / 2**20:.2f} MiB, {walk()} fragments")
+    print(f"{'':>16} {'time':>9} {'peak memory':>12}")
+    for name, fn in [("walk()", walk), ("minidom parse", dom)]:
+        time = best_time(fn, repeats=3)
+        peak = peak_memory(fn)
+        print(f"{name:>16} {time * 1e3:>7.1f}ms {peak / 2**20:>8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+Measure how `walk()` scales with the size of badly broken files,
+in which every other line is junk and there are no comments.
+"""
+
+from l10n_parser import Junk, getParser
+
+from . import best_time
+
+
+def dtd_source(size: int) -> str:
+    return "".join(
+        f"<!ENTITY broken.{i}>\n" f'<!ENTITY entity.{i} "Value {i}">\n'
+        for i in range(size)
+    )
+
+
+def properties_source(size: int) -> str:
+    return "".join(
+        f"broken line {i}\n" f"entity.{i} = Value {i}\n" for i in range(size)
+    )
+
+
+def inc_source(size: int) -> str:
+    return "".join(
+        f"broken line {i}\n" f"#define entity{i} Value {i}\n" for i in range(size)
+    )
+
+
+def main() -> None:
+    cases = [
+        ("dtd", "x.dtd", dtd_source),
+        ("properties", "x.properties", properties_source),
+        ("inc", "x.inc", inc_source),
+    ]
+    print(f"{'':>10} {'size':>6} {'junk':>6} {'walk':>9} {'per line':>9}")
+    for name, path, source_fn in cases:
+        for size in (2_500, 5_000, 10_000, 20_000):
+            parser = getParser(path)
+            parser.readUnicode(source_fn(size))
+            junk = sum(1 for entity in parser.walk() if isinstance(entity, Junk))
+            time = best_time(lambda: sum(1 for _ in parser.walk()), repeats=3)
+            line_us = time / (2 * size) * 1e6
+            print(
+                f"{name:>10} {size:>6} {junk:>6} {time * 1e3:>7.1f}ms {line_us:>7.2f}us"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+Measure how `merge_entries()` scales with file size,
+for a localization that is missing every tenth entity
+and has every hundredth one skipped.
+The time includes parsing both files.
+"""
+
+from l10n_parser import merge_entries, parse
+
+from . import best_time
+from .l10n_parser_walk import dtd_source, properties_source
+
+
+def localize(source: str) -> str:
+    lines = source.splitlines(keepends=True)
+    return "".join(
+        line.replace("Value", "Wert")
+        for i, line in enumerate(lines)
+        if i % 10 != 5 or "entity." not in line
+    )
+
+
+def merge(path: str, reference: str, localization: str, skips: set[str]) -> int:
+    ref = parse(path, reference)
+    l10n = parse(path, localization)
+    return sum(map(len, merge_entries(ref, ref.walk(), l10n.walk(), skips)))
+
+
+def main() -> None:
+    cases = [
+        ("dtd", "x.dtd", dtd_source),
+        ("properties", "x.properties", properties_source),
+    ]
+    print(f"{'':>10} {'size':>6} {'merge':>9} {'per entity':>11}")
+    for name, path, source_fn in cases:
+        for size in (2_500, 5_000, 10_000, 20_000):
+            reference = source_fn(size)
+            localization = localize(reference)
+            skips = {f"entity.{i}.label" for i in range(0, size, 100)}
+            time = best_time(
+                lambda: merge(path, reference, localization, skips), repeats=3
+            )
+            entity_us = time / size * 1e6
+            print(f"{name:>10} {size:>6} {time * 1e3:>7.1f}ms {entity_us:>9.2f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+Measure the throughput of `walk()` for the `l10n_parser` formats
+that are parsed by the `Parser` tokenizer.
+"""
+
+from l10n_parser import getParser
+
+from . import best_time
+
+
+def dtd_source(size: int) -> str:
+    lines = [
+        "<!-- This Source Code Form is subject to the terms of the Mozilla Public",
+        "   - License, v. 2.0. -->",
+        "",
+    ]
+    for i in range(size):
+        if i % 10 == 0:
+            lines.extend([f"<!-- Section {i} -->", ""])
+        if i % 3 == 0:
+            lines.append(f"<!-- LOCALIZATION NOTE (entity.{i}.label): note {i} -->")
+        lines.append(f'<!ENTITY entity.{i}.label "Value &amp; number {i}">')
+    return "\n".join(lines) + "\n"
+
+
+def properties_source(size: int) -> str:
+    lines = [
+        "# This Source Code Form is subject to the terms of the Mozilla Public",
+        "# License, v. 2.0.",
+        "",
+    ]
+    for i in range(size):
+        if i % 10 == 0:
+            lines.extend([f"# Section {i}", ""])
+        if i % 3 == 0:
+            lines.append(f"# LOCALIZATION NOTE (entity.{i}.label): note {i}")
+        if i % 7 == 0:
+            lines.append(f"entity.{i}.label = A value that continues \\")
+            lines.append("    onto the next line")
+        else:
+            lines.append(f"entity.{i}.label = Value number {i}")
+    return "\n".join(lines) + "\n"
+
+
+def inc_source(size: int) -> str:
+    lines = [
+        "# This Source Code Form is subject to the terms of the Mozilla Public",
+        "# License, v. 2.0.",
+        "",
+        "#filter emptyLines",
+        "",
+    ]
+    for i in range(size):
+        if i % 10 == 0:
+            lines.extend([f"# Section {i}", ""])
+        if i % 3 == 0:
+            lines.append(f"# LOCALIZATION NOTE (entity{i}): note {i}")
+        lines.append(f"#define entity{i} Value number {i}")
+    lines.extend(["", "#unfilter emptyLines"])
+    return "\n".join(lines) + "\n"
+
+
+def main() -> None:
+    size = 20_000
+    cases = [
+        ("dtd", "x.dtd", dtd_source(size)),
+        ("properties", "x.properties", properties_source(size)),
+        ("inc", "x.inc", inc_source(size)),
+    ]
+    print(f"{'':>10} {'fragments':>9} {'walk':>9} {'MB/s':>6}")
+    for name, path, source in cases:
+        parser = getParser(path)
+        parser.readUnicode(source)
+        count = sum(1 for _ in parser.walk())
+        time = best_time(lambda: sum(1 for _ in parser.walk()))
+        mbps = len(source.encode()) / time / 1e6
+        print(f"{name:>10} {count:>9} {time * 1e3:>7.1f}ms {mbps:>6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+Compare the parse time and retained memory of eager and lazy .properties entries,
+when only the identifiers and a few values of a resource are used.
+
+The retained memory of lazy entries includes the source text.
+"""
+
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from moz_l10n import Entry, Resource, properties_parse
+
+from . import best_time
+from .properties_parse import properties_source
+
+
+def use(res: Resource[Any, Any]) -> int:
+    """
+    Use all of the identifiers and every 100th value of `res`.
+    """
+    count = 0
+    for idx, entry in enumerate(res.sections[0].entries):
+        if isinstance(entry, Entry):
+            count += len(entry.id)
+            if idx % 100 == 0:
+                count += len(entry.value)
+    return count
+
+
+def retained(fn: Callable[[], Resource[Any, Any]]) -> int:
+    tracemalloc.start()
+    res = fn()
+    use(res)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size
+
+
+def main() -> None:
+    print(f"{'entries':>8} {'':>5} {'parse+use':>10} {'memory':>10}")
+    for size in (1_000, 50_000):
+        source = properties_source(size).encode()
+        number = max(1, 10_000 // size)
+        for lazy in (False, True):
+
+            def parse() -> Resource[Any, Any]:
+                return properties_parse(source, lazy=lazy)
+
+            time = best_time(lambda: use(parse()), number, repeats=3)
+            mem = retained(parse)
+            print(
+                f"{size:>8} {'lazy' if lazy else 'eager':>5}"
+                f" {time * 1e3:>8.2f}ms {mem / 2**20:>6.2f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
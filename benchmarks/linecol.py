@@ -0,0 +1,45 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+Compare resolving the line and column of every entity and value position
+in multi-megabyte .properties files, one at a time with `Context.linecol()`
+and all at once with `Context.linecols()`.
+The `index` column is the time to build the line index on first use.
+"""
+
+from l10n_parser import Entity, Parser, getParser
+
+from . import best_time
+from .l10n_parser_walk import properties_source
+
+
+def main() -> None:
+    print(f"{'MB':>6} {'positions':>10} {'index':>9} {'linecol':>9} {'linecols':>9}")
+    for size in (25_000, 50_000, 100_000, 200_000):
+        source = properties_source(size)
+        parser = getParser("x.properties").parseUnicode(source)
+        positions: list[int] = []
+        for entity in parser.walk():
+            if isinstance(entity, Entity):
+                positions.extend((entity.span[0], entity.val_span[0], entity.span[1]))
+
+        def index() -> None:
+            Parser.Context(source).linecol(0)
+
+        ctx = parser.ctx
+        assert ctx is not None
+        ctx.linecol(0)
+        t_index = best_time(index, repeats=3)
+        t_linecol = best_time(lambda: [ctx.linecol(pos) for pos in positions])
+        t_linecols = best_time(lambda: ctx.linecols(positions))
+        print(
+            f"{len(source) / 1e6:>6.1f} {len(positions):>10}"
+            f" {t_index * 1e3:>7.1f}ms {t_linecol * 1e3:>7.1f}ms"
+            f" {t_linecols * 1e3:>7.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
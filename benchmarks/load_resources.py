@@ -0,0 +1,66 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+Measure how `load_resources` scales with the number of worker processes,
+loading a generated tree of files in many locales.
+"""
+
+from os import cpu_count, makedirs
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+from time import perf_counter
+
+from moz_l10n import load_resources
+
+from .fluent_serialize import fluent_source
+from .properties_parse import properties_source
+
+
+def dtd_source(size: int) -> str:
+    return "".join(f'<!ENTITY entity{i}.label "Value {i}">\n' for i in range(size))
+
+
+def write_tree(root: str, locales: int) -> None:
+    sources = {
+        "browser/app.ftl": fluent_source(200),
+        "browser/app.properties": properties_source(200),
+        "browser/app.dtd": dtd_source(200),
+    }
+    for n in range(locales):
+        for name, source in sources.items():
+            path = join(root, f"locale-{n}", name)
+            makedirs(join(root, f"locale-{n}", "browser"), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(source)
+
+
+def main() -> None:
+    root = mkdtemp()
+    try:
+        write_tree(root, 100)
+        cpus = cpu_count() or 1
+        counts = [1]
+        while counts[-1] * 2 <= cpus:
+            counts.append(counts[-1] * 2)
+        if counts[-1] != cpus:
+            counts.append(cpus)
+        print(f"{cpus} CPUs")
+        print(f"{'processes':>9} {'files':>6} {'time':>8} {'speedup':>8}")
+        base = 0.0
+        for processes in counts:
+            start = perf_counter()
+            results = load_resources(root, processes)
+            time = perf_counter() - start
+            base = base or time
+            print(
+                f"{processes:>9} {len(results):>6} {time:>7.2f}s {base / time:>7.1f}x"
+            )
+    finally:
+        rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+Compare the peak memory use of `properties_parse` and `properties_iter_entries`
+on a large generated .properties file.
+"""
+
+import tracemalloc
+from collections.abc import Callable
+from os import remove
+from tempfile import mkstemp
+from time import perf_counter
+
+from moz_l10n import properties_iter_entries, properties_parse
+
+from .properties_parse import properties_source
+
+
+def measure(fn: Callable[[], int]) -> tuple[int, float, int]:
+    tracemalloc.start()
+    start = perf_counter()
+    count = fn()
+    duration = perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, duration, peak
+
+
+def main() -> None:
+    fd, path = mkstemp(suffix=".properties")
+    try:
+        with open(fd, "w", encoding="utf-8", newline="") as file:
+            for _ in range(20):
+                file.write(properties_source(10_000))
+
+        def parse() -> int:
+            with open(path, "rb") as file:
+                res = properties_parse(file.read())
+            return len(res.sections[0].entries)
+
+        def iterate() -> int:
+            with open(path, encoding="utf-8", newline="") as file:
+                return sum(1 for _ in properties_iter_entries(file))
+
+        for name, fn in (("properties_parse", parse), ("iter_entries", iterate)):
+            count, duration, peak = measure(fn)
+            print(
+                f"{name:<17} {count:>7} entries {duration:>6.2f}s {peak / 2**20:>8.1f} MiB peak"
+            )
+    finally:
+        remove(path)
+
+
+if __name__ == "__main__":
+    main()
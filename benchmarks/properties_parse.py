@@ -0,0 +1,55 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+Compare `properties_parse` with the translate-toolkit `propfile` parser
+that it previously used.
+"""
+
+from translate.storage.properties import propfile
+
+from moz_l10n import properties_parse
+
+from . import best_time
+
+
+def properties_source(size: int) -> str:
+    lines = [
+        "# This Source Code Form is subject to the terms of the Mozilla Public",
+        "# License, v. 2.0.",
+        "",
+    ]
+    for i in range(size):
+        if i % 10 == 0:
+            lines.append(f"# LOCALIZATION NOTE (entry.{i}.label): comment {i}")
+        if i % 7 == 0:
+            lines.append(f"entry.{i}.label = A value that continues \\")
+            lines.append("    onto the next line")
+        elif i % 5 == 0:
+            lines.append(f"entry.{i}.label = Escaped \\u00e4 and \\n newline")
+        else:
+            lines.append(f"entry.{i}.label = Value number {i}")
+    return "\n".join(lines) + "\n"
+
+
+def propfile_parse(source: bytes) -> list[tuple[str, str]]:
+    pf = propfile(personality="java-utf8")
+    pf.parse(source)
+    return [(unit.name, unit.source) for unit in pf.getunits()]
+
+
+def main() -> None:
+    print(f"{'entries':>8} {'propfile':>12} {'native':>12} {'speedup':>8}")
+    for size in (100, 1_000, 10_000):
+        source = properties_source(size).encode("utf-8")
+        number = max(1, 10_000 // size)
+        t_old = best_time(lambda: propfile_parse(source), number)
+        t_new = best_time(lambda: properties_parse(source), number)
+        print(
+            f"{size:>8} {t_old * 1e3:>10.2f}ms {t_new * 1e3:>10.2f}ms {t_old / t_new:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
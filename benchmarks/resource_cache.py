@@ -0,0 +1,60 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+Compare loading a generated tree of files in many locales
+without a cache, with an empty `ResourceCache`, and with a filled one.
+"""
+
+from os import walk
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+from time import perf_counter
+
+from moz_l10n import ResourceCache, load_resources
+
+from .load_resources import write_tree
+
+
+def write_unique_tree(root: str, locales: int) -> None:
+    """
+    Like `write_tree`, but with a different source for each file,
+    so that the cache is only hit when loading the same tree again.
+    """
+    write_tree(root, locales)
+    for dirpath, _, filenames in walk(root):
+        for name in filenames:
+            path = join(dirpath, name)
+            with open(path, "a", encoding="utf-8") as file:
+                if name.endswith(".dtd"):
+                    file.write(f"<!-- {path} -->\n")
+                else:
+                    file.write(f"# {path}\n")
+
+
+def main() -> None:
+    root = mkdtemp()
+    try:
+        write_unique_tree(join(root, "l10n"), 100)
+        cache = ResourceCache(join(root, "cache"))
+        load_resources(join(root, "l10n"), 1)  # warm up
+        cases: list[tuple[str, ResourceCache | None]] = [
+            ("no cache", None),
+            ("cold cache", cache),
+            ("warm cache", cache),
+        ]
+        print(f"{'':>10} {'files':>6} {'time':>8}")
+        for name, case_cache in cases:
+            start = perf_counter()
+            results = load_resources(join(root, "l10n"), 1, case_cache)
+            time = perf_counter() - start
+            print(f"{name:>10} {len(results):>6} {time:>7.3f}s")
+        print(f"cache size {cache.size() / 2**20:.2f} MiB")
+    finally:
+        rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+Measure the memory retained by parsed resources, in bytes per entry.
+
+The source text is not included, but the parsed strings are.
+"""
+
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from fluent.syntax import FluentParser
+
+from moz_l10n import Resource, fluent_parse, fluent_parse_message, properties_parse
+
+from .fluent_serialize import fluent_source
+from .properties_parse import properties_source
+
+
+def retained(fn: Callable[[], Resource[Any, Any]]) -> tuple[int, int]:
+    """
+    The number of entries in the resource returned by `fn`,
+    and the size of its retained allocations.
+    """
+    tracemalloc.start()
+    res = fn()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return sum(len(section.entries) for section in res.sections), size
+
+
+def main() -> None:
+    size = 100_000
+    prop_src = properties_source(size)
+    ftl_res = FluentParser().parse(fluent_source(size // 10))
+    cases: list[tuple[str, Callable[[], Resource[Any, Any]]]] = [
+        ("properties", lambda: properties_parse(prop_src)),
+        ("fluent", lambda: fluent_parse(ftl_res, fluent_parse_message)),
+    ]
+    print(f"{'format':>10} {'entries':>8} {'memory':>10} {'per entry':>10}")
+    for name, fn in cases:
+        count, mem = retained(fn)
+        print(f"{name:>10} {count:>8} {mem / 2**20:>6.2f} MiB {mem / count:>8.0f} B")
+
+
+if __name__ == "__main__":
+    main()
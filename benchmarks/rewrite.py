@@ -0,0 +1,51 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+Compare changing a few values in a large .properties file
+with `Parser.rewrite()` and by regenerating the whole file from its entities.
+The `index` column is the first rewrite, which also indexes the entities.
+"""
+
+from l10n_parser import Entity, Parser, getParser
+
+from . import best_time
+from .l10n_parser_walk import properties_source
+
+
+def regenerate(parser: Parser, changes: dict[str, str]) -> str:
+    chunks: list[str] = []
+    for entity in parser.walk():
+        if isinstance(entity, Entity) and entity.key in changes:
+            chunks.append(entity.wrap(changes[entity.key]).all)
+        else:
+            chunks.append(entity.all)
+    return "".join(chunks)
+
+
+def main() -> None:
+    size = 100_000
+    source = properties_source(size)
+    print(f"{'changes':>8} {'regenerate':>11} {'index':>9} {'rewrite':>9}")
+    for count in (1, 10, 100, 1_000, 10_000):
+        changes = {
+            f"entity.{i}.label": f"Changed {i}" for i in range(0, size, size // count)
+        }
+
+        def first_rewrite() -> None:
+            getParser("x.properties").parseUnicode(source).rewrite(changes)
+
+        parser = getParser("x.properties").parseUnicode(source)
+        assert parser.rewrite(changes) == regenerate(parser, changes)
+        t_regen = best_time(lambda: regenerate(parser, changes), repeats=3)
+        t_index = best_time(first_rewrite, repeats=3)
+        t_rewrite = best_time(lambda: parser.rewrite(changes))
+        print(
+            f"{count:>8} {t_regen * 1e3:>9.1f}ms {t_index * 1e3:>7.1f}ms"
+            f" {t_rewrite * 1e3:>7.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
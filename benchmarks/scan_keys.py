@@ -0,0 +1,90 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+Compare scanning only the keys of each format with a full parse,
+with `Parser.scanKeys()` in `l10n_parser`
+and `scan_resource_ids()` in `moz_l10n`.
+"""
+
+from l10n_parser import Entity, getParser
+from moz_l10n import parse_resource, scan_resource_ids
+
+from . import best_time
+from .fluent_serialize import fluent_source
+from .id_table import ini_source
+from .l10n_parser_android import strings_xml_source
+from .l10n_parser_walk import dtd_source, inc_source, properties_source
+
+
+def po_source(size: int) -> str:
+    lines: list[str] = []
+    for i in range(size):
+        if i % 3 == 0:
+            lines.append(f"#. Note for string {i}")
+        if i % 5 == 0:
+            lines.append(f'msgctxt "context {i}"')
+        lines.extend(
+            [
+                f'msgid "Source \\"string\\" number {i}"',
+                f'msgstr "Translated\\tstring number {i}"',
+                "",
+            ]
+        )
+    return "\n".join(lines)
+
+
+def full_parse(path: str, source: str) -> int:
+    """
+    Walk all the entities, using their keys, values and comments.
+    """
+    count = 0
+    for entity in getParser(path).parseUnicode(source).walk():
+        if isinstance(entity, Entity):
+            comment = entity.pre_comment.val if entity.pre_comment else ""
+            count += len(entity.key) + len(entity.val or "") + len(comment)
+    return count
+
+
+def main() -> None:
+    size = 10_000
+    cases = [
+        ("x.properties", properties_source(size)),
+        ("x.dtd", dtd_source(size)),
+        # Blank lines are only valid after the #filter instruction
+        ("x.inc", inc_source(size).replace("2.0.\n\n#filter", "2.0.\n#filter")),
+        ("x.po", po_source(size)),
+        ("x.ini", ini_source(size)),
+        ("x.ftl", fluent_source(size // 10)),
+        ("strings.xml", strings_xml_source(size)),
+    ]
+
+    print("l10n_parser")
+    print(f"{'':>12} {'keys':>6} {'walk':>9} {'scanKeys':>9} {'speedup':>8}")
+    for path, source in cases:
+        count = len(getParser(path).parseUnicode(source).scanKeys())
+        t_full = best_time(lambda: full_parse(path, source), repeats=3)
+        t_scan = best_time(
+            lambda: getParser(path).parseUnicode(source).scanKeys(), repeats=3
+        )
+        print(
+            f"{path:>12} {count:>6} {t_full * 1e3:>7.1f}ms {t_scan * 1e3:>7.1f}ms"
+            f" {t_full / t_scan:>7.1f}x"
+        )
+
+    print("\nmoz_l10n")
+    print(f"{'':>12} {'ids':>6} {'parse':>9} {'scan ids':>9} {'speedup':>8}")
+    for path, source in cases:
+        data = source.encode()
+        count = len(scan_resource_ids(path, data))
+        t_full = best_time(lambda: parse_resource(path, data), repeats=3)
+        t_scan = best_time(lambda: scan_resource_ids(path, data), repeats=3)
+        print(
+            f"{path:>12} {count:>6} {t_full * 1e3:>7.1f}ms {t_scan * 1e3:>7.1f}ms"
+            f" {t_full / t_scan:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
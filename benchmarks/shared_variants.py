@@ -0,0 +1,87 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+Compare the memory used by select messages parsed by `fluent_parse_message`
+with and without `shared_variants`,
+and the time taken to parse and then serialize them.
+"""
+
+import tracemalloc
+from collections.abc import Callable
+from functools import partial
+from time import perf_counter
+from typing import TypeVar
+
+from fluent.syntax import FluentParser
+from fluent.syntax import ast as ftl
+
+from moz_l10n import Message, fluent_parse, fluent_parse_message, fluent_serialize
+
+from .fluent_parse_message import nested_select, plural_keys
+
+T = TypeVar("T")
+
+
+def sequential_select(count: int, width: int) -> str:
+    """
+    A pattern with `count` consecutive selectors, each with `width` variants.
+    """
+    keys = plural_keys[-width:]
+    parts = []
+    for n in range(count):
+        lines = [f"{{ $var{n} ->"]
+        for key in keys:
+            star = "*" if key == keys[-1] else " "
+            lines.append(f"       {star}[{key}] {key} {{ $user }} {n}")
+        lines.append("    }")
+        parts.append("\n".join(lines))
+    return "text " + " and ".join(parts)
+
+
+def fluent_source(size: int, pattern: str) -> str:
+    return "".join(f"msg-{i} = {pattern}\n" for i in range(size))
+
+
+def measure(fn: Callable[[], T]) -> tuple[T, float, int]:
+    """
+    The result of `fn`, its duration, and the size of its retained allocations.
+    """
+    tracemalloc.start()
+    start = perf_counter()
+    result = fn()
+    duration = perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, duration, size
+
+
+def main() -> None:
+    print(
+        f"{'shape':>10} {'variants':>8} {'mode':>7} {'memory':>10} {'parse':>9} {'serialize':>9}"
+    )
+    cases = [
+        ("4x6 seq", 20, sequential_select(4, 6), 6**4),
+        ("3x6 seq", 100, sequential_select(3, 6), 6**3),
+        ("2x6 nested", 100, nested_select(2, 6), 6**2),
+        ("4x6 nested", 2, nested_select(4, 6), 6**4),
+    ]
+    for shape, size, pattern, count in cases:
+        ftl_res = FluentParser().parse(fluent_source(size, pattern))
+        modes: list[tuple[str, Callable[[ftl.Pattern], Message | ftl.Pattern]]] = [
+            ("copied", fluent_parse_message),
+            ("shared", partial(fluent_parse_message, shared_variants=True)),
+        ]
+        for mode, parse_message in modes:
+            res, t_parse, mem = measure(lambda: fluent_parse(ftl_res, parse_message))
+            start = perf_counter()
+            "".join(fluent_serialize(res))
+            t_ser = perf_counter() - start
+            print(
+                f"{shape:>10} {size * count:>8} {mode:>7} {mem / 2**20:>6.2f} MiB {t_parse * 1e3:>7.1f}ms {t_ser * 1e3:>7.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
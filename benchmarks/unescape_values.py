@@ -0,0 +1,112 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+Compare reading the unescaped `.val` of .properties and .dtd entities
+several times, as comparison and check code does,
+with and without decoding them first with `Parser.unescapeValues()`.
+The `uncached` column decodes each value again on every read.
+"""
+
+import re
+from collections.abc import Callable
+from html import unescape as html_unescape
+from time import perf_counter
+
+from l10n_parser import Entity, Parser, getParser
+from l10n_parser.properties import PropertiesEntityMixin
+
+READS = 3
+
+
+def dtd_source(size: int) -> str:
+    lines: list[str] = []
+    for i in range(size):
+        if i % 4 == 0:
+            lines.append(f'<!ENTITY entity.{i}.label "&brandShortName; &amp; {i}">')
+        elif i % 4 == 1:
+            lines.append(f'<!ENTITY entity.{i}.label "Say &#x201C;{i}&#x201D;">')
+        else:
+            lines.append(f'<!ENTITY entity.{i}.label "Plain value number {i}">')
+    return "\n".join(lines) + "\n"
+
+
+def properties_source(size: int) -> str:
+    lines: list[str] = []
+    for i in range(size):
+        if i % 4 == 0:
+            lines.append(f"entity.{i}.label = Line one\\nline two\\t{i}")
+        elif i % 4 == 1:
+            lines.append(f"entity.{i}.label = \\u201C{i}\\u201D")
+        else:
+            lines.append(f"entity.{i}.label = Plain value number {i}")
+    return "\n".join(lines) + "\n"
+
+
+def properties_uncached(raw_val: str) -> str:
+    def unescape(m: re.Match[str]) -> str:
+        found = m.groupdict()
+        if found["uni"]:
+            return chr(int(found["uni"][1:], 16))
+        if found["nl"]:
+            return ""
+        known = PropertiesEntityMixin.known_escapes
+        return known.get(found["single"], found["single"])
+
+    return PropertiesEntityMixin.escape.sub(unescape, raw_val)
+
+
+def best_read_time(
+    parser: Parser, read: Callable[[Parser, list[Entity]], object]
+) -> float:
+    """
+    The best time in seconds of reading freshly parsed entities with `read`.
+    """
+    times: list[float] = []
+    for _ in range(3):
+        entities = [e for e in parser.walk() if isinstance(e, Entity)]
+        start = perf_counter()
+        read(parser, entities)
+        times.append(perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    size = 50_000
+    cases = [
+        ("x.properties", properties_source(size), properties_uncached),
+        ("x.dtd", dtd_source(size), html_unescape),
+    ]
+    print(f"{'':>12} {'uncached':>9} {'val':>9} {'batch':>9}")
+    for path, source, uncached in cases:
+
+        def read_uncached(parser: Parser, entities: list[Entity]) -> None:
+            for entity in entities:
+                raw_val = entity.raw_val or ""
+                for _ in range(READS):
+                    uncached(raw_val)
+
+        def read_val(parser: Parser, entities: list[Entity]) -> None:
+            for entity in entities:
+                for _ in range(READS):
+                    entity.val
+
+        def read_batch(parser: Parser, entities: list[Entity]) -> None:
+            parser.unescapeValues(entities)
+            for entity in entities:
+                for _ in range(READS):
+                    entity.val
+
+        parser = getParser(path).parseUnicode(source)
+        t_uncached = best_read_time(parser, read_uncached)
+        t_val = best_read_time(parser, read_val)
+        t_batch = best_read_time(parser, read_batch)
+        print(
+            f"{path:>12} {t_uncached * 1e3:>7.1f}ms {t_val * 1e3:>7.1f}ms"
+            f" {t_batch * 1e3:>7.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
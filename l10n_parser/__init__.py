@@ -5,8 +5,9 @@
 from __future__ import annotations
 
 import re
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
 
-from .android import AndroidParser
 from .base import (
     CAN_COPY,
     CAN_MERGE,
@@ -21,12 +22,23 @@ from .base import (
     Parser,
     Whitespace,
 )
-from .defines import DefinesInstruction, DefinesParser
-from .dtd import DTDEntity, DTDParser
-from .fluent import FluentComment, FluentEntity, FluentMessage, FluentParser, FluentTerm
-from .ini import IniParser, IniSection
-from .po import PoParser
-from .properties import PropertiesEntity, PropertiesParser
+
+if TYPE_CHECKING:
+    from .android import AndroidParser
+    from .compare import Comparison, ReferenceIndex, compare_locales
+    from .defines import DefinesInstruction, DefinesParser
+    from .dtd import DTDEntity, DTDParser
+    from .fluent import (
+        FluentComment,
+        FluentEntity,
+        FluentMessage,
+        FluentParser,
+        FluentTerm,
+    )
+    from .ini import IniParser, IniSection
+    from .merge import merge_entries
+    from .po import PoParser
+    from .properties import PropertiesEntity, PropertiesParser
 
 __all__ = [
     "CAN_NONE",
@@ -56,27 +68,88 @@ __all__ = [
     "PoParser",
     "PropertiesParser",
     "PropertiesEntity",
+    "Comparison",
+    "ReferenceIndex",
+    "compare_locales",
+    "merge_entries",
 ]
 
 
+# The format-specific modules are only imported when they're first used,
+# as some of them are slow to import.
+__modules = {
+    "AndroidParser": ".android",
+    "DefinesParser": ".defines",
+    "DefinesInstruction": ".defines",
+    "DTDParser": ".dtd",
+    "DTDEntity": ".dtd",
+    "FluentParser": ".fluent",
+    "FluentComment": ".fluent",
+    "FluentEntity": ".fluent",
+    "FluentMessage": ".fluent",
+    "FluentTerm": ".fluent",
+    "IniParser": ".ini",
+    "IniSection": ".ini",
+    "PoParser": ".po",
+    "PropertiesParser": ".properties",
+    "PropertiesEntity": ".properties",
+    "Comparison": ".compare",
+    "ReferenceIndex": ".compare",
+    "compare_locales": ".compare",
+    "merge_entries": ".merge",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = __modules.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
 __constructors = [
-    ("strings.*\\.xml$", AndroidParser()),
-    ("\\.dtd$", DTDParser()),
-    ("\\.properties$", PropertiesParser()),
-    ("\\.ini$", IniParser()),
-    ("\\.inc$", DefinesParser()),
-    ("\\.ftl$", FluentParser()),
-    ("\\.pot?$", PoParser()),
+    ("strings.*\\.xml$", "AndroidParser"),
+    ("\\.dtd$", "DTDParser"),
+    ("\\.properties$", "PropertiesParser"),
+    ("\\.ini$", "IniParser"),
+    ("\\.inc$", "DefinesParser"),
+    ("\\.ftl$", "FluentParser"),
+    ("\\.pot?$", "PoParser"),
 ]
 
+# Parser instances are created on first use.
+__parsers: dict[str, Parser] = {}
+
 
 def getParser(path: str) -> Parser:
-    for item in __constructors:
-        if re.search(item[0], path):
-            return item[1]
+    for pattern, name in __constructors:
+        if re.search(pattern, path):
+            parser = __parsers.get(name)
+            if parser is None:
+                parser = __parsers.setdefault(name, __getattr__(name)())
+            return parser
     raise UserWarning("Cannot find Parser")
 
 
+def parse(path: str, contents: str | bytes | None = None) -> Parser:
+    """Parse a file with the parser for its path.
+
+    If `contents` is not given, they are read from `path`.
+
+    The returned parser is independent of the shared one returned by getParser,
+    so this may be called concurrently from multiple threads.
+    """
+    parser = getParser(path)
+    if contents is None:
+        return parser.parseFile(path)
+    elif isinstance(contents, str):
+        return parser.parseUnicode(contents)
+    else:
+        return parser.parseContents(contents)
+
+
 def hasParser(path: str) -> bool:
     try:
         return bool(getParser(path))
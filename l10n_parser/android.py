@@ -14,9 +14,9 @@ from __future__ import annotations
 
 import re
 from collections.abc import Iterator
-from typing import TYPE_CHECKING, cast
-from xml.dom import minidom
-from xml.dom.minidom import Node
+from copy import copy
+from xml.dom import Node
+from xml.parsers import expat
 
 from .base import (
     CAN_SKIP,
@@ -29,9 +29,297 @@ from .base import (
     Whitespace,
 )
 
-if TYPE_CHECKING:
-    from typing import Literal
-    from xml.dom.minicompat import NodeList
+
+class XMLNode:
+    """
+    A node of a strings.xml document.
+
+    This has the parts of the xml.dom.minidom node interface used here,
+    and serializes with toxml() like it, but without the DOM overhead.
+    For the children of the root element, span is their source span.
+    """
+
+    __slots__ = (
+        "nodeType",
+        "nodeName",
+        "nodeValue",
+        "attributes",
+        "childNodes",
+        "span",
+    )
+
+    def __init__(self, nodeType: int, nodeName: str, nodeValue: str = "") -> None:
+        self.nodeType = nodeType
+        self.nodeName = nodeName
+        self.nodeValue = nodeValue
+        self.attributes: dict[str, str] = {}
+        self.childNodes: list[XMLNode] = []
+        self.span = (0, 0)
+
+    def hasAttribute(self, name: str) -> bool:
+        return name in self.attributes
+
+    def getAttribute(self, name: str) -> str:
+        return self.attributes.get(name, "")
+
+    def toxml(self) -> str:
+        chunks: list[str] = []
+        self._write(chunks)
+        return "".join(chunks)
+
+    def _write(self, chunks: list[str]) -> None:
+        if self.nodeType == Node.TEXT_NODE:
+            chunks.append(escape(self.nodeValue))
+        elif self.nodeType == Node.CDATA_SECTION_NODE:
+            chunks.append(f"<![CDATA[{self.nodeValue}]]>")
+        elif self.nodeType == Node.COMMENT_NODE:
+            chunks.append(f"<!--{self.nodeValue}-->")
+        elif self.nodeType == Node.PROCESSING_INSTRUCTION_NODE:
+            chunks.append(f"<?{self.nodeName} {self.nodeValue}?>")
+        else:
+            chunks.append("<" + self.nodeName)
+            for name, value in self.attributes.items():
+                chunks.append(f' {name}="{escape(value)}"')
+            if self.childNodes:
+                chunks.append(">")
+                for child in self.childNodes:
+                    child._write(chunks)
+                chunks.append(f"</{self.nodeName}>")
+            else:
+                chunks.append("/>")
+
+
+def escape(data: str) -> str:
+    return (
+        data.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace('"', "&quot;")
+        .replace(">", "&gt;")
+    )
+
+
+CHUNK_SIZE = 2**16
+
+
+def check_xml(contents: str) -> None:
+    """Raise an exception if contents is not a well-formed XML document."""
+    parser = expat.ParserCreate(namespace_separator=" ")
+    for start in range(0, len(contents), CHUNK_SIZE):
+        parser.Parse(contents[start : start + CHUNK_SIZE].encode("utf-8"), False)
+    parser.Parse(b"", True)
+
+
+class XMLBuilder:
+    """
+    Build XMLNode objects from expat events,
+    with the same structure as xml.dom.minidom would build.
+
+    The contents are parsed in chunks by feed(),
+    and each child of the root element is added to children
+    once it is complete, along with its descendants.
+    The contents should already be checked with check_xml().
+    """
+
+    def __init__(self, contents: str) -> None:
+        self.contents = contents
+        self.is_ascii = contents.isascii()
+        self.done = False
+        # The (byte, character) offsets of the parsed chunks
+        self.chunks: list[tuple[int, int]] = []
+        self.next_byte = 0
+        self.chunk_idx = 0
+        self.chunk_data = b""
+        self.byte_pos = 0
+        self.char_pos = 0
+        self.root: XMLNode | None = None
+        self.root_end = len(contents)
+        self.children: list[XMLNode] = []
+        self.children_offset = 0
+        self.stack: list[XMLNode] = []
+        self.last_child: XMLNode | None = None
+        self.ns_decls: list[tuple[str, str | None]] = []
+        self.cdata = False
+        self.cdata_continue = False
+        self.cdata_start = 0
+        parser = expat.ParserCreate(namespace_separator=" ")
+        parser.namespace_prefixes = True
+        parser.ordered_attributes = True
+        parser.specified_attributes = True
+        parser.StartNamespaceDeclHandler = self.start_namespace_decl
+        parser.StartElementHandler = self.start_element
+        parser.EndElementHandler = self.end_element
+        parser.CharacterDataHandler = self.character_data
+        parser.CommentHandler = self.comment
+        parser.ProcessingInstructionHandler = self.processing_instruction
+        parser.StartCdataSectionHandler = self.start_cdata_section
+        parser.EndCdataSectionHandler = self.end_cdata_section
+        self.parser = parser
+
+    def feed(self) -> bool:
+        """Parse the next chunk of the contents.
+
+        Returns False if all of the contents have already been parsed.
+        """
+        if self.done:
+            return False
+        start = len(self.chunks) * CHUNK_SIZE
+        if start < len(self.contents):
+            data = self.contents[start : start + CHUNK_SIZE].encode("utf-8")
+            self.chunks.append((self.next_byte, start))
+            self.next_byte += len(data)
+            self.parser.Parse(data, False)
+        else:
+            self.parser.Parse(b"", True)
+            self.done = True
+        return True
+
+    def has_child(self, idx: int) -> bool:
+        """Parse the contents until the idx'th child of the root is complete.
+
+        Returns False if the root has no such child.
+        """
+        while idx - self.children_offset >= len(self.children):
+            if not self.feed():
+                return False
+        return True
+
+    def child(self, idx: int) -> XMLNode:
+        return self.children[idx - self.children_offset]
+
+    def release(self, idx: int) -> None:
+        """Drop the children of the root before idx, which are no longer needed."""
+        count = idx - self.children_offset
+        if count >= 1024:
+            del self.children[:count]
+            self.children_offset = idx
+
+    def position(self) -> int:
+        """The character offset of the current event.
+
+        This must be called with increasing positions.
+        """
+        pos = self.parser.CurrentByteIndex
+        if self.is_ascii:
+            return pos
+        chunks = self.chunks
+        if not self.chunk_data or (
+            self.chunk_idx + 1 < len(chunks) and chunks[self.chunk_idx + 1][0] <= pos
+        ):
+            while (
+                self.chunk_idx + 1 < len(chunks)
+                and chunks[self.chunk_idx + 1][0] <= pos
+            ):
+                self.chunk_idx += 1
+            self.byte_pos, self.char_pos = chunks[self.chunk_idx]
+            self.chunk_data = self.contents[
+                self.char_pos : self.char_pos + CHUNK_SIZE
+            ].encode("utf-8")
+        base = chunks[self.chunk_idx][0]
+        data = self.chunk_data[self.byte_pos - base : pos - base]
+        self.char_pos += len(data.decode("utf-8"))
+        self.byte_pos = pos
+        return self.char_pos
+
+    def append(self, node: XMLNode, start: int | None = None) -> None:
+        if len(self.stack) == 1:
+            # The spans of the root's children are contiguous,
+            # so each one ends where the next one starts.
+            if start is None:
+                start = self.position()
+            if self.last_child is not None:
+                self.last_child.span = (self.last_child.span[0], start)
+                self.children.append(self.last_child)
+            node.span = (start, start)
+            self.last_child = node
+        else:
+            self.stack[-1].childNodes.append(node)
+
+    def start_namespace_decl(self, prefix: str | None, uri: str | None) -> None:
+        self.ns_decls.append((prefix or "", uri))
+
+    def start_element(self, name: str, attributes: list[str]) -> None:
+        node = XMLNode(Node.ELEMENT_NODE, qname(name))
+        for prefix, uri in self.ns_decls:
+            node.attributes[f"xmlns:{prefix}" if prefix else "xmlns"] = uri or ""
+        self.ns_decls.clear()
+        for i in range(0, len(attributes), 2):
+            node.attributes[qname(attributes[i])] = attributes[i + 1]
+        if self.stack:
+            self.append(node)
+        else:
+            self.root = node
+            node.span = (self.position(), 0)
+        self.stack.append(node)
+
+    def end_element(self, name: str) -> None:
+        self.stack.pop()
+        if not self.stack:
+            self.root_end = self.position()
+            if self.last_child is not None:
+                self.last_child.span = (self.last_child.span[0], self.root_end)
+                self.children.append(self.last_child)
+                self.last_child = None
+
+    def character_data(self, data: str) -> None:
+        if len(self.stack) == 1:
+            prev = self.last_child
+        else:
+            children = self.stack[-1].childNodes
+            prev = children[-1] if children else None
+        if self.cdata:
+            if self.cdata_continue and prev is not None:
+                prev.nodeValue += data
+                return
+            node = XMLNode(Node.CDATA_SECTION_NODE, "#cdata-section", data)
+            self.cdata_continue = True
+            self.append(node, self.cdata_start)
+        elif prev is not None and prev.nodeType == Node.TEXT_NODE:
+            prev.nodeValue += data
+        else:
+            self.append(XMLNode(Node.TEXT_NODE, "#text", data))
+
+    def comment(self, data: str) -> None:
+        if self.stack:
+            self.append(XMLNode(Node.COMMENT_NODE, "#comment", data))
+
+    def processing_instruction(self, target: str, data: str) -> None:
+        if self.stack:
+            self.append(XMLNode(Node.PROCESSING_INSTRUCTION_NODE, target, data))
+
+    def start_cdata_section(self) -> None:
+        self.cdata = True
+        self.cdata_continue = False
+        if len(self.stack) == 1:
+            self.cdata_start = self.position()
+
+    def end_cdata_section(self) -> None:
+        self.cdata = False
+        self.cdata_continue = False
+
+
+def qname(name: str) -> str:
+    # With namespace processing, expat names are "uri local prefix"
+    parts = name.split(" ")
+    if len(parts) == 3:
+        return f"{parts[2]}:{parts[1]}"
+    return parts[-1]
+
+
+# Source spans of start tags and their attributes,
+# only used on contents that expat has found to be well-formed.
+START_TAG = re.compile(
+    r"<[^\s/>]+(?P<attrs>(?:\s+[^\s=]+\s*=\s*(?:\"[^\"]*\"|'[^']*'))*)\s*(?P<end>/?)>"
+)
+ATTRIBUTE = re.compile(
+    r"(?P<name>[^\s=]+)\s*=\s*(?:\"(?P<dq>[^\"]*)\"|'(?P<sq>[^']*)')"
+)
+
+
+def attribute_spans(contents: str, tag: re.Match[str]) -> dict[str, tuple[int, int]]:
+    spans: dict[str, tuple[int, int]] = {}
+    for m in ATTRIBUTE.finditer(contents, tag.start("attrs"), tag.end("attrs")):
+        spans[m["name"]] = m.span("dq") if m["dq"] is not None else m.span("sq")
+    return spans
 
 
 class AndroidEntity(Entity):
@@ -40,25 +328,20 @@ class AndroidEntity(Entity):
         ctx: Parser.Context,
         pre_comment: XMLComment | None,
         white_space: XMLWhitespace | None,
-        node: minidom.Element,
-        all: str,
-        key: str,
-        raw_val: str,
-        val: str,
+        node: XMLNode,
+        span: tuple[int, int],
+        key_span: tuple[int, int],
+        val_span: tuple[int, int],
     ) -> None:
-        # fill out superclass as good as we can right now
-        # most span can get modified at endElement
-        super().__init__(
-            ctx, pre_comment, white_space, (None, None), (None, None), (None, None)  # type: ignore
-        )
+        super().__init__(ctx, pre_comment, white_space, span, key_span, val_span)
         self.node = node
-        self._all_literal = all
-        self._key_literal = key
-        self._raw_val_literal = raw_val
-        self._val_literal = val
+        self._all_literal: str | None = None
+        self._raw_val_literal: str | None = None
 
     @property
     def all(self) -> str:
+        if self._all_literal is None:
+            self._all_literal = self.node.toxml()
         chunks = []
         if self.pre_comment is not None:
             chunks.append(self.pre_comment.all)
@@ -69,24 +352,25 @@ class AndroidEntity(Entity):
 
     @property
     def key(self) -> str:
-        return self._key_literal
+        return self.node.getAttribute("name")
 
     @property
     def raw_val(self) -> str:
+        if self._raw_val_literal is None:
+            self._raw_val_literal = textContent(self.node)
         return self._raw_val_literal
 
-    def position(self, offset: int = 0) -> tuple[Literal[0], int]:
-        return (0, offset)
-
-    def value_position(self, offset: int = 0) -> tuple[Literal[0], int]:
-        return (0, offset)
-
     def wrap(self, raw_val: str) -> LiteralEntity:
-        clone = cast(minidom.Element, self.node.cloneNode(True))  # type:ignore
-        for child in clone.childNodes:
+        clone = copy(self.node)
+        clone.childNodes = list(self.node.childNodes)
+        for idx, child in enumerate(clone.childNodes):
             if child.nodeType == Node.CDATA_SECTION_NODE:
                 break
-        child.data = raw_val
+        if not clone.childNodes:
+            clone.childNodes.append(XMLNode(Node.TEXT_NODE, "#text", raw_val))
+        elif child.nodeType != Node.ELEMENT_NODE:
+            clone.childNodes[idx] = copy(child)
+            clone.childNodes[idx].nodeValue = raw_val
         all = []
         if self.pre_comment is not None:
             all.append(self.pre_comment.all)
@@ -95,9 +379,24 @@ class AndroidEntity(Entity):
         all.append(clone.toxml())
         return LiteralEntity(self.key, raw_val, "".join(all))
 
+    def _val_splice(self, raw_val: str) -> tuple[int, int, str]:
+        start, end = self.val_span
+        contents = self.ctx.contents
+        if raw_val and start == end and contents.endswith("/>", 0, start):
+            # An empty element <string name="..."/> gets an end tag
+            tag_start = self.span[0]
+            tag = contents[tag_start : start - 2].rstrip()
+            name = self.node.nodeName
+            return tag_start, start, f"{tag}>{raw_val}</{name}>"
+        return start, end, raw_val
+
 
 class NodeMixin:
-    def __init__(self, all: str, value: str) -> None:
+    def __init__(
+        self, ctx: Parser.Context, span: tuple[int, int], all: str, value: str
+    ) -> None:
+        self.ctx = ctx
+        self.span = span
         self._all_literal = all
         self._val_literal = value
 
@@ -113,15 +412,13 @@ class NodeMixin:
     def raw_val(self) -> str:
         return self._val_literal
 
-    def position(self, offset: int = 0) -> tuple[Literal[0], int]:
-        return (0, offset)
 
-    def value_position(self, offset: int = 0) -> tuple[Literal[0], int]:
-        return (0, offset)
-
-
-class XMLWhitespace(NodeMixin, Whitespace):  # type:ignore[misc]
-    pass
+class XMLWhitespace(NodeMixin, Whitespace):  # type:ignore[override]
+    def __init__(
+        self, ctx: Parser.Context, span: tuple[int, int], all: str, value: str
+    ) -> None:
+        super().__init__(ctx, span, all, value)
+        self.key_span = self.val_span = span
 
 
 class XMLComment(NodeMixin, Comment):
@@ -137,9 +434,10 @@ class XMLComment(NodeMixin, Comment):
 # DocumentWrapper is sticky in serialization.
 # Always keep the one from the reference document.
 class DocumentWrapper(NodeMixin, StickyEntry):
-    def __init__(self, key: str, all: str) -> None:
-        self._all_literal = all
-        self._val_literal = all
+    def __init__(
+        self, ctx: Parser.Context, span: tuple[int, int], key: str, all: str
+    ) -> None:
+        super().__init__(ctx, span, all, all)
         self._key_literal = key
 
     @property
@@ -148,34 +446,25 @@ class DocumentWrapper(NodeMixin, StickyEntry):
 
 
 class XMLJunk(Junk):
-    def __init__(self, all: str) -> None:
-        super().__init__(None, (0, 0))  # type: ignore
+    def __init__(self, ctx: Parser.Context, span: tuple[int, int], all: str) -> None:
+        super().__init__(ctx, span)
         self._all_literal = all
 
     @property
     def all(self) -> str:
         return self._all_literal
 
-    def position(self, offset: int = 0) -> tuple[Literal[0], int]:
-        return (0, offset)
-
-    def value_position(self, offset: int = 0) -> tuple[Literal[0], int]:
-        return (0, offset)
-
 
-def textContent(node: minidom.Element) -> str:
-    if node.childNodes.length == 0:
+def textContent(node: XMLNode) -> str:
+    if len(node.childNodes) == 0:
         return ""
     for child in node.childNodes:
-        if child.nodeType == minidom.Node.CDATA_SECTION_NODE:
-            return cast(str, child.data)
-    if (
-        node.childNodes.length != 1
-        or node.childNodes[0].nodeType != minidom.Node.TEXT_NODE
-    ):
+        if child.nodeType == Node.CDATA_SECTION_NODE:
+            return child.nodeValue
+    if len(node.childNodes) != 1 or node.childNodes[0].nodeType != Node.TEXT_NODE:
         # Return something, we'll fail in checks on this
         return node.toxml()
-    return cast(str, node.childNodes[0].data)
+    return node.childNodes[0].nodeValue
 
 
 NEWLINE = re.compile(r"[ \t]*\n[ \t]*")
@@ -204,32 +493,52 @@ class AndroidParser(Parser):
         ctx = self.ctx
         contents = ctx.contents
         try:
-            doc = minidom.parseString(contents.encode("utf-8"))
+            check_xml(contents)
         except Exception:
-            yield XMLJunk(contents)
+            yield XMLJunk(ctx, (0, len(contents)), contents)
             return
-        docElement = doc.documentElement
+        builder = XMLBuilder(contents)
+        while builder.root is None and builder.feed():
+            pass
+        docElement = builder.root
+        assert docElement is not None
         if docElement.nodeName != "resources":
-            yield XMLJunk(doc.toxml())
+            # Serialize the whole document like xml.dom.minidom did,
+            # which is not needed for any valid file.
+            from xml.dom import minidom
+
+            doc = minidom.parseString(contents.encode("utf-8"))
+            yield XMLJunk(ctx, (0, len(contents)), doc.toxml())
             return
-        root_children = docElement.childNodes
         if not only_localizable:
+            start = docElement.span[0]
+            tag = START_TAG.match(contents, start)
+            assert tag is not None
             yield DocumentWrapper(
+                ctx,
+                (0, tag.start("attrs")),
                 "<?xml?><resources>",
                 '<?xml version="1.0" encoding="utf-8"?>\n<resources',
             )
+            attr_spans = attribute_spans(contents, tag)
             for attr_name, attr_value in docElement.attributes.items():
-                yield DocumentWrapper(attr_name, f' {attr_name}="{attr_value}"')
-            yield DocumentWrapper(">", ">")
+                yield DocumentWrapper(
+                    ctx,
+                    attr_spans.get(attr_name, (start, start)),
+                    attr_name,
+                    f' {attr_name}="{attr_value}"',
+                )
+            yield DocumentWrapper(ctx, (tag.end() - 1, tag.end()), ">", ">")
         child_num = 0
-        while child_num < len(root_children):
-            node = root_children[child_num]
+        while builder.has_child(child_num):
+            builder.release(child_num)
+            node = builder.child(child_num)
             if node.nodeType == Node.COMMENT_NODE:
                 current_comment, child_num = self.handleComment(
-                    node, root_children, child_num
+                    node, builder, child_num
                 )
-                if child_num < len(root_children):
-                    node = root_children[child_num]
+                if builder.has_child(child_num):
+                    node = builder.child(child_num)
                 else:
                     if not only_localizable:
                         yield current_comment
@@ -237,7 +546,9 @@ class AndroidParser(Parser):
             else:
                 current_comment = None
             if node.nodeType in (Node.TEXT_NODE, Node.CDATA_SECTION_NODE):
-                white_space = XMLWhitespace(node.toxml(), node.nodeValue)
+                white_space = XMLWhitespace(
+                    ctx, node.span, node.toxml(), node.nodeValue
+                )
                 child_num += 1
                 if current_comment is None:
                     if not only_localizable:
@@ -249,8 +560,8 @@ class AndroidParser(Parser):
                             yield current_comment
                         yield white_space
                     continue
-                if child_num < len(root_children):
-                    node = root_children[child_num]
+                if builder.has_child(child_num):
+                    node = builder.child(child_num)
                 else:
                     if not only_localizable:
                         if current_comment is not None:
@@ -269,49 +580,62 @@ class AndroidParser(Parser):
                         yield white_space
             child_num += 1
         if not only_localizable:
-            yield DocumentWrapper("</resources>", "</resources>\n")
+            yield DocumentWrapper(
+                ctx,
+                (min(builder.root_end, len(contents)), len(contents)),
+                "</resources>",
+                "</resources>\n",
+            )
 
     def handleElement(
         self,
-        element: minidom.Element,
+        element: XMLNode,
         current_comment: XMLComment | None,
         white_space: XMLWhitespace | None,
     ) -> AndroidEntity | XMLJunk:
+        ctx = self.ctx
+        assert ctx is not None
         if element.nodeName == "string" and element.hasAttribute("name"):
+            contents = ctx.contents
+            start, end = element.span
+            tag = START_TAG.match(contents, start)
+            assert tag is not None
+            val_start = tag.end()
+            val_end = val_start if tag["end"] else contents.rfind("</", val_start, end)
             return AndroidEntity(
-                self.ctx,  # type: ignore
+                ctx,
                 current_comment,
                 white_space,
                 element,
-                element.toxml(),
-                element.getAttribute("name"),
-                textContent(element),
-                "".join(c.toxml() for c in element.childNodes),
+                element.span,
+                attribute_spans(contents, tag).get("name", (start, start)),
+                (val_start, val_end),
             )
         else:
-            return XMLJunk(element.toxml())
+            return XMLJunk(ctx, element.span, element.toxml())
 
     def handleComment(
         self,
-        node: minidom.Comment,
-        root_children: NodeList[minidom.Element],
+        node: XMLNode,
+        builder: XMLBuilder,
         child_num: int,
     ) -> tuple[XMLComment, int]:
+        start, end = node.span
         all = node.toxml()
         val = normalize(node.nodeValue)
         while True:
             child_num += 1
-            if child_num >= len(root_children):
+            if not builder.has_child(child_num):
                 break
-            node_ = root_children[child_num]
+            node_ = builder.child(child_num)
             if node_.nodeType == Node.TEXT_NODE:
                 if node_.nodeValue.count("\n") > 1:
                     break
                 white = node_
                 child_num += 1
-                if child_num >= len(root_children):
+                if not builder.has_child(child_num):
                     break
-                node_ = root_children[child_num]
+                node_ = builder.child(child_num)
             else:
                 white = None
             if node_.nodeType != Node.COMMENT_NODE:
@@ -324,4 +648,6 @@ class AndroidParser(Parser):
                 val += normalize(white.nodeValue)
             all += node_.toxml()
             val += normalize(node_.nodeValue)
-        return XMLComment(all, val), child_num
+            end = node_.span[1]
+        assert self.ctx is not None
+        return XMLComment(self.ctx, (start, end), all, val), child_num
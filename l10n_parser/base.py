@@ -7,9 +7,14 @@ from __future__ import annotations
 import bisect
 import codecs
 import re
+from array import array
 from collections import Counter
-from collections.abc import Iterable, Iterator
-from typing import TYPE_CHECKING, Any, overload
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from copy import copy
+from hashlib import blake2b
+from sys import maxsize
+from threading import Lock
+from typing import TYPE_CHECKING, Any, cast, overload
 
 if TYPE_CHECKING:
     from typing import Literal
@@ -130,6 +135,12 @@ class Entry:
     def equals(self, other: Entity) -> bool:
         return self.key == other.key and self.val == other.val
 
+    def digest(self) -> bytes:
+        """A short digest of the value,
+        for comparing entities that are parsed in different processes.
+        """
+        return blake2b((self.val or "").encode(), digest_size=8).digest()
+
 
 class StickyEntry(Entry):
     """Subclass of Entry to use in for syntax fragments
@@ -166,6 +177,14 @@ class Entity(Entry):
         )
         return LiteralEntity(self.key, raw_val, all)
 
+    def _val_splice(self, raw_val: str) -> tuple[int, int, str]:
+        """The range of the contents to replace with `raw_val` in a rewrite,
+        and the text to replace it with.
+        """
+        if self.val_span is None:
+            raise ValueError(f"Entity {self.key!r} has no value to rewrite")
+        return self.val_span[0], self.val_span[1], raw_val
+
 
 class LiteralEntity(Entity):
     """Subclass of Entity to represent entities without context slices.
@@ -245,6 +264,7 @@ class Junk:
     """
 
     junkid = 0
+    _junkid_lock = Lock()
 
     def __init__(
         self,
@@ -253,8 +273,10 @@ class Junk:
     ) -> None:
         self.ctx = ctx
         self.span = span
-        self.__class__.junkid += 1
-        self.key = "_junk_%d_%d-%d" % (self.__class__.junkid, span[0], span[1])
+        with Junk._junkid_lock:
+            self.__class__.junkid += 1
+            junkid = self.__class__.junkid
+        self.key = "_junk_%d_%d-%d" % (junkid, span[0], span[1])
 
     def position(self, offset: int = 0) -> tuple[int, int]:
         """Get the 1-based line and column of the character
@@ -316,6 +338,31 @@ class BadEntity(ValueError):
 Comment_ = Comment
 
 
+class LazyPattern:
+    """
+    A regular expression class attribute, which is compiled on first use.
+
+    Used for large patterns, so that importing a parser stays cheap.
+    """
+
+    def __init__(self, pattern: str, flags: int = 0) -> None:
+        self.pattern = pattern
+        self.flags = flags
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.owner = owner
+        self.name = name
+
+    def __get__(self, obj: object, objtype: type | None = None) -> re.Pattern[str]:
+        compiled = re.compile(self.pattern, self.flags)
+        # Replace this descriptor with the compiled pattern.
+        setattr(self.owner, self.name, compiled)
+        return compiled
+
+
+_newline = re.compile("\n")
+
+
 class Parser:
     capabilities = CAN_SKIP | CAN_MERGE
     reWhitespace = re.compile("[ \t\r\n]+", re.M)
@@ -329,20 +376,64 @@ class Parser:
 
         def __init__(self, contents: str):
             self.contents = contents
-            # cache split lines
-            self._lines: list[int] | None = None
+            # cache line start offsets
+            self._lines: array[int] | None = None
+            # cache search results, as (offset, match start)
+            self._searches: dict[re.Pattern[str], tuple[int, int]] = {}
+            # cache entities by key, for rewrites
+            self._entities: dict[Any, list[Entity]] | None = None
+
+        def _line_starts(self) -> array[int]:
+            if self._lines is None:
+                starts = array("q", [0])
+                starts.extend(map(re.Match.end, _newline.finditer(self.contents)))
+                self._lines = starts
+            return self._lines
 
         def linecol(self, position: int) -> tuple[int, int]:
             "Returns 1-based line and column numbers."
-            if self._lines is None:
-                nl = re.compile("\n", re.M)
-                self._lines = [m.end() for m in nl.finditer(self.contents)]
-
-            line_offset = bisect.bisect(self._lines, position)
-            line_start = self._lines[line_offset - 1] if line_offset else 0
-            col_offset = position - line_start
-
-            return line_offset + 1, col_offset + 1
+            starts = self._line_starts()
+            line = bisect.bisect(starts, position) or 1
+            return line, position - starts[line - 1] + 1
+
+        def linecols(self, positions: Iterable[int]) -> list[tuple[int, int]]:
+            """Returns 1-based line and column numbers for each position.
+
+            Positions on the same line as the previous one are resolved
+            without a lookup, and later ones only search the following lines,
+            so sorted positions are resolved in a single sweep.
+            """
+            starts = self._line_starts()
+            line_count = len(starts)
+            res: list[tuple[int, int]] = []
+            line = 1
+            line_start = 0
+            next_start = starts[1] if line_count > 1 else maxsize
+            for position in positions:
+                if position >= next_start or position < line_start:
+                    lo = line if position >= line_start else 0
+                    line = bisect.bisect(starts, position, lo) or 1
+                    line_start = starts[line - 1]
+                    next_start = starts[line] if line < line_count else maxsize
+                res.append((line, position - line_start + 1))
+            return res
+
+        def search(self, exp: re.Pattern[str], offset: int) -> int:
+            """Returns the start of the first match of exp at or after offset,
+            or -1 if there is none.
+
+            Repeated searches with increasing offsets reuse earlier results,
+            so the contents are scanned at most once for each expression.
+            """
+            prev = self._searches.get(exp)
+            if prev is not None:
+                prev_offset, start = prev
+                if prev_offset <= offset and (start == -1 or start >= offset):
+                    return start
+            m = exp.search(self.contents, offset)
+            start = m.start() if m else -1
+            self._searches[exp] = (offset, start)
+            return start
 
     def __init__(self) -> None:
         if not hasattr(self, "encoding"):
@@ -365,6 +456,34 @@ class Parser:
     def readUnicode(self, contents: str) -> None:
         self.ctx = self.Context(contents)
 
+    def parseFile(self, file: str) -> Parser:
+        """Like readFile, but returns a new parser for the file contents.
+
+        See parseUnicode.
+        """
+        with open(file, encoding=self.encoding, errors="replace", newline=None) as f:
+            return self.parseUnicode(f.read())
+
+    def parseContents(self, contents: bytes) -> Parser:
+        """Like readContents, but returns a new parser for the contents.
+
+        See parseUnicode.
+        """
+        (string, _) = codecs.getdecoder(self.encoding)(contents, "replace")
+        return self.parseUnicode(string)
+
+    def parseUnicode(self, contents: str) -> Parser:
+        """Create a copy of this parser with its own parsing context.
+
+        This parser is not modified, so unlike the read* methods,
+        this may be called concurrently from multiple threads.
+        The returned parser may be iterated or walked like this one,
+        and shares its configuration, but not its parsing state.
+        """
+        parser = copy(self)
+        parser.ctx = parser.Context(contents)
+        return parser
+
     def __iter__(self) -> Iterator[Entity | Junk]:
         return self.walk(only_localizable=True)
 
@@ -378,17 +497,30 @@ class Parser:
         if not self.ctx:
             # loading file failed, or we just didn't load anything
             return
-        ctx = self.ctx
-        contents = ctx.contents
+        if only_localizable:
+            for entity in self.tokenize(self.ctx):
+                if isinstance(entity, (Entity, Junk)):
+                    yield entity
+        else:
+            yield from self.tokenize(self.ctx)
 
-        next_offset = 0
-        while next_offset < len(contents):
-            entity = self.getNext(ctx, next_offset)
+    def tokenize(self, ctx: Parser.Context, offset: int = 0) -> Iterator[Any]:
+        """Parse all fragments from offset to the end of the contents.
 
-            if isinstance(entity, (Entity, Junk)) or not only_localizable:
+        This yields the same fragments as repeated calls to getNext,
+        but without parsing any part of the contents more than once.
+        """
+        if offset >= len(ctx.contents):
+            return
+        if type(self).getNext is not Parser.getNext:
+            # A subclass with its own getNext
+            contents_len = len(ctx.contents)
+            while offset < contents_len:
+                entity = self.getNext(ctx, offset)
                 yield entity
-
-            next_offset = entity.span[1]
+                offset = entity.span[1]
+        else:
+            yield from self._tokenize(ctx, offset)
 
     def getNext(self, ctx: Parser.Context, offset: int) -> Entry | Junk:
         """Parse the next fragment.
@@ -396,47 +528,98 @@ class Parser:
         Parse comments first, then white-space.
         If an entity follows, create that entity with such pre_comment and
         inner white-space. If not, emit comment or white-space as standlone.
-        It's OK that this might parse whitespace more than once.
         Comments are associated with entities if they're not separated by
         blank lines. Multiple consecutive comments are joined.
         """
-        junk_offset = offset
-        m = self.reComment.match(ctx.contents, offset)
-        if m:
-            current_comment = self.Comment(ctx, m.span())
-            if offset < 2 and "License" in current_comment.val:
-                # Heuristic. A early comment with "License" is probably
-                # a license header, and should be standalone.
-                # Not glueing ourselves to offset == 0 as we might have
-                # skipped a BOM.
-                return current_comment
-            offset = m.end()
-        else:
-            current_comment = None
-        m = self.reWhitespace.match(ctx.contents, offset)
-        if m:
-            white_space = Whitespace(ctx, m.span())
-            offset = m.end()
-            if current_comment is not None and white_space.raw_val.count("\n") > 1:
-                # standalone comment
-                # return the comment, and reparse the whitespace next time
-                return current_comment
-            if current_comment is None:
-                return white_space
-        else:
-            white_space = None
-        m = self.reKey.match(ctx.contents, offset)
-        if m:
-            try:
-                return self.createEntity(ctx, m, current_comment, white_space)
-            except BadEntity:
-                # fall through to Junk, probably
-                pass
-        if current_comment is not None:
-            return current_comment
-        if white_space is not None:
-            return white_space
-        return self.getJunk(ctx, junk_offset, self.reKey, self.reComment)
+        return next(self._tokenize(ctx, offset))  # type: ignore[no-any-return]
+
+    def _tokenize(self, ctx: Parser.Context, offset: int) -> Iterator[Any]:
+        """Parse fragments from offset, until the end of the contents.
+
+        At least one fragment is always yielded.
+        When a comment is followed by white-space that is not a part of
+        the comment's entity, that white-space is the next fragment,
+        and it's not parsed again.
+        """
+        contents = ctx.contents
+        contents_len = len(contents)
+        match_comment = self.reComment.match
+        match_whitespace = self.reWhitespace.match
+        match_key = self.reKey.match
+        # What's already known about the start of the next fragment.
+        # If next_ws_at is offset, next_ws is the white-space found there,
+        # or None if there is none. If no_key_at is offset, reKey fails there.
+        next_ws_at = -1
+        next_ws: Whitespace | None = None
+        no_key_at = -1
+        while True:
+            junk_offset = offset
+            m = match_comment(contents, offset)
+            if m:
+                current_comment = self.Comment(ctx, m.span())
+                if offset < 2 and "License" in current_comment.val:
+                    # Heuristic. A early comment with "License" is probably
+                    # a license header, and should be standalone.
+                    # Not glueing ourselves to offset == 0 as we might have
+                    # skipped a BOM.
+                    entity: Any = current_comment
+                    yield entity
+                    offset = entity.span[1]
+                    if offset >= contents_len:
+                        return
+                    continue
+                offset = m.end()
+            else:
+                current_comment = None
+            if offset == next_ws_at:
+                white_space = next_ws
+            else:
+                m = match_whitespace(contents, offset)
+                white_space = Whitespace(ctx, m.span()) if m else None
+            if white_space is not None:
+                if current_comment is None:
+                    entity = white_space
+                elif white_space.raw_val.count("\n") > 1:
+                    # standalone comment, followed by the white-space
+                    entity = current_comment
+                    next_ws_at = offset
+                    next_ws = white_space
+                else:
+                    entity = None
+                offset = white_space.span[1]
+            else:
+                entity = None
+            if entity is None:
+                if offset == no_key_at:
+                    m = None
+                else:
+                    m = match_key(contents, offset)
+                if m:
+                    try:
+                        entity = self.createEntity(ctx, m, current_comment, white_space)
+                    except BadEntity:
+                        # fall through to Junk, probably
+                        pass
+                if entity is None:
+                    if current_comment is not None:
+                        entity = current_comment
+                        next_ws_at = current_comment.span[1]
+                        next_ws = white_space
+                        if m is None:
+                            no_key_at = offset
+                    else:
+                        entity = self._recover(ctx, junk_offset)
+            yield entity
+            offset = entity.span[1]
+            if offset >= contents_len:
+                return
+
+    def _recover(self, ctx: Parser.Context, offset: int) -> Entry | Junk:
+        """Parse a fragment that is not a comment, white-space, or entity.
+
+        By default, that's Junk.
+        """
+        return self.getJunk(ctx, offset, self.reKey, self.reComment)
 
     def getJunk(
         self,
@@ -444,11 +627,23 @@ class Parser:
         offset: int,
         *expressions: re.Pattern[str],
     ) -> Junk:
+        """Create Junk from offset up to the next match of any expression.
+
+        At offset 0, a match at the offset may make the junk extend
+        to the end of the contents, as it always has.
+        Elsewhere junk is never empty, so matches at the offset are skipped.
+        """
         junkend: int | None = None
         for exp in expressions:
-            m = exp.search(ctx.contents, offset)
-            if m:
-                junkend = min(junkend, m.start()) if junkend else m.start()
+            start = ctx.search(exp, offset)
+            if start != -1:
+                junkend = min(junkend, start) if junkend else start
+        if offset and junkend == offset:
+            junkend = None
+            for exp in expressions:
+                start = ctx.search(exp, offset + 1)
+                if start != -1:
+                    junkend = min(junkend, start) if junkend else start
         return Junk(ctx, (offset, junkend or len(ctx.contents)))
 
     def createEntity(
@@ -462,9 +657,197 @@ class Parser:
             ctx, current_comment, white_space, m.span(), m.span("key"), m.span("val")
         )
 
+    def scanKeys(self, junk: list[Junk] | None = None) -> list[str]:
+        """Get the keys of all entities, in order.
+
+        For most formats, this is faster than walking the entities,
+        as their values and comments are not parsed.
+        If a `junk` list is given, any Junk that is found is appended to it.
+        """
+        if not self.ctx:
+            return []
+        keys = self._scanKeys(self.ctx)
+        if keys is None:
+            keys = []
+            for entity in self.walk(only_localizable=True):
+                if isinstance(entity, Entity):
+                    keys.append(entity.key)
+                elif junk is not None:
+                    junk.append(entity)
+        return keys
+
+    def _scanKeys(self, ctx: Parser.Context) -> list[str] | None:
+        """Scan the keys of all entities without creating them.
+
+        Returns None if that's not supported, or if the contents include anything
+        that would be parsed as Junk or as some other kind of fragment.
+
+        Comments and white space are skipped along with anything `_scanSkip()`
+        skips, and each key matched by `reKey` is followed by a value
+        that ends at `_scanValueEnd()`.
+        """
+        if self.reKey is None:
+            return None
+        # Comments and white-space only separate entities,
+        # so they can be skipped without tracking how they'd be grouped.
+        contents = ctx.contents
+        contents_len = len(contents)
+        match_comment = self.reComment.match
+        match_whitespace = self.reWhitespace.match
+        match_key = self.reKey.match
+        scan_skip = self._scanSkip
+        value_end = self._scanValueEnd
+        keys: list[str] = []
+        offset = 0
+        while offset < contents_len:
+            m = match_comment(contents, offset) or match_whitespace(contents, offset)
+            if m:
+                offset = m.end()
+                continue
+            end = scan_skip(contents, offset)
+            if end != offset:
+                if end is None:
+                    return None
+                offset = end
+                continue
+            m = match_key(contents, offset)
+            if m is None:
+                return None
+            keys.append(m.group("key"))
+            offset = value_end(contents, m)
+        return keys
+
+    def _scanSkip(self, contents: str, offset: int) -> int | None:
+        """The end of a fragment at offset that `_scanKeys()` skips,
+        offset if there is none, or None if keys can't be scanned past it."""
+        return offset
+
+    def _scanValueEnd(self, contents: str, m: re.Match[str]) -> int:
+        """The end of the entity with the key matched by `m`, for `_scanKeys()`."""
+        return m.end()
+
+    def unescapeValues(self, entities: Iterable[Entity]) -> list[str | None]:
+        """Get the values of all the entities, in order.
+
+        For formats with escaped values, this decodes them all in one pass
+        and caches the results on the entities.
+        """
+        return [entity.val for entity in entities]
+
+    def rewrite(self, changes: Mapping[Any, str]) -> str:
+        """Get the contents with the raw values of some entities changed.
+
+        The keys of `changes` are entity keys, and its values are the source text
+        to put in place of each entity's `val_span`,
+        i.e. the same form as the `raw_val` of .properties, .dtd, and .ftl entities.
+        For Android strings.xml, this is the escaped XML content of the element.
+        If a key occurs more than once, each of its entities is changed.
+        Everything else is copied verbatim from the parsed contents,
+        including any comments, keys, and Fluent attributes.
+
+        The parsed entities are indexed on the first call,
+        after which the cost of each rewrite depends on the number of changes
+        rather than the size of the contents.
+        Raises KeyError if any key is not found,
+        and ValueError if an entity has no value, such as a Fluent message
+        with only attributes.
+        """
+        if not self.ctx:
+            if changes:
+                raise KeyError(next(iter(changes)))
+            return ""
+        ctx = self.ctx
+        if ctx._entities is None:
+            index: dict[Any, list[Entity]] = {}
+            for entity in self.walk(only_localizable=True):
+                if isinstance(entity, Entity):
+                    index.setdefault(entity.key, []).append(entity)
+            ctx._entities = index
+        else:
+            index = ctx._entities
+        splices: list[tuple[int, int, str]] = []
+        for key, raw_val in changes.items():
+            for entity in index[key]:
+                splices.append(entity._val_splice(raw_val))
+        splices.sort()
+        contents = ctx.contents
+        chunks: list[str] = []
+        offset = 0
+        for start, end, text in splices:
+            chunks.append(contents[offset:start])
+            chunks.append(text)
+            offset = end
+        chunks.append(contents[offset:])
+        return "".join(chunks)
+
+    @classmethod
+    def countDuplicates(cls, keys: Iterable[str]) -> dict[str, int]:
+        """Count the keys that occur more than once, in order of first occurrence."""
+        return {key: cnt for key, cnt in Counter(keys).items() if cnt > 1}
+
     @classmethod
     def findDuplicates(cls, entities: Iterable[Entity]) -> Iterator[str]:
-        found = Counter(entity.key for entity in entities)
+        found = cls.countDuplicates(entity.key for entity in entities)
         for entity_id, cnt in found.items():
-            if cnt > 1:
-                yield f"{entity_id} occurs {cnt} times"
+            yield f"{entity_id} occurs {cnt} times"
+
+
+class UnescapeCache(dict[str, str]):
+    """A bounded memo of the unescaped values of escape sequences."""
+
+    max_size = 4096
+
+    def __init__(self, unescape: Callable[[str], str]) -> None:
+        super().__init__()
+        self.unescape = unescape
+
+    def __missing__(self, key: str) -> str:
+        val = self.unescape(key)
+        if len(self) < self.max_size:
+            self[key] = val
+        return val
+
+
+def unescape_joined(
+    raw_vals: list[str], unescape: Callable[[str], str], sep: str, escape: str = ""
+) -> list[str] | None:
+    """Unescape all of `raw_vals` with a single call, by joining them with `sep`.
+
+    `sep` must be a single character that is not modified by `unescape`,
+    and does not change how the values next to it are unescaped.
+    Returns None if `sep` is found in any of the values,
+    if it follows the `escape` character,
+    or if the unescaped values can't be split back apart.
+    """
+    if not raw_vals:
+        return []
+    joined = sep.join(raw_vals)
+    if joined.count(sep) != len(raw_vals) - 1 or (escape and escape + sep in joined):
+        return None
+    vals = unescape(joined).split(sep)
+    return vals if len(vals) == len(raw_vals) else None
+
+
+def unescape_entities(
+    entities: Iterable[Entity], mixin: type[Any], sep: str, escape: str = ""
+) -> list[str | None]:
+    """Get the values of `entities`, unescaping those with the `mixin` type
+    with a single `unescape_joined()` call and caching the results on them.
+
+    The `mixin` must provide an `unescape()` classmethod and `_val_cache`.
+    """
+    entities = list(entities)
+    pending = [
+        entity
+        for entity in entities
+        if isinstance(entity, mixin) and entity._val_cache is None
+    ]
+    raw_vals = [cast(str, entity.raw_val) for entity in pending]
+    vals = unescape_joined(raw_vals, mixin.unescape, sep, escape)
+    if vals is None:
+        return [entity.val for entity in entities]
+    for entity, val in zip(pending, vals):
+        entity._val_cache = val
+    if len(pending) == len(entities):
+        return cast(list[str | None], vals)
+    return [entity.val for entity in entities]
@@ -0,0 +1,161 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Compare localized files with their reference."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import repeat
+from os import cpu_count, walk
+from os.path import exists, join, relpath
+from typing import Any
+
+from . import hasParser, parse
+from .base import Entity, Junk, Parser
+
+
+@dataclass
+class Comparison:
+    """The results of comparing a localized file with its reference.
+
+    The word counts are those of the reference entities.
+    """
+
+    missing: list[Any] = field(default_factory=list)
+    """The keys of reference entities that are not localized, in reference order."""
+
+    obsolete: list[Any] = field(default_factory=list)
+    """The keys of localized entities that are not in the reference."""
+
+    changed: int = 0
+    unchanged: int = 0
+    junk: int = 0
+    missing_words: int = 0
+    changed_words: int = 0
+    unchanged_words: int = 0
+
+
+class ReferenceIndex:
+    """The keys of the entities in a reference file,
+    with the digests and word counts of their values.
+    """
+
+    def __init__(self, parser: Parser) -> None:
+        self.entities: dict[Any, tuple[bytes, int]] = {}
+        for entity in parser:
+            if isinstance(entity, Entity) and entity.key not in self.entities:
+                self.entities[entity.key] = (entity.digest(), entity.count_words())
+
+    def compare(self, parser: Parser | None) -> Comparison:
+        """Compare a localized file with the reference.
+
+        If `parser` is None, the localized file is missing.
+        Entities that are not `localized` are counted as missing,
+        and only the first entity with each key is compared.
+        """
+        result = Comparison()
+        ref_entities = self.entities
+        found: set[Any] = set()
+        for entity in parser if parser is not None else ():
+            if isinstance(entity, Junk):
+                result.junk += 1
+                continue
+            key = entity.key
+            if key in found or not entity.localized:
+                continue
+            found.add(key)
+            ref = ref_entities.get(key)
+            if ref is None:
+                result.obsolete.append(key)
+            elif entity.digest() == ref[0]:
+                result.unchanged += 1
+                result.unchanged_words += ref[1]
+            else:
+                result.changed += 1
+                result.changed_words += ref[1]
+        for key, (_, words) in ref_entities.items():
+            if key not in found:
+                result.missing.append(key)
+                result.missing_words += words
+        return result
+
+
+def compare_locales(
+    reference: str,
+    localizations: Mapping[str, str],
+    processes: int | None = None,
+) -> dict[str, dict[str, Comparison | Exception]]:
+    """Compare the files in each localization directory with the reference.
+
+    `localizations` maps each locale to its directory.
+    Only the files within the `reference` directory that have a Parser
+    are compared, and hidden directories such as `.git` are skipped.
+
+    Each reference file is parsed once, in a pool of `processes` worker processes,
+    or as many as there are CPUs if it's None.
+    If `processes` is 1, the files are parsed in the current process.
+
+    Returns a dict mapping each locale to a dict of its results,
+    with the path of each file relative to its directory as the key,
+    and the Comparison or the Exception raised while parsing the file as the value.
+    """
+    paths = find_files(reference)
+    locales = list(localizations.items())
+    workers = processes or cpu_count() or 1
+    if workers == 1 or len(paths) < 2:
+        results = [compare_file(path, reference, locales) for path in paths]
+    else:
+        chunksize = max(1, len(paths) // (4 * workers))
+        with ProcessPoolExecutor(workers) as ex:
+            results = list(
+                ex.map(
+                    compare_file,
+                    paths,
+                    repeat(reference),
+                    repeat(locales),
+                    chunksize=chunksize,
+                )
+            )
+    comparisons: dict[str, dict[str, Comparison | Exception]] = {
+        locale: {} for locale, _ in locales
+    }
+    for path, file_results in zip(paths, results):
+        for (locale, _), result in zip(locales, file_results):
+            comparisons[locale][path] = result
+    return comparisons
+
+
+def find_files(root: str) -> list[str]:
+    """
+    The paths of all files within `root` that have a Parser,
+    relative to `root` and in sorted order.
+    """
+    paths: list[str] = []
+    for dirpath, dirnames, filenames in walk(root):
+        dirnames[:] = sorted(name for name in dirnames if not name.startswith("."))
+        for name in sorted(filenames):
+            if hasParser(name):
+                paths.append(relpath(join(dirpath, name), root))
+    return paths
+
+
+def compare_file(
+    path: str, reference: str, locales: list[tuple[str, str]]
+) -> list[Comparison | Exception]:
+    try:
+        index = ReferenceIndex(parse(join(reference, path)))
+    except Exception as error:
+        return [error] * len(locales)
+    results: list[Comparison | Exception] = []
+    for _, root in locales:
+        l10n_path = join(root, path)
+        try:
+            parser = parse(l10n_path) if exists(l10n_path) else None
+            results.append(index.compare(parser))
+        except Exception as error:
+            results.append(error)
+    return results
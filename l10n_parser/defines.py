@@ -5,8 +5,10 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Iterator
+from typing import Any
 
-from .base import CAN_COPY, Entity, Entry, Junk, OffsetComment, Parser, Whitespace
+from .base import CAN_COPY, Entry, Junk, OffsetComment, Parser, Whitespace
 
 
 class DefinesInstruction(Entry):
@@ -54,53 +56,115 @@ class DefinesParser(Parser):
         self.rePI = re.compile(r"#(?P<val>\w+[ \t]+[^\n]+)", re.M)
         Parser.__init__(self)
 
-    def getNext(
+    def _tokenize(
         self, ctx: DefinesParser.Context, offset: int  # type:ignore[override]
-    ) -> DefinesInstruction | Entity | Whitespace | DefinesParser.Comment | Junk:
-        junk_offset = offset
+    ) -> Iterator[Any]:
         contents = ctx.contents
-
-        m = self.reComment.match(ctx.contents, offset)
-        if m:
-            current_comment = self.Comment(ctx, m.span())
-            offset = m.end()
-        else:
-            current_comment = None
-
-        m = self.reWhitespace.match(contents, offset)
-        if m:
-            # blank lines outside of filter_empty_lines or
-            # leading whitespace are bad
-            if offset == 0 or not (len(m.group()) == 1 or ctx.filter_empty_lines):
-                if current_comment:
-                    return current_comment
-                return Junk(ctx, m.span())
-            white_space = Whitespace(ctx, m.span())
+        contents_len = len(contents)
+        match_comment = self.reComment.match
+        match_whitespace = self.reWhitespace.match
+        # White-space found after a standalone comment, see Parser._tokenize
+        next_ws_at = -1
+        next_ws: re.Match[str] | None = None
+        while True:
+            junk_offset = offset
+            entity: Any = None
+
+            m = match_comment(contents, offset)
+            if m:
+                current_comment = self.Comment(ctx, m.span())
+                offset = m.end()
+            else:
+                current_comment = None
+
+            ws = next_ws if offset == next_ws_at else match_whitespace(contents, offset)
+            if ws:
+                # blank lines outside of filter_empty_lines or
+                # leading whitespace are bad
+                if offset == 0 or not (len(ws.group()) == 1 or ctx.filter_empty_lines):
+                    if current_comment:
+                        entity = current_comment
+                        next_ws_at = offset
+                        next_ws = ws
+                    else:
+                        entity = Junk(ctx, ws.span())
+                else:
+                    white_space = Whitespace(ctx, ws.span())
+                    if current_comment is None:
+                        entity = white_space
+                    elif white_space.raw_val.count("\n") > 1:
+                        # standalone comment
+                        # the whitespace is the next fragment
+                        entity = current_comment
+                        next_ws_at = offset
+                        next_ws = ws
+                    offset = ws.end()
+            else:
+                white_space = None
+
+            if entity is None:
+                m = self.reKey.match(contents, offset)
+                if m:
+                    entity = self.createEntity(ctx, m, current_comment, white_space)
+                elif current_comment:
+                    # defines instructions don't have comments
+                    # Any pending commment is standalone
+                    entity = current_comment
+                    next_ws_at = current_comment.span[1]
+                    next_ws = ws
+                else:
+                    m = self.rePI.match(contents, offset)
+                    if m:
+                        entity = DefinesInstruction(ctx, m.span(), m.span("val"))
+                        if entity.val == "filter emptyLines":
+                            ctx.filter_empty_lines = True
+                        if entity.val == "unfilter emptyLines":
+                            ctx.filter_empty_lines = False
+                    else:
+                        entity = self.getJunk(
+                            ctx, junk_offset, self.reComment, self.reKey, self.rePI
+                        )
+
+            yield entity
+            offset = entity.span[1]
+            if offset >= contents_len:
+                return
+
+    def _scanKeys(
+        self, ctx: DefinesParser.Context  # type:ignore[override]
+    ) -> list[str] | None:
+        contents = ctx.contents
+        contents_len = len(contents)
+        match_comment = self.reComment.match
+        match_whitespace = self.reWhitespace.match
+        match_key = self.reKey.match
+        match_pi = self.rePI.match
+        filter_empty_lines = ctx.filter_empty_lines
+        keys: list[str] = []
+        offset = 0
+        while offset < contents_len:
+            m = match_comment(contents, offset)
+            if m:
+                offset = m.end()
+                continue
+            m = match_whitespace(contents, offset)
+            if m:
+                if offset == 0 or not (len(m.group()) == 1 or filter_empty_lines):
+                    # Junk
+                    return None
+                offset = m.end()
+                continue
+            m = match_key(contents, offset)
+            if m:
+                keys.append(m.group("key"))
+            else:
+                m = match_pi(contents, offset)
+                if m is None:
+                    return None
+                if m.group("val") == "filter emptyLines":
+                    filter_empty_lines = True
+                if m.group("val") == "unfilter emptyLines":
+                    filter_empty_lines = False
             offset = m.end()
-            if current_comment is not None and white_space.raw_val.count("\n") > 1:
-                # standalone comment
-                # return the comment, and reparse the whitespace next time
-                return current_comment
-            if current_comment is None:
-                return white_space
-        else:
-            white_space = None
-
-        m = self.reKey.match(contents, offset)
-        if m:
-            return self.createEntity(ctx, m, current_comment, white_space)
-        # defines instructions don't have comments
-        # Any pending commment is standalone
-        if current_comment:
-            return current_comment
-        if white_space:
-            return white_space
-        m = self.rePI.match(contents, offset)
-        if m:
-            instr = DefinesInstruction(ctx, m.span(), m.span("val"))
-            if instr.val == "filter emptyLines":
-                ctx.filter_empty_lines = True
-            if instr.val == "unfilter emptyLines":
-                ctx.filter_empty_lines = False
-            return instr
-        return self.getJunk(ctx, junk_offset, self.reComment, self.reKey, self.rePI)
+        ctx.filter_empty_lines = filter_empty_lines
+        return keys
@@ -5,13 +5,26 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Iterable, Iterator
 from html import unescape as html_unescape
+from typing import Any
 
 from .base import Comment as Comment_
-from .base import Entity, Junk, Parser, Whitespace
+from .base import (
+    Entity,
+    Entry,
+    Junk,
+    LazyPattern,
+    Parser,
+    UnescapeCache,
+    Whitespace,
+    unescape_entities,
+)
 
 
 class DTDEntityMixin:
+    _val_cache: str | None = None
+
     @property
     def val(self) -> str:
         """Unescape HTML entities into corresponding Unicode characters.
@@ -24,7 +37,23 @@ class DTDEntityMixin:
 
             https://github.com/python/cpython/blob/3.7/Lib/html/entities.py
         """
-        return html_unescape(self.raw_val)  # type: ignore
+        if self._val_cache is None:
+            raw_val: str = self.raw_val  # type: ignore
+            self._val_cache = self.unescape(raw_val)
+        return self._val_cache
+
+    # The character references recognized by html.unescape()
+    charref = re.compile(r"&(#[0-9]+;?|#[xX][0-9a-fA-F]+;?|[^\t\n\f <&#;]{1,32};?)")
+
+    @classmethod
+    def unescape(cls, raw_val: str) -> str:
+        if "&" not in raw_val:
+            return raw_val
+        return cls.charref.sub(cls._unescape_match, raw_val)
+
+    @staticmethod
+    def _unescape_match(m: re.Match[str]) -> str:
+        return _unescapes[m[0]]
 
     def value_position(self, offset: tuple[int, int] | int = 0) -> tuple[int, int]:
         # DTDChecker already returns tuples of (line, col) positions
@@ -41,6 +70,9 @@ class DTDEntityMixin:
             return super().value_position(offset)  # type: ignore
 
 
+_unescapes = UnescapeCache(html_unescape)
+
+
 class DTDEntity(DTDEntityMixin, Entity):
     pass
 
@@ -65,15 +97,15 @@ class DTDParser(Parser):
     #     [#x0300-#x036F] | [#x203F-#x2040]
     NameChar = NameStartChar + r"\-\.0-9" + "\xB7\u0300-\u036F\u203F-\u2040"
     Name = "[" + NameStartChar + "][" + NameChar + "]*"
-    reKey = re.compile(
+    reKey = LazyPattern(
         "<!ENTITY[ \t\r\n]+(?P<key>" + Name + ")[ \t\r\n]+"
         "(?P<val>\"[^\"]*\"|'[^']*'?)[ \t\r\n]*>",
         re.DOTALL | re.M,
     )
     # add BOM to DTDs, details in bug 435002
     reHeader = re.compile("^\ufeff")
-    reComment = re.compile("<!--(?P<val>-?[%s])*?-->" % CharMinusDash, re.S)
-    rePE = re.compile(
+    reComment = LazyPattern("<!--(?P<val>-?[%s])*?-->" % CharMinusDash, re.S)
+    rePE = LazyPattern(
         "<!ENTITY[ \t\r\n]+%[ \t\r\n]+(?P<key>" + Name + ")"
         "[ \t\r\n]+SYSTEM[ \t\r\n]+"
         "(?P<val>\"[^\"]*\"|'[^']*')[ \t\r\n]*>[ \t\r\n]*"
@@ -89,26 +121,34 @@ class DTDParser(Parser):
                 self._val_cache = self.all[4:-3]
             return self._val_cache
 
-    def getNext(
-        self, ctx: Parser.Context, offset: int
-    ) -> Whitespace | DTDParser.Comment | Junk | DTDEntity:
+    def _tokenize(self, ctx: Parser.Context, offset: int) -> Iterator[Any]:
+        if offset == 0 and self.reHeader.match(ctx.contents):
+            offset += 1
+        return super()._tokenize(ctx, offset)
+
+    def _scanSkip(self, contents: str, offset: int) -> int | None:
+        if offset == 0 and self.reHeader.match(contents):
+            # A lone BOM is followed by empty Junk
+            return 1 if len(contents) > 1 else None
+        return offset
+
+    def unescapeValues(self, entities: Iterable[Entity]) -> list[str | None]:
+        # No character reference name includes a NUL,
+        # so the separator is never replaced along with one.
+        return unescape_entities(entities, DTDEntityMixin, "\x00")
+
+    def _recover(self, ctx: Parser.Context, offset: int) -> Entry | Junk:
         """
-        Overload Parser.getNext to special-case ParsedEntities.
+        Overload Parser._recover to special-case ParsedEntities.
         Just check for a parsed entity if that method claims junk.
 
         <!ENTITY % foo SYSTEM "url">
         %foo;
         """
-        if offset == 0 and self.reHeader.match(ctx.contents):
-            offset += 1
-        entity = Parser.getNext(self, ctx, offset)
-        if (entity and isinstance(entity, Junk)) or entity is None:
-            m = self.rePE.match(ctx.contents, offset)
-            if m:
-                entity = DTDEntity(
-                    ctx, None, None, m.span(), m.span("key"), m.span("val")
-                )
-        return entity  # type: ignore
+        m = self.rePE.match(ctx.contents, offset)
+        if m:
+            return DTDEntity(ctx, None, None, m.span(), m.span("key"), m.span("val"))
+        return super()._recover(ctx, offset)
 
     def createEntity(
         self,
@@ -5,7 +5,9 @@
 from __future__ import annotations
 
 import re
-from collections.abc import Iterator
+from bisect import bisect_right
+from collections.abc import Iterator, Sequence
+from hashlib import blake2b
 from typing import cast
 
 from fluent.syntax import FluentParser as FTLParser
@@ -118,6 +120,11 @@ class FluentEntity(Entity):
     ) -> bool:
         return self.entry.equals(other.entry, ignored_fields=self.ignored_fields)
 
+    def digest(self) -> bytes:
+        # The value and attributes, without the comment
+        source = self.ctx.contents[self.key_span[1] : self.span[1]]
+        return blake2b(source.encode(), digest_size=8).digest()
+
     # In Fluent we treat entries as a whole.  FluentChecker reports errors at
     # offsets calculated from the beginning of the entry.
     def value_position(self, offset: int | None = None) -> tuple[int, int]:
@@ -179,13 +186,131 @@ class FluentComment(Comment):
         self._val_cache = entry.content
 
 
+def _shift_spans(node: ftl.BaseNode, delta: int) -> None:
+    stack = [node]
+    while stack:
+        for value in vars(stack.pop()).values():
+            if isinstance(value, ftl.Span):
+                value.start += delta
+                value.end += delta
+            elif isinstance(value, ftl.BaseNode):
+                stack.append(value)
+            elif isinstance(value, list):
+                stack.extend(item for item in value if isinstance(item, ftl.BaseNode))
+
+
+class _EntryStarts(Sequence[int]):
+    "The current start offsets of resource entries, for bisection."
+
+    def __init__(self, body: list[ftl.EntryType], shifts: list[int]) -> None:
+        self.body = body
+        self.shifts = shifts
+
+    def __len__(self) -> int:
+        return len(self.body)
+
+    def __getitem__(self, index: int) -> int:  # type:ignore[override]
+        return cast(ftl.Span, self.body[index].span).start + self.shifts[index]
+
+
 class FluentParser(Parser):
     capabilities = CAN_SKIP
 
+    class Context(Parser.Context):
+        def __init__(self, contents: str) -> None:
+            super().__init__(contents)
+            # the parsed resource, and the offsets by which the spans
+            # of each of its entries are yet to be shifted after edits
+            self.resource: ftl.Resource | None = None
+            self.shifts: list[int] = []
+
     def __init__(self) -> None:
         super().__init__()
         self.ftl_parser = FTLParser()
 
+    def getResource(self) -> ftl.Resource:
+        """The Fluent AST of the contents, as also used by `walk()`.
+
+        The resource is parsed on the first call, and then kept up to date
+        by `edit()`. It may be passed on to `moz_l10n.fluent_parse()`.
+        """
+        resource, shifts = self._resource()
+        if any(shifts):
+            for index, entry in enumerate(resource.body):
+                if shifts[index]:
+                    _shift_spans(entry, shifts[index])
+                    shifts[index] = 0
+        return resource
+
+    def _resource(self) -> tuple[ftl.Resource, list[int]]:
+        if not self.ctx:
+            self.readUnicode("")
+        ctx = cast(FluentParser.Context, self.ctx)
+        if ctx.resource is None:
+            ctx.resource = self.ftl_parser.parse(ctx.contents)
+            ctx.shifts = [0] * len(ctx.resource.body)
+        return ctx.resource, ctx.shifts
+
+    def edit(self, start: int, end: int, text: str) -> None:
+        """Replace the contents from `start` to `end` with `text`.
+
+        Only the entries around the edited range are parsed again,
+        and the rest of the resource is reused,
+        so the cost of an edit depends on the size of the entries it touches
+        rather than that of the whole file.
+        The spans of the following entries are shifted when next needed.
+
+        Entities from earlier walks refer to the contents before the edit.
+        """
+        resource, shifts = self._resource()
+        contents = cast(FluentParser.Context, self.ctx).contents
+        if not 0 <= start <= end <= len(contents):
+            raise ValueError(f"Invalid edit range {start}:{end}")
+        contents = contents[:start] + text + contents[end:]
+        delta = len(text) - (end - start)
+        body = resource.body
+        starts = _EntryStarts(body, shifts)
+
+        # Also parse the entries just before and after the edit,
+        # as it may change where they start or end.
+        first = max(bisect_right(starts, start) - 2, 0)
+        last = min(bisect_right(starts, end) + 2, len(body))
+        # Junk annotations may refer to what follows.
+        while last < len(body) and isinstance(body[last - 1], ftl.Junk):
+            last += 1
+        region_start = starts[first] if first > 0 else 0
+        region_end = starts[last] + delta if last < len(body) else len(contents)
+        entries = self.ftl_parser.parse(contents[region_start:region_end]).body
+        if region_start:
+            for entry in entries:
+                _shift_spans(entry, region_start)
+
+        # The entries next to the edit are expected to start where they did.
+        # If they don't, the edit may have changed the rest of the file as well.
+        if entries:
+            first_start = cast(ftl.Span, entries[0].span).start
+            last_start = cast(ftl.Span, entries[-1].span).start
+        else:
+            first_start = last_start = -1
+        if (first > 0 and first_start != region_start) or (
+            last < len(body) and last_start != starts[last - 1] + delta
+        ):
+            resource = self.ftl_parser.parse(contents)
+            shifts = [0] * len(resource.body)
+        else:
+            body[first:last] = entries
+            shifts[first:last] = [0] * len(entries)
+            if delta:
+                tail = first + len(entries)
+                shifts[tail:] = [shift + delta for shift in shifts[tail:]]
+            if resource.span is not None:
+                resource.span.end += delta
+
+        self.readUnicode(contents)
+        ctx = cast(FluentParser.Context, self.ctx)
+        ctx.resource = resource
+        ctx.shifts = shifts
+
     def walk(  # type:ignore[override]
         self, only_localizable: bool = False
     ) -> Iterator[FluentTerm | FluentMessage | Whitespace | Junk | FluentComment]:
@@ -193,7 +318,7 @@ class FluentParser(Parser):
             # loading file failed, or we just didn't load anything
             return
 
-        resource = self.ftl_parser.parse(self.ctx.contents)
+        resource = self.getResource()
 
         last_span_end = 0
 
@@ -5,8 +5,10 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Iterator
+from typing import Any
 
-from .base import Entity, Entry, Junk, OffsetComment, Parser, Whitespace
+from .base import Entry, Junk, OffsetComment, Parser
 
 
 class IniSection(Entry):
@@ -42,20 +44,40 @@ class IniParser(Parser):
         self.reKey = re.compile("(?P<key>.+?)=(?P<val>.*)", re.M)
         Parser.__init__(self)
 
-    def getNext(
-        self, ctx: Parser.Context, offset: int
-    ) -> Junk | OffsetComment | IniSection | Entity | Whitespace:
+    def _tokenize(self, ctx: Parser.Context, offset: int) -> Iterator[Any]:
         contents = ctx.contents
-        m = self.reSection.match(contents, offset)
-        if m:
-            return IniSection(ctx, m.span(), m.span("val"))
+        contents_len = len(contents)
+        match_section = self.reSection.match
+        while True:
+            m = match_section(contents, offset)
+            if m:
+                yield IniSection(ctx, m.span(), m.span("val"))
+                offset = m.end()
+                if offset >= contents_len:
+                    return
+                continue
+            for entity in super()._tokenize(ctx, offset):
+                yield entity
+                offset = entity.span[1]
+                if offset < contents_len and match_section(contents, offset):
+                    # Continue parsing after the section
+                    break
+            else:
+                return
 
-        return super().getNext(ctx, offset)  # type: ignore
+    def _scanSkip(self, contents: str, offset: int) -> int | None:
+        m = self.reSection.match(contents, offset)
+        if m is None:
+            return offset
+        if self.reKey.match(contents, offset):
+            # After a comment, this would be parsed as an entity
+            return None
+        return m.end()
 
     def getJunk(
         self, ctx: Parser.Context, offset: int, *expressions: re.Pattern[str]
     ) -> Junk:
-        # base.Parser.getNext calls us with self.reKey, self.reComment.
+        # base.Parser._recover calls us with self.reKey, self.reComment.
         # Add self.reSection to the end-of-junk expressions
         expressions = expressions + (self.reSection,)
         return super().getJunk(ctx, offset, *expressions)
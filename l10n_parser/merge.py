@@ -0,0 +1,129 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Merge a localized file with its reference.
+
+The strategy is defined by the capabilities of their Parser.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Container, Iterable, Iterator
+from typing import Any
+
+from .base import (
+    CAN_COPY,
+    CAN_MERGE,
+    CAN_SKIP,
+    Entity,
+    Entry,
+    Junk,
+    Parser,
+    PlaceholderEntity,
+    StickyEntry,
+    Whitespace,
+)
+
+
+def merge_entries(
+    parser: Parser,
+    reference: Iterable[Entry | Junk],
+    localization: Iterable[Entry | Junk],
+    skips: Container[Any] = (),
+) -> Iterator[str]:
+    """Stream the contents of `localization` merged with `reference`.
+
+    Both are sequences of entries as returned by `Parser.walk()`,
+    and `parser.capabilities` defines how they're merged:
+
+    - With CAN_COPY, the localization is copied if it has no junk
+      and no missing or skipped entities. Otherwise, the reference is copied.
+    - With CAN_SKIP, junk and entities with keys in `skips` are dropped
+      from the localization, as are any PlaceholderEntity entries.
+      Sticky entries are always taken from the reference.
+      If that leaves two white-space entries next to each other,
+      the one with more line breaks is kept.
+    - With CAN_MERGE, entities that are missing or were dropped
+      are added from the reference at the end, with their comments.
+    - Otherwise, the localization is copied as-is.
+    """
+    capabilities = parser.capabilities
+    if capabilities & CAN_COPY:
+        yield from _copy(reference, localization, skips)
+        return
+    if not capabilities & CAN_SKIP:
+        for entry in localization:
+            yield entry.all
+        return
+
+    ref_entities: dict[Any, Entity] = {}
+    ref_sticky: dict[Any, StickyEntry] = {}
+    for entry in reference:
+        if isinstance(entry, StickyEntry):
+            ref_sticky.setdefault(entry.key, entry)
+        elif isinstance(entry, Entity) and not isinstance(entry, PlaceholderEntity):
+            ref_entities.setdefault(entry.key, entry)
+
+    found: set[Any] = set()
+    # White-space is held back, so that if dropping an entry
+    # leaves two of them next to each other, only one is kept.
+    white_space: Whitespace | None = None
+    line_breaks = 0
+    for entry in localization:
+        if isinstance(entry, (Junk, PlaceholderEntity)):
+            continue
+        if isinstance(entry, Whitespace):
+            count = entry.all.count("\n")
+            if white_space is None or count >= line_breaks:
+                white_space = entry
+                line_breaks = count
+            continue
+        if isinstance(entry, StickyEntry):
+            entry = ref_sticky.get(entry.key, entry)
+        elif isinstance(entry, Entity):
+            if entry.key in skips:
+                continue
+            found.add(entry.key)
+        if white_space is not None:
+            yield white_space.all
+            white_space = None
+        yield entry.all
+    if white_space is not None:
+        yield white_space.all
+
+    if capabilities & CAN_MERGE:
+        add_newline = True
+        for key, entity in ref_entities.items():
+            if key not in found:
+                if add_newline:
+                    yield "\n"
+                    add_newline = False
+                content = entity.all
+                yield content if content.endswith("\n") else content + "\n"
+
+
+def _copy(
+    reference: Iterable[Entry | Junk],
+    localization: Iterable[Entry | Junk],
+    skips: Container[Any],
+) -> Iterator[str]:
+    ref_entries = list(reference)
+    l10n_entries = list(localization)
+    l10n_keys: set[Any] = set()
+    for entry in l10n_entries:
+        if isinstance(entry, (Junk, PlaceholderEntity)):
+            break
+        if isinstance(entry, Entity):
+            if entry.key in skips:
+                break
+            l10n_keys.add(entry.key)
+    else:
+        if all(
+            entry.key in l10n_keys for entry in ref_entries if isinstance(entry, Entity)
+        ):
+            for entry in l10n_entries:
+                yield entry.all
+            return
+    for entry in ref_entries:
+        yield entry.all
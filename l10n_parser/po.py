@@ -9,6 +9,7 @@ Parses gettext po and pot files.
 from __future__ import annotations
 
 import re
+from typing import Any
 
 from .base import CAN_SKIP, BadEntity, Comment, Entity, Parser
 
@@ -61,6 +62,8 @@ class PoParser(Parser):
     # escaped quotes etc, not quote, newline, backslash
     # `"`
     reListItem = re.compile(r'[ \t\r\n]*"((?:\\[\\trn"]|[^"\n\\])*)"')
+    # a whole string list
+    reList = re.compile(r'(?:[ \t\r\n]*"(?:\\[\\trn"]|[^"\n\\])*")+')
 
     def __init__(self) -> None:
         super().__init__()
@@ -103,19 +106,49 @@ class PoParser(Parser):
         e.stringlist_val = msgstr
         return e
 
+    def _scanKeys(self, ctx: Parser.Context) -> list[str] | None:
+        contents = ctx.contents
+        contents_len = len(contents)
+        match_comment = self.reComment.match
+        match_whitespace = self.reWhitespace.match
+        match_key = self.reKey.match
+        keys: list[Any] = []
+        offset = 0
+        while offset < contents_len:
+            m = match_comment(contents, offset) or match_whitespace(contents, offset)
+            if m:
+                offset = m.end()
+                continue
+            if not match_key(contents, offset):
+                return None
+            msgctxt = None
+            try:
+                if contents.startswith("msgctxt", offset):
+                    msgctxt, offset = self._parse_string_list(ctx, offset, "msgctxt")
+                    m = self.reWhitespace.match(contents, offset)
+                    if m:
+                        offset = m.end()
+                msgid, offset = self._parse_string_list(ctx, offset, "msgid")
+                m = self.reWhitespace.match(contents, offset)
+                if m:
+                    offset = m.end()
+                # The value is not evaluated
+                _, offset = self._parse_string_list(ctx, offset, "msgstr", False)
+            except BadEntity:
+                return None
+            keys.append((msgid, msgctxt))
+        return keys
+
     def _parse_string_list(
-        self, ctx: Parser.Context, cursor: int, key: str
+        self, ctx: Parser.Context, cursor: int, key: str, evaluate: bool = True
     ) -> tuple[str, int]:
         if not ctx.contents.startswith(key, cursor):
             raise BadEntity
         cursor += len(key)
-        frags = []
-        while True:
-            m = self.reListItem.match(ctx.contents, cursor)
-            if not m:
-                break
-            frags.append(m.group(1))
-            cursor = m.end()
-        if not frags:
+        m = self.reList.match(ctx.contents, cursor)
+        if not m:
             raise BadEntity
-        return eval_stringlist(frags), cursor
+        if not evaluate:
+            return "", m.end()
+        frags = self.reListItem.findall(ctx.contents, cursor, m.end())
+        return eval_stringlist(frags), m.end()
@@ -5,8 +5,17 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Iterable, Iterator
+from typing import Any
 
-from .base import Entity, Junk, OffsetComment, Parser, Whitespace
+from .base import (
+    Entity,
+    OffsetComment,
+    Parser,
+    UnescapeCache,
+    Whitespace,
+    unescape_entities,
+)
 
 
 class PropertiesEntityMixin:
@@ -15,17 +24,35 @@ class PropertiesEntityMixin:
     )
     known_escapes = {"n": "\n", "r": "\r", "t": "\t", "\\": "\\"}
 
+    _val_cache: str | None = None
+
     @property
     def val(self) -> str:
-        def unescape(m: re.Match[str]) -> str:
-            found = m.groupdict()
-            if found["uni"]:
-                return chr(int(found["uni"][1:], 16))
-            if found["nl"]:
-                return ""
-            return self.known_escapes.get(found["single"], found["single"])
+        if self._val_cache is None:
+            self._val_cache = self.unescape(self.raw_val)  # type: ignore
+        return self._val_cache
+
+    @classmethod
+    def unescape(cls, raw_val: str) -> str:
+        if "\\" not in raw_val:
+            return raw_val
+        return cls.escape.sub(cls._unescape_match, raw_val)
+
+    @staticmethod
+    def _unescape_match(m: re.Match[str]) -> str:
+        return _unescapes[m[1]]
+
 
-        return self.escape.sub(unescape, self.raw_val)  # type: ignore
+def _unescape_sequence(seq: str) -> str:
+    """Unescape the part of an escape sequence after its backslash."""
+    if seq[0] == "u" and len(seq) > 1:
+        return chr(int(seq[1:], 16))
+    if seq[0] == "\n":
+        return ""
+    return PropertiesEntityMixin.known_escapes.get(seq, seq)
+
+
+_unescapes = UnescapeCache(_unescape_sequence)
 
 
 class PropertiesEntity(PropertiesEntityMixin, Entity):
@@ -42,72 +69,97 @@ class PropertiesParser(Parser):
         self._trailingWS = re.compile(r"[ \t\r\n]*(?:\n|\Z)", re.M)
         Parser.__init__(self)
 
-    def getNext(
-        self, ctx: Parser.Context, offset: int
-    ) -> Whitespace | OffsetComment | Junk | PropertiesEntity:
-        junk_offset = offset
+    def _tokenize(self, ctx: Parser.Context, offset: int) -> Iterator[Any]:
         # overwritten to parse values line by line
         contents = ctx.contents
-
-        m = self.reComment.match(contents, offset)
-        if m:
-            current_comment = self.Comment(ctx, m.span())
-            if offset == 0 and "License" in current_comment.val:
-                # Heuristic. A early comment with "License" is probably
-                # a license header, and should be standalone.
-                return current_comment
-            offset = m.end()
-        else:
-            current_comment = None
-
-        m = self.reWhitespace.match(contents, offset)
-        if m:
-            white_space = Whitespace(ctx, m.span())
-            offset = m.end()
-            if current_comment is not None and white_space.raw_val.count("\n") > 1:
-                # standalone comment
-                return current_comment
-            if current_comment is None:
-                return white_space
-        else:
-            white_space = None
-
-        m = self.reKey.match(contents, offset)
-        if m:
-            startline = offset = m.end()
-            while True:
-                endval = nextline = contents.find("\n", offset)
-                if nextline == -1:
-                    endval = offset = len(contents)
-                    break
-                # is newline escaped?
-                _e = self._escapedEnd.search(contents, offset, nextline)
-                offset = nextline + 1
-                if _e is None:
-                    break
-                # backslashes at end of line, if 2*n, not escaped
-                if len(_e.group()) % 2 == 0:
-                    break
-                startline = offset
-
-            # strip trailing whitespace
-            ws = self._trailingWS.search(contents, startline)
-            if ws:
-                endval = ws.start()
-
-            entity = PropertiesEntity(
-                ctx,
-                current_comment,
-                white_space,
-                (m.start(), endval),  # full span
-                m.span("key"),
-                (m.end(), endval),
-            )  # value span
-            return entity
-
-        if current_comment is not None:
-            return current_comment
-        if white_space is not None:
-            return white_space
-
-        return self.getJunk(ctx, junk_offset, self.reKey, self.reComment)
+        contents_len = len(contents)
+        match_comment = self.reComment.match
+        match_whitespace = self.reWhitespace.match
+        match_key = self.reKey.match
+        # White-space found after a standalone comment, see Parser._tokenize
+        next_ws_at = -1
+        next_ws: Whitespace | None = None
+        no_key_at = -1
+        while True:
+            junk_offset = offset
+            entity: Any = None
+
+            m = match_comment(contents, offset)
+            if m:
+                current_comment = self.Comment(ctx, m.span())
+                if offset == 0 and "License" in current_comment.val:
+                    # Heuristic. A early comment with "License" is probably
+                    # a license header, and should be standalone.
+                    entity = current_comment
+                offset = m.end()
+            else:
+                current_comment = None
+
+            if entity is None:
+                if offset == next_ws_at:
+                    white_space = next_ws
+                else:
+                    m = match_whitespace(contents, offset)
+                    white_space = Whitespace(ctx, m.span()) if m else None
+                if white_space is not None:
+                    if current_comment is None:
+                        entity = white_space
+                    elif white_space.raw_val.count("\n") > 1:
+                        # standalone comment
+                        entity = current_comment
+                        next_ws_at = offset
+                        next_ws = white_space
+                    offset = white_space.span[1]
+
+            if entity is None:
+                m = None if offset == no_key_at else match_key(contents, offset)
+                if m:
+                    endval = self._valueEnd(contents, m.end())
+                    entity = PropertiesEntity(
+                        ctx,
+                        current_comment,
+                        white_space,
+                        (m.start(), endval),  # full span
+                        m.span("key"),
+                        (m.end(), endval),
+                    )  # value span
+                elif current_comment is not None:
+                    entity = current_comment
+                    next_ws_at = current_comment.span[1]
+                    next_ws = white_space
+                    no_key_at = offset
+                else:
+                    entity = self.getJunk(ctx, junk_offset, self.reKey, self.reComment)
+
+            yield entity
+            offset = entity.span[1]
+            if offset >= contents_len:
+                return
+
+    def _valueEnd(self, contents: str, offset: int) -> int:
+        """The end of the value starting at offset,
+        which may be continued on following lines."""
+        startline = offset
+        while True:
+            nextline = contents.find("\n", offset)
+            if nextline == -1:
+                break
+            # is newline escaped?
+            _e = self._escapedEnd.search(contents, offset, nextline)
+            offset = nextline + 1
+            if _e is None:
+                break
+            # backslashes at end of line, if 2*n, not escaped
+            if len(_e.group()) % 2 == 0:
+                break
+            startline = offset
+
+        # strip trailing whitespace
+        ws = self._trailingWS.search(contents, startline)
+        return ws.start() if ws else len(contents)
+
+    def _scanValueEnd(self, contents: str, m: re.Match[str]) -> int:
+        return self._valueEnd(contents, m.end())
+
+    def unescapeValues(self, entities: Iterable[Entity]) -> list[str | None]:
+        return unescape_entities(entities, PropertiesEntityMixin, "\x00", "\\")
@@ -1,11 +1,6 @@
-from .fluent import (
-    fluent_astify,
-    fluent_astify_message,
-    fluent_parse,
-    fluent_parse_message,
-    fluent_serialize,
-)
-from .ini import ini_parse, ini_serialize
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
 from .message import (
     CatchallKey,
     Declaration,
@@ -16,40 +11,123 @@ from .message import (
     Pattern,
     PatternMessage,
     SelectMessage,
+    SharedVariants,
     UnsupportedAnnotation,
     UnsupportedStatement,
     VariableRef,
 )
-from .properties import properties_parse, properties_serialize
-from .resource import Comment, Entry, Metadata, Resource, Section
-from .transform import add_entries
+from .resource import (
+    Comment,
+    Entry,
+    EntrySource,
+    IdTable,
+    LazyEntry,
+    Metadata,
+    Resource,
+    Section,
+    detach_entries,
+    get_meta,
+)
+
+if TYPE_CHECKING:
+    from .cache import ResourceCache
+    from .fluent import (
+        fluent_astify,
+        fluent_astify_message,
+        fluent_parse,
+        fluent_parse_message,
+        fluent_serialize,
+    )
+    from .ini import ini_parse, ini_serialize
+    from .load import (
+        count_duplicate_ids,
+        load_resources,
+        parse_resource,
+        scan_resource_ids,
+    )
+    from .properties import (
+        properties_iter_entries,
+        properties_parse,
+        properties_serialize,
+    )
+    from .snapshot import snapshot_dumps, snapshot_loads
+    from .transform.add_entries import add_entries, add_entries_bulk
 
 __all__ = [
     "CatchallKey",
     "Comment",
     "Declaration",
     "Entry",
+    "EntrySource",
     "Expression",
     "FunctionAnnotation",
+    "IdTable",
+    "LazyEntry",
     "Markup",
     "Message",
     "Metadata",
     "Pattern",
     "PatternMessage",
     "Resource",
+    "ResourceCache",
     "Section",
     "SelectMessage",
+    "SharedVariants",
     "UnsupportedAnnotation",
     "UnsupportedStatement",
     "VariableRef",
     "add_entries",
+    "add_entries_bulk",
+    "count_duplicate_ids",
+    "detach_entries",
     "fluent_astify",
     "fluent_astify_message",
     "fluent_parse",
     "fluent_parse_message",
     "fluent_serialize",
+    "get_meta",
     "ini_parse",
     "ini_serialize",
+    "load_resources",
+    "parse_resource",
+    "properties_iter_entries",
     "properties_parse",
     "properties_serialize",
+    "scan_resource_ids",
+    "snapshot_dumps",
+    "snapshot_loads",
 ]
+
+
+# The format backends are only imported when they're first used,
+# as their dependencies are slow to import.
+_modules = {
+    "ResourceCache": ".cache",
+    "add_entries": ".transform",
+    "add_entries_bulk": ".transform",
+    "count_duplicate_ids": ".load",
+    "fluent_astify": ".fluent",
+    "fluent_astify_message": ".fluent",
+    "fluent_parse": ".fluent",
+    "fluent_parse_message": ".fluent",
+    "fluent_serialize": ".fluent",
+    "ini_parse": ".ini",
+    "ini_serialize": ".ini",
+    "load_resources": ".load",
+    "parse_resource": ".load",
+    "properties_iter_entries": ".properties",
+    "properties_parse": ".properties",
+    "properties_serialize": ".properties",
+    "scan_resource_ids": ".load",
+    "snapshot_dumps": ".snapshot",
+    "snapshot_loads": ".snapshot",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _modules.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
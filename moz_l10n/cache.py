@@ -0,0 +1,257 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+from collections.abc import Iterator
+from functools import cache
+from hashlib import sha256
+from importlib.util import find_spec
+from os import DirEntry, makedirs, remove, replace, scandir, utime
+from os.path import dirname, join
+from pkgutil import iter_modules
+from tempfile import mkstemp
+from typing import Any
+
+import l10n_parser
+
+from . import resource as res
+from .load import parse_resource
+from .snapshot import snapshot_dumps, snapshot_loads
+
+CACHE_FORMAT = 2
+"""
+The version of the cache file format.
+Changing this invalidates all previously cached resources.
+"""
+
+
+PARSER_MODULES = (
+    "fluent.syntax.ast",
+    "fluent.syntax.parser",
+    "fluent.syntax.stream",
+    "moz_l10n.fluent.parse",
+    "moz_l10n.ini.parse",
+    "moz_l10n.load",
+    "moz_l10n.message",
+    "moz_l10n.properties.parse",
+    "moz_l10n.resource",
+    "moz_l10n.snapshot",
+)
+"""
+The modules that affect how resources are parsed and cached,
+along with all of the `l10n_parser` modules.
+"""
+
+
+@cache
+def parser_hash() -> str:
+    """
+    A hash of the code of the `PARSER_MODULES` and the `l10n_parser` modules,
+    computed once per process.
+    """
+    names = [*PARSER_MODULES, "l10n_parser"]
+    names.extend(
+        info.name
+        for info in iter_modules(l10n_parser.__path__, "l10n_parser.")
+        if not info.ispkg
+    )
+    hash = sha256()
+    for name in sorted(names):
+        hash.update(name.encode())
+        hash.update(b"\0")
+        spec = find_spec(name)
+        if spec is not None and spec.has_location and spec.origin:
+            with open(spec.origin, "rb") as file:
+                hash.update(file.read())
+    return hash.hexdigest()
+
+
+class ResourceCache:
+    """
+    An on-disk cache of parsed resources, stored in `directory`.
+
+    Resources are keyed by the hash of their source contents,
+    along with the parser selected for their path and the `parser_hash()`
+    of the code used to parse and store them,
+    so files that have not changed are not parsed again,
+    and any change to the parsers invalidates all previously cached resources.
+
+    When the total size of the cached files exceeds `max_size` bytes,
+    the least recently used ones are removed.
+
+    Multiple processes may share the same cache directory.
+    Cache files are written atomically, and a cache file that can't be read
+    is treated as missing.
+    Cached resources are stored as snapshots without any pickled values,
+    so a tampered cache file can't run code when it's loaded.
+    """
+
+    def __init__(self, directory: str, max_size: int = 256 * 2**20) -> None:
+        self.directory = directory
+        self.max_size = max_size
+        self._salt = f"{CACHE_FORMAT}\0{parser_hash()}\0".encode()
+        self._size: int | None = None
+
+    def __reduce__(self) -> tuple[type["ResourceCache"], tuple[str, int]]:
+        # Each process keeps track of the cache size separately.
+        return (ResourceCache, (self.directory, self.max_size))
+
+    def load(self, path: str, source: bytes | None = None) -> res.Resource[Any, None]:
+        """
+        Get the resource for the file at `path` from the cache,
+        or parse it with `parse_resource` and add it to the cache.
+
+        If `source` is not given, it is read from `path`.
+        """
+        if source is None:
+            with open(path, "rb") as file:
+                source = file.read()
+        key = self.key(path, source)
+        resource = self.get(key)
+        if resource is None:
+            resource = parse_resource(path, source)
+            self.set(key, resource)
+        return resource
+
+    def key(self, path: str, source: bytes) -> str:
+        """
+        The cache key for a file with the given `path` and `source` contents.
+        """
+        hash = sha256(self._salt)
+        hash.update(parser_name(path).encode())
+        hash.update(b"\0")
+        hash.update(source)
+        return hash.hexdigest()
+
+    def get(self, key: str) -> res.Resource[Any, None] | None:
+        """
+        Get a cached resource, or None if it's not in the cache.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                resource = snapshot_loads(file.read(), allow_pickle=False)
+            # Update the access time, used for LRU eviction.
+            utime(path)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            try:
+                remove(path)
+            except OSError:
+                pass
+            return None
+        return resource
+
+    def set(self, key: str, resource: res.Resource[Any, None]) -> None:
+        """
+        Add a resource to the cache.
+
+        Raises a TypeError if the resource has entry or metadata values
+        that are not strings, None, or `moz_l10n.message` messages,
+        as those could only be cached with pickle.
+        """
+        data = snapshot_dumps(resource, allow_pickle=False)
+        path = self._path(key)
+        dir = dirname(path)
+        makedirs(dir, exist_ok=True)
+        fd, tmp_path = mkstemp(dir=dir, suffix=".tmp")
+        try:
+            with open(fd, "wb") as file:
+                file.write(data)
+            replace(tmp_path, path)
+        except BaseException:
+            try:
+                remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        if self._size is None:
+            self._size = self.size()
+        else:
+            self._size += len(data)
+        if self._size > self.max_size:
+            self.evict()
+
+    def size(self) -> int:
+        """
+        The total size in bytes of all cached resources.
+        """
+        return sum(size for _, size, _ in self._stats())
+
+    def evict(self) -> None:
+        """
+        Remove least recently used resources from the cache,
+        until its size is at most 3/4 of `max_size`.
+        """
+        entries = sorted(self._stats())
+        size = sum(entry[1] for entry in entries)
+        limit = self.max_size * 3 // 4
+        for _, entry_size, path in entries:
+            if size <= limit:
+                break
+            try:
+                remove(path)
+            except OSError:
+                # Perhaps already removed by another process
+                pass
+            size -= entry_size
+        self._size = size
+
+    def clear(self) -> None:
+        """
+        Remove all cached resources.
+        """
+        for entry in self._entries():
+            try:
+                remove(entry.path)
+            except OSError:
+                pass
+        self._size = 0
+
+    def _path(self, key: str) -> str:
+        return join(self.directory, key[:2], key)
+
+    def _stats(self) -> Iterator[tuple[float, int, str]]:
+        """
+        The modification time, size, and path of each cached resource.
+        """
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                # Perhaps removed by another process
+                continue
+            yield stat.st_mtime, stat.st_size, entry.path
+
+    def _entries(self) -> list[DirEntry[str]]:
+        entries: list[DirEntry[str]] = []
+        try:
+            subdirs = [
+                entry.path for entry in scandir(self.directory) if entry.is_dir()
+            ]
+        except FileNotFoundError:
+            return []
+        for subdir in subdirs:
+            try:
+                entries.extend(
+                    entry
+                    for entry in scandir(subdir)
+                    if entry.is_file() and not entry.name.endswith(".tmp")
+                )
+            except FileNotFoundError:
+                pass
+        return entries
+
+
+def parser_name(path: str) -> str:
+    """
+    The name of the parser that `parse_resource` uses for `path`.
+    """
+    for ext in (".ftl", ".properties", ".ini"):
+        if path.endswith(ext):
+            return ext
+    try:
+        return type(l10n_parser.getParser(path)).__name__
+    except UserWarning:
+        return ""
@@ -17,6 +17,7 @@ from .. import resource as res
 def fluent_parse(
     source: bytes | str | ftl.Resource,
     parse_message: None = None,
+    id_table: res.IdTable | None = None,
 ) -> res.Resource[ftl.Pattern, None]: ...
 
 
@@ -24,12 +25,14 @@ def fluent_parse(
 def fluent_parse(
     source: bytes | str | ftl.Resource,
     parse_message: Callable[[ftl.Pattern], res.V],
+    id_table: res.IdTable | None = None,
 ) -> res.Resource[res.V, None]: ...
 
 
 def fluent_parse(
     source: bytes | str | ftl.Resource,
     parse_message: Callable[[ftl.Pattern], res.V] | None = None,
+    id_table: res.IdTable | None = None,
 ) -> res.Resource[res.V, None]:
     """
     Parse a .ftl file into a message resource
@@ -38,6 +41,8 @@ def fluent_parse(
     with term identifiers prefixed with a `-`.
 
     Function names are lower-cased, so e.g. the Fluent `NUMBER` is `number` in the Resource.
+
+    If an `id_table` is given, message and attribute identifiers are interned in it.
     """
 
     if isinstance(source, ftl.Resource):
@@ -51,7 +56,7 @@ def fluent_parse(
     resource = res.Resource([section])
     for entry in fluent_res.body:
         if isinstance(entry, ftl.Message) or isinstance(entry, ftl.Term):
-            entries.extend(patterns(entry, parse_message))
+            entries.extend(patterns(entry, parse_message, id_table))
         elif isinstance(entry, ftl.ResourceComment):
             if entry.content:
                 resource.comment = (
@@ -79,37 +84,84 @@ def fluent_parse(
 
 
 def patterns(
-    entry: ftl.Message | ftl.Term, parse_message: Callable[[ftl.Pattern], res.V] | None
+    entry: ftl.Message | ftl.Term,
+    parse_message: Callable[[ftl.Pattern], res.V] | None,
+    id_table: res.IdTable | None = None,
 ) -> Generator[res.Entry[res.V, None], None, None]:
     message = parse_message or (lambda m: cast(res.V, m))
     id = entry.id.name
     if isinstance(entry, ftl.Term):
         id = "-" + id
+    if id_table is not None:
+        id = id_table(id)
     comment = entry.comment.content or "" if entry.comment else ""
     if entry.value:
         yield res.Entry(id=[id], value=message(entry.value), comment=comment)
         if comment:
             comment = ""
     for attr in entry.attributes:
-        yield res.Entry(
-            id=[id, attr.id.name], value=message(attr.value), comment=comment
-        )
+        attr_id = id_table(attr.id.name) if id_table is not None else attr.id.name
+        yield res.Entry(id=[id, attr_id], value=message(attr.value), comment=comment)
         if comment:
             comment = ""
 
 
-def fluent_parse_message(ftl_pattern: ftl.Pattern) -> msg.Message:
+def fluent_parse_message(
+    ftl_pattern: ftl.Pattern, shared_variants: bool = False
+) -> msg.Message:
+    """
+    Transform a Fluent AST pattern into a message.
+
+    If `shared_variants` is set, the variants of a select message are stored as
+    `SharedVariants`, which reuses the parts of patterns that are shared between
+    variants rather than copying them into each one.
+    """
+
     sel_data = find_selectors(ftl_pattern, [])
     selectors = [sd[0] for sd in sel_data]
-    filter: list[Key | None] = [None] * len(selectors)
-    msg_variants: dict[tuple[Key, ...], msg.Pattern]
-    if selectors:
-        key_lists = [list(sd[2]) for sd in sel_data]
-        for keys in key_lists:
-            keys.sort(key=lambda k: (k[2], not k[1]))
-        msg_variants = {key: [] for key in product(*key_lists)}
-    else:
-        msg_variants = {(): []}
+    key_lists = [list(sd[2]) for sd in sel_data]
+    for keys in key_lists:
+        keys.sort(key=lambda k: (k[2], not k[1]))
+    shared = shared_variants and bool(selectors)
+
+    # The keys of each selector that the current pattern elements apply to
+    filter = list(key_lists)
+    msg_variants: dict[tuple[Key, ...], msg.Pattern] = {}
+    segments: list[tuple[str | msg.Expression, ...]] = []
+    variant_segments: dict[tuple[Key, ...], list[int]] = {}
+
+    # Consecutive elements are collected into a run,
+    # which is then added to each of the variants that it applies to.
+    run: list[str | ftl.InlineExpression] = []
+
+    def add_run() -> None:
+        if shared:
+            idx = len(segments)
+            segments.append(
+                tuple(
+                    el if isinstance(el, str) else inline_expression(el) for el in run
+                )
+            )
+            for keys in product(*filter):
+                seg_list = variant_segments.get(keys, None)
+                if seg_list is None:
+                    variant_segments[keys] = [idx]
+                else:
+                    seg_list.append(idx)
+        else:
+            for keys in product(*filter):
+                msg_pattern = msg_variants.get(keys, None)
+                if msg_pattern is None:
+                    msg_pattern = msg_variants[keys] = []
+                for el in run:
+                    if isinstance(el, str):
+                        if msg_pattern and isinstance(msg_pattern[-1], str):
+                            msg_pattern[-1] += el
+                        else:
+                            msg_pattern.append(el)
+                    else:
+                        msg_pattern.append(inline_expression(el))
+        run.clear()
 
     def add_pattern(ftl_pattern: ftl.Pattern) -> None:
         el: (
@@ -122,37 +174,54 @@ def fluent_parse_message(ftl_pattern: ftl.Pattern) -> msg.Message:
             while isinstance(el, ftl.Placeable):
                 el = el.expression
             if isinstance(el, ftl.SelectExpression):
+                if run:
+                    add_run()
                 msg_sel = next(sd[0] for sd in sel_data if el.selector in sd[1])
                 idx = selectors.index(msg_sel)
                 prev_filt = filter[idx]
                 for v in el.variants:
-                    filter[idx] = variant_key(v)
+                    filter[idx] = [variant_key(v)]
                     add_pattern(v.value)
+                    if run:
+                        add_run()
                 filter[idx] = prev_filt
+            elif isinstance(el, ftl.TextElement):
+                if run and isinstance(run[-1], str):
+                    run[-1] += el.value
+                else:
+                    run.append(el.value)
             else:
-                for keys, msg_pattern in msg_variants.items():
-                    if all(
-                        (filt is None or key == filt) for key, filt in zip(keys, filter)
-                    ):
-                        if isinstance(el, ftl.TextElement):
-                            if msg_pattern and isinstance(msg_pattern[-1], str):
-                                msg_pattern[-1] += el.value
-                            else:
-                                msg_pattern.append(el.value)
-                        else:
-                            msg_pattern.append(inline_expression(el))
+                run.append(el)
 
     add_pattern(ftl_pattern)
+    if run:
+        add_run()
 
     if selectors:
+        # Order the variants as in the product of the sorted key lists
+        key_order = [{key: i for i, key in enumerate(keys)} for keys in key_lists]
+        variant_keys = sorted(
+            variant_segments if shared else msg_variants,
+            key=lambda keys: [order[key] for order, key in zip(key_order, keys)],
+        )
+        if shared:
+            msg_keys = {key: message_key(key) for keys in key_lists for key in keys}
+            return msg.SelectMessage(
+                selectors,
+                msg.SharedVariants(
+                    segments,
+                    (
+                        (tuple(msg_keys[key] for key in keys), variant_segments[keys])
+                        for keys in variant_keys
+                    ),
+                ),
+            )
         variants = {
-            tuple(map(message_key, keys)): msg_pattern
-            for keys, msg_pattern in msg_variants.items()
-            if msg_pattern
+            tuple(map(message_key, keys)): msg_variants[keys] for keys in variant_keys
         }
         return msg.SelectMessage(selectors, variants)
     else:
-        return msg.PatternMessage(next(iter(msg_variants.values())))
+        return msg.PatternMessage(msg_variants.get((), []))
 
 
 Key = tuple[str, bool, bool]
@@ -2,12 +2,12 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
-from collections.abc import Callable
+from collections.abc import Callable, Generator, Iterable
 from re import fullmatch
-from typing import Any
+from typing import Any, NamedTuple
 
 from fluent.syntax import ast as ftl
-from fluent.syntax import serialize
+from fluent.syntax.serializer import serialize_pattern
 
 from .. import message as msg
 from .. import resource as res
@@ -17,7 +17,7 @@ def fluent_serialize(
     resource: res.Resource[msg.Message | ftl.Pattern, res.M],
     serialize_metadata: Callable[[res.Metadata[res.M]], str | None] | None = None,
     trim_comments: bool = False,
-) -> str:
+) -> Generator[str, None, None]:
     """
     Serialize a resource as the contents of a Fluent FTL file.
 
@@ -30,9 +30,108 @@ def fluent_serialize(
 
     If the resource includes any metadata, a `serialize_metadata` callable must be provided
     to map each field into a comment value, or to discard it by returning an empty value.
+
+    Yields each message (with its attributes) and comment separately.
+    The output is the same as that of serializing the `fluent_astify` result
+    with `fluent.syntax.serialize`, but without building the intermediate AST.
     """
-    ftl_ast = fluent_astify(resource, serialize_metadata, trim_comments)
-    return serialize(ftl_ast)
+
+    def comment(
+        node: (
+            res.Resource[Any, Any]
+            | res.Section[Any, Any]
+            | res.Entry[Any, Any]
+            | res.Comment
+        )
+    ) -> str:
+        if trim_comments:
+            return ""
+        cs = node.comment.rstrip()
+        meta = () if isinstance(node, res.Comment) else res.get_meta(node)
+        if meta:
+            if not serialize_metadata:
+                raise Exception("Metadata requires serialize_metadata parameter")
+            for field in meta:
+                meta_str = serialize_metadata(field)
+                if meta_str:
+                    ms = meta_str.strip("\n")
+                    cs = f"{cs}\n{ms}" if cs else ms
+        return cs
+
+    has_entries = False
+
+    def standalone_comment(content: str, prefix: str) -> str:
+        nonlocal has_entries
+        cs = comment_str(content, prefix)
+        if has_entries:
+            return f"\n{cs}\n"
+        has_entries = True
+        return f"{cs}\n"
+
+    # The current message or term is only serialized once all of its attributes
+    # and their comments have been seen.
+    cur: list[str] | None = None
+    cur_comment = ""
+    cur_id = ""
+
+    def current() -> str:
+        nonlocal cur
+        assert cur is not None
+        cs = comment_str(cur_comment, "#") if cur_comment else ""
+        cur.append("\n")
+        msg_str = cs + "".join(cur)
+        cur = None
+        return msg_str
+
+    res_comment = comment(resource)
+    if res_comment:
+        yield standalone_comment(res_comment, "###")
+    for idx, section in enumerate(resource.sections):
+        if cur is not None:
+            yield current()
+        section_comment = comment(section)
+        if not trim_comments and idx != 0 or section_comment:
+            yield standalone_comment(section_comment, "##")
+        for entry in section.entries:
+            if isinstance(entry, res.Comment):
+                if cur is not None:
+                    yield current()
+                if not trim_comments:
+                    yield standalone_comment(entry.comment, "#")
+            else:
+                value = (
+                    serialize_pattern(entry.value)
+                    if isinstance(entry.value, ftl.Pattern)
+                    else message_str(entry.value)
+                )
+                entry_comment = comment(entry)
+                if len(entry.id) == 1:  # value
+                    if cur is not None:
+                        yield current()
+                    cur_id = entry.id[0]
+                    cur = [f"{cur_id} =", value]
+                    cur_comment = entry_comment
+                    has_entries = True
+                elif len(entry.id) == 2:  # attribute
+                    if cur is None or entry.id[0] != cur_id:
+                        if cur is not None:
+                            yield current()
+                        cur_id = entry.id[0]
+                        cur = [f"{cur_id} =", ' { "" }' if cur_id[0] == "-" else ""]
+                        cur_comment = entry_comment
+                        has_entries = True
+                    elif entry_comment:
+                        attr_comment = f"{entry.id[1]}:\n{entry_comment}"
+                        cur_comment = (
+                            f"{cur_comment}\n\n{attr_comment}"
+                            if cur_comment
+                            else attr_comment
+                        )
+                    cur.append(f"\n    .{entry.id[1]} ={indent(value)}")
+                else:
+                    raise Exception(f"Unsupported message id: {entry.id}")
+    if cur is not None:
+        yield current()
 
 
 def fluent_astify(
@@ -65,10 +164,11 @@ def fluent_astify(
         if trim_comments:
             return ""
         cs = node.comment.rstrip()
-        if not isinstance(node, res.Comment) and node.meta:
+        meta = () if isinstance(node, res.Comment) else res.get_meta(node)
+        if meta:
             if not serialize_metadata:
                 raise Exception("Metadata requires serialize_metadata parameter")
-            for field in node.meta:
+            for field in meta:
                 meta_str = serialize_metadata(field)
                 if meta_str:
                     ms = meta_str.strip("\n")
@@ -99,11 +199,10 @@ def fluent_astify(
                 entry_comment = comment(entry)
                 if len(entry.id) == 1:  # value
                     cur_id = entry.id[0]
-                    id = ftl.Identifier(cur_id)
                     cur = (
-                        ftl.Term(id, value)
+                        ftl.Term(ftl.Identifier(cur_id[1:]), value)
                         if cur_id[0] == "-"
-                        else ftl.Message(id, value)
+                        else ftl.Message(ftl.Identifier(cur_id), value)
                     )
                     if entry_comment:
                         cur.comment = ftl.Comment(entry_comment)
@@ -111,12 +210,11 @@ def fluent_astify(
                 elif len(entry.id) == 2:  # attribute
                     if cur is None or entry.id[0] != cur_id:
                         cur_id = entry.id[0]
-                        id = ftl.Identifier(cur_id)
                         if cur_id[0] == "-":
-                            value = ftl.Pattern([ftl.Placeable(ftl.StringLiteral(""))])
-                            cur = ftl.Term(id, value)
+                            empty = ftl.Pattern([ftl.Placeable(ftl.StringLiteral(""))])
+                            cur = ftl.Term(ftl.Identifier(cur_id[1:]), empty)
                         else:
-                            cur = ftl.Message(id)
+                            cur = ftl.Message(ftl.Identifier(cur_id))
                         if entry_comment:
                             cur.comment = ftl.Comment(entry_comment)
                         body.append(cur)
@@ -158,7 +256,7 @@ def fluent_astify_message(message: msg.Message) -> ftl.Pattern:
     # will be next to all other variants for which the first N-1 keys are equal.
     variants = [
         (list(keys), flat_pattern(decl, value))
-        for keys, value in message.variants.items()
+        for keys, value in variant_items(message.variants)
     ]
 
     other = fallback_name(message.variants)
@@ -187,7 +285,20 @@ def fluent_astify_message(message: msg.Message) -> ftl.Pattern:
     return variants[0][1]
 
 
-def fallback_name(variants: msg.Variants) -> str:
+def variant_items(
+    variants: msg.Variants | msg.SharedVariants,
+) -> Iterable[tuple[tuple[str | msg.CatchallKey, ...], msg.Pattern]]:
+    """
+    The variants of a message, without expanding shared variants.
+    """
+    return (
+        variants.view_items()
+        if isinstance(variants, msg.SharedVariants)
+        else variants.items()
+    )
+
+
+def fallback_name(variants: msg.Variants | msg.SharedVariants) -> str:
     """
     Try `other`, `other1`, `other2`, ... until a free one is found.
     """
@@ -301,3 +412,177 @@ def value(
             if local
             else ftl.VariableReference(ftl.Identifier(val.name))
         )
+
+
+class InlineStr(NamedTuple):
+    """
+    A serialized Fluent inline expression.
+    """
+
+    source: str
+    literal: str | None = None
+    "The value of a string or number literal"
+    is_number: bool = False
+
+
+def message_str(message: msg.Message) -> str:
+    """
+    Serialize a message as a Fluent pattern,
+    including its leading space or newline.
+
+    Function names are upper-cased, and annotations with the `message` function
+    are mapped to message and term references.
+    """
+
+    decl = [d for d in message.declarations if isinstance(d, msg.Declaration)]
+    if len(decl) != len(message.declarations):
+        raise ValueError("Unsupported statements are not supported")
+    if isinstance(message, msg.PatternMessage):
+        return pattern_str(decl, message.pattern)
+    variants = list(variant_items(message.variants))
+    other = fallback_name(message.variants)
+    return select_str(decl, message.selectors, variants, other, 0)
+
+
+def select_str(
+    decl: list[msg.Declaration],
+    selectors: list[msg.Expression],
+    variants: list[tuple[tuple[str | msg.CatchallKey, ...], msg.Pattern]],
+    other: str,
+    level: int,
+) -> str:
+    """
+    Serialize `variants` as a select expression on `selectors[level]`.
+
+    We rely on the variants being in order, so that all variants
+    with the same key for this selector are next to each other.
+    """
+    parts = [f"{{ {expression_str(decl, selectors[level]).source} ->"]
+    nested = level + 1 < len(selectors)
+    i = 0
+    while i < len(variants):
+        keys, pattern = variants[i]
+        key = keys[level]
+        end = i + 1
+        if nested:
+            while end < len(variants) and variants[end][0][level] == key:
+                end += 1
+            value = select_str(decl, selectors, variants[i:end], other, level + 1)
+        else:
+            value = pattern_str(decl, pattern)
+        prefix = "   *" if isinstance(key, msg.CatchallKey) else "    "
+        parts.append(f"\n{prefix}[{variant_key_str(key, other)}]{indent(value)}")
+        i = end
+    parts.append("\n}")
+    return "\n    " + indent("".join(parts))
+
+
+def pattern_str(decl: list[msg.Declaration], pattern: msg.Pattern) -> str:
+    parts: list[str] = []
+    multiline = False
+    for el in pattern:
+        if isinstance(el, str):
+            parts.append(el)
+            if "\n" in el:
+                multiline = True
+        elif isinstance(el, msg.Expression):
+            parts.append(f"{{ {expression_str(decl, el).source} }}")
+        else:
+            raise ValueError(f"Conversion to Fluent not supported: {el}")
+    content = indent("".join(parts))
+    if multiline:
+        first = pattern[0]
+        if not isinstance(first, str) or first[:1] not in ("[", ".", "*"):
+            return "\n    " + content
+    return " " + content
+
+
+def indent(content: str) -> str:
+    """
+    Indent all but the first line of `content`.
+    """
+    return "    ".join(content.splitlines(True))
+
+
+def comment_str(content: str, prefix: str) -> str:
+    if not content:
+        return f"{prefix}\n"
+    lines = (f"{prefix} {line}" if line else prefix for line in content.split("\n"))
+    return "\n".join(lines) + "\n"
+
+
+def variant_key_str(key: str | msg.CatchallKey, other: str) -> str:
+    kv = key.value or other if isinstance(key, msg.CatchallKey) else key
+    try:
+        float(kv)
+        return kv
+    except Exception:
+        if fullmatch(r"[a-zA-Z][\w-]*", kv):
+            return kv
+        raise ValueError(f"Unsupported variant key: {kv}")
+
+
+def expression_str(decl: list[msg.Declaration], expr: msg.Expression) -> InlineStr:
+    arg = value_str(decl, expr.arg) if expr.arg is not None else None
+    if isinstance(expr.annotation, msg.FunctionAnnotation):
+        return function_str(decl, arg, expr.annotation)
+    elif expr.annotation:
+        raise ValueError("Unsupported annotations are not supported")
+    if arg:
+        return arg
+    raise ValueError("Invalid empty expression")
+
+
+def function_str(
+    decl: list[msg.Declaration],
+    arg: InlineStr | None,
+    annotation: msg.FunctionAnnotation,
+) -> InlineStr:
+    named: list[str] = []
+    for name, val in annotation.options.items():
+        ftl_val = value_str(decl, val)
+        if ftl_val.literal is not None:
+            named.append(f"{name}: {ftl_val.source}")
+        else:
+            raise ValueError(
+                f"Fluent option value not literal for {name}: {ftl_val.source}"
+            )
+
+    if annotation.name == "string":
+        if not arg:
+            raise ValueError("Argument required for :string")
+        if named:
+            raise ValueError("Options on :string are not supported")
+        return arg
+    if annotation.name == "number" and arg and arg.is_number and not named:
+        return arg
+    if annotation.name == "message":
+        if not arg or arg.literal is None:
+            raise ValueError(
+                "Message and term references must have a literal message identifier"
+            )
+        match = fullmatch(r"(-?[a-zA-Z][\w-]*)(?:\.([a-zA-Z][\w-]*))?", arg.literal)
+        if not match:
+            raise ValueError(f"Invalid message or term identifier: {arg.literal}")
+        ref = match[0]
+        if match[1][0] == "-":
+            return InlineStr(f"{ref}({', '.join(named)})" if named else ref)
+        elif named:
+            raise ValueError("Options on message references are not supported")
+        else:
+            return InlineStr(ref)
+
+    args = ", ".join([arg.source, *named] if arg else named)
+    return InlineStr(f"{annotation.name.upper()}({args})")
+
+
+def value_str(decl: list[msg.Declaration], val: str | msg.VariableRef) -> InlineStr:
+    if isinstance(val, str):
+        try:
+            float(val)
+            return InlineStr(val, val, True)
+        except Exception:
+            return InlineStr(f'"{val}"', val)
+    else:
+        local = next((d for d in decl if d.name == val.name), None)
+        return expression_str(decl, local.value) if local else InlineStr(f"${val.name}")
@@ -8,13 +8,14 @@ from typing import Any, Generator, TextIO, cast, overload
 
 from iniparse import ini  # type: ignore[import-untyped]
 
-from ..resource import Comment, Entry, Resource, Section, V
+from ..resource import Comment, Entry, IdTable, Resource, Section, V
 
 
 @overload
 def ini_parse(
     source: TextIO | str,
     parse_message: Callable[[str], str] | None = None,
+    id_table: IdTable | None = None,
 ) -> Resource[str, None]: ...
 
 
@@ -22,15 +23,19 @@ def ini_parse(
 def ini_parse(
     source: TextIO | str,
     parse_message: Callable[[str], V],
+    id_table: IdTable | None = None,
 ) -> Resource[V, None]: ...
 
 
 def ini_parse(
     source: TextIO | str,
     parse_message: Callable[[str], V] | None = None,
+    id_table: IdTable | None = None,
 ) -> Resource[V, None]:
     """
     Parse an .ini file into a message resource
+
+    If an `id_table` is given, section and entry identifiers are interned in it.
     """
     file = StringIO(source) if isinstance(source, str) else source
     cfg = ini.INIConfig(file, optionxformvalue=None)
@@ -59,12 +64,14 @@ def ini_parse(
                 entry = None
         if isinstance(line, ini.SectionLine):
             add_comment(line.comment)
-            section = Section([line.name], [], comment)
+            name = id_table(line.name) if id_table is not None else line.name
+            section = Section([name], [], comment)
             comment = ""
             resource.sections.append(section)
         elif isinstance(line, ini.OptionLine):
             add_comment(line.comment)
-            entry = Entry([line.name], line.value, comment)
+            name = id_table(line.name) if id_table is not None else line.name
+            entry = Entry([name], line.value, comment)
             comment = ""
             if section:
                 section.entries.append(entry)
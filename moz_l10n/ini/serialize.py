@@ -2,10 +2,10 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
-from collections.abc import Callable, Generator
+from collections.abc import Callable, Generator, Sequence
 from re import search
 
-from ..resource import Entry, M, Metadata, Resource, V
+from ..resource import Entry, M, Metadata, Resource, V, get_meta
 
 
 def ini_serialize(
@@ -34,7 +34,7 @@ def ini_serialize(
     at_empty_line = True
 
     def comment(
-        comment: str, meta: list[Metadata[M]] | None, standalone: bool
+        comment: str, meta: Sequence[Metadata[M]] | None, standalone: bool
     ) -> Generator[str, None, None]:
         nonlocal at_empty_line
         if trim_comments:
@@ -60,16 +60,16 @@ def ini_serialize(
                 yield "\n"
                 at_empty_line = True
 
-    yield from comment(resource.comment, resource.meta, True)
+    yield from comment(resource.comment, get_meta(resource), True)
     for section in resource.sections:
         if not section.id:
             raise ValueError("Anonymous sections are not supported")
-        yield from comment(section.comment, section.meta, False)
+        yield from comment(section.comment, get_meta(section), False)
         yield f"[{id_str(section.id)}]\n"
         at_empty_line = False
         for entry in section.entries:
             if isinstance(entry, Entry):
-                yield from comment(entry.comment, entry.meta, False)
+                yield from comment(entry.comment, get_meta(entry), False)
                 source = (
                     serialize_message(entry.value) if serialize_message else entry.value
                 )
@@ -0,0 +1,219 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+from collections import Counter
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from os import cpu_count, walk
+from os.path import isdir, join
+from typing import TYPE_CHECKING, Any
+
+from fluent.syntax import FluentParser
+from fluent.syntax import ast as ftl
+
+import l10n_parser
+
+from . import resource as res
+from .fluent import fluent_parse, fluent_parse_message
+from .ini import ini_parse
+from .properties import properties_parse
+from .properties.parse import scan_keys as properties_scan_keys
+from .snapshot import snapshot_dumps, snapshot_loads
+
+if TYPE_CHECKING:
+    from .cache import ResourceCache
+
+
+def parse_resource(
+    path: str, source: bytes | None = None, lazy: bool = False
+) -> res.Resource[Any, None]:
+    """
+    Parse a file as a message resource, using a parser selected by its path.
+
+    Fluent, .properties and .ini files are parsed with `fluent_parse`
+    (with `fluent_parse_message`), `properties_parse`, and `ini_parse`.
+    Other formats supported by `l10n_parser` are parsed with its parser,
+    and their entities are represented as entries with string values.
+    Messages are thus either `Message` or `str` values.
+    For .po files, entry identifiers are `[msgid]` or `[msgid, msgctxt]`.
+
+    If `source` is not given, it is read from `path`.
+
+    If `lazy` is set, .properties entries are created as `LazyEntry` instances,
+    as with `properties_parse`.
+    Other formats are always parsed immediately,
+    as their parsers already construct an object for each entry.
+
+    Raises an Exception if the file format is not supported,
+    or if the file contains junk.
+    """
+    if source is None:
+        with open(path, "rb") as file:
+            source = file.read()
+    if path.endswith(".ftl"):
+        return fluent_parse(source, fluent_parse_message)
+    if path.endswith(".properties"):
+        return properties_parse(source, lazy=lazy)
+    if path.endswith(".ini"):
+        return ini_parse(source.decode("utf-8"))
+    return l10n_resource(l10n_parser.parse(path, source))
+
+
+def l10n_resource(parser: l10n_parser.Parser) -> res.Resource[Any, None]:
+    entries: list[res.Entry[str, None] | res.Comment] = []
+    for entity in parser.walk():
+        if isinstance(entity, l10n_parser.Entity):
+            key = entity.key
+            id = [key] if isinstance(key, str) else [k for k in key if k]
+            comment = entity.pre_comment.val.strip() if entity.pre_comment else ""
+            entries.append(res.Entry(id, entity.val or "", comment))
+        elif isinstance(entity, l10n_parser.Comment):
+            comment = entity.val.strip()
+            if comment:
+                entries.append(res.Comment(comment))
+        elif isinstance(entity, l10n_parser.Junk):
+            raise Exception(entity.error_message())
+    return res.Resource([res.Section([], entries)])
+
+
+def scan_resource_ids(path: str, source: bytes | None = None) -> list[tuple[str, ...]]:
+    """
+    Get the identifiers of all the entries in a file, in order,
+    without parsing their values or comments.
+
+    Each identifier includes its section identifier,
+    so it's e.g. `(section, key)` for .ini files,
+    `(key,)` for most other formats,
+    and `(msgid,)` or `(msgid, msgctxt)` for .po files.
+    Fluent and .ini files are still parsed completely,
+    but their messages are not processed further.
+
+    If `source` is not given, it is read from `path`.
+
+    Raises an Exception if the file format is not supported,
+    or if the file contains junk.
+    """
+    if source is None:
+        with open(path, "rb") as file:
+            source = file.read()
+    if path.endswith(".ftl"):
+        return fluent_scan_ids(source.decode("utf-8"))
+    if path.endswith(".properties"):
+        text = source.decode("utf-8-sig")
+        return [(key,) for key in properties_scan_keys(text.split("\n"))]
+    if path.endswith(".ini"):
+        return [
+            tuple(section.id + entry.id)
+            for section in ini_parse(source.decode("utf-8")).sections
+            for entry in section.entries
+            if isinstance(entry, res.Entry)
+        ]
+    parser = l10n_parser.parse(path, source)
+    junk: list[l10n_parser.Junk] = []
+    keys = parser.scanKeys(junk)
+    if junk:
+        raise Exception(junk[0].error_message())
+    return [
+        (key,) if isinstance(key, str) else tuple(k for k in key if k) for key in keys
+    ]
+
+
+def fluent_scan_ids(source: str) -> list[tuple[str, ...]]:
+    ids: list[tuple[str, ...]] = []
+    for entry in FluentParser(with_spans=False).parse(source).body:
+        if isinstance(entry, (ftl.Message, ftl.Term)):
+            id = (
+                entry.id.name if isinstance(entry, ftl.Message) else "-" + entry.id.name
+            )
+            if entry.value:
+                ids.append((id,))
+            ids.extend((id, attr.id.name) for attr in entry.attributes)
+        elif isinstance(entry, ftl.Junk):
+            message = entry.annotations[0].message if entry.annotations else ""
+            raise Exception(message or "Fluent parser error")
+    return ids
+
+
+def count_duplicate_ids(ids: Iterable[tuple[str, ...]]) -> dict[tuple[str, ...], int]:
+    """
+    Count the identifiers that occur more than once, in order of first occurrence.
+    """
+    return {id: cnt for id, cnt in Counter(ids).items() if cnt > 1}
+
+
+def has_resource_parser(path: str) -> bool:
+    """
+    Is the file at `path` supported by `parse_resource`?
+    """
+    return path.endswith((".ftl", ".properties", ".ini")) or l10n_parser.hasParser(path)
+
+
+def load_resources(
+    paths: str | Iterable[str],
+    processes: int | None = None,
+    cache: "ResourceCache | None" = None,
+) -> dict[str, res.Resource[Any, None] | Exception]:
+    """
+    Parse many files with `parse_resource`.
+
+    If `paths` is a directory, all supported files within it are parsed.
+
+    The files are parsed in a pool of `processes` worker processes,
+    or as many as there are CPUs if it's None.
+    If `processes` is 1, they are parsed in the current process.
+
+    If a `cache` is given, resources are loaded from it when possible,
+    and newly parsed resources are added to it.
+
+    Returns a dict mapping each path to its resource,
+    or to the Exception raised while parsing it.
+    """
+    if isinstance(paths, str):
+        paths = find_resources(paths) if isdir(paths) else [paths]
+    else:
+        paths = list(paths)
+    workers = processes or cpu_count() or 1
+    if workers == 1 or len(paths) < 2:
+        return {path: load_resource(path, cache) for path in paths}
+    chunksize = max(1, len(paths) // (4 * workers))
+    with ProcessPoolExecutor(workers) as ex:
+        # Resources are sent from the workers as snapshots,
+        # which are smaller and faster to load than pickled resources.
+        results = ex.map(load_snapshot, paths, repeat(cache), chunksize=chunksize)
+        return {
+            path: snapshot_loads(result) if isinstance(result, bytes) else result
+            for path, result in zip(paths, results)
+        }
+
+
+def find_resources(root: str) -> list[str]:
+    """
+    The paths of all files within `root` that are supported by `parse_resource`,
+    in sorted order.
+
+    Hidden directories, such as `.git`, are skipped.
+    """
+    paths: list[str] = []
+    for dirpath, dirnames, filenames in walk(root):
+        dirnames[:] = sorted(name for name in dirnames if not name.startswith("."))
+        for name in sorted(filenames):
+            path = join(dirpath, name)
+            if has_resource_parser(path):
+                paths.append(path)
+    return paths
+
+
+def load_resource(
+    path: str, cache: "ResourceCache | None"
+) -> res.Resource[Any, None] | Exception:
+    try:
+        return cache.load(path) if cache is not None else parse_resource(path)
+    except Exception as error:
+        return error
+
+
+def load_snapshot(path: str, cache: "ResourceCache | None") -> bytes | Exception:
+    resource = load_resource(path, cache)
+    return resource if isinstance(resource, Exception) else snapshot_dumps(resource)
@@ -2,22 +2,29 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Mapping, MutableMapping, Sequence
+from copy import deepcopy
 from dataclasses import dataclass, field
+from itertools import accumulate, chain, pairwise, product
+from math import prod
+from operator import itemgetter
 from typing import Literal
 
 
-@dataclass
+@dataclass(slots=True)
 class VariableRef:
     name: str
 
 
-@dataclass
+@dataclass(slots=True)
 class FunctionAnnotation:
     name: str
     options: dict[str, str | VariableRef] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class UnsupportedAnnotation:
     source: str
     """
@@ -25,7 +32,7 @@ class UnsupportedAnnotation:
     """
 
 
-@dataclass
+@dataclass(slots=True)
 class Expression:
     """
     A valid Expression must contain a non-None `arg`, `annotation`, or both.
@@ -36,7 +43,7 @@ class Expression:
     attributes: dict[str, str | VariableRef | None] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class Markup:
     kind: Literal["open", "standalone", "close"]
     name: str
@@ -53,7 +60,7 @@ String values include all processing of the underlying text values, including es
 """
 
 
-@dataclass
+@dataclass(slots=True)
 class CatchallKey:
     value: str | None = field(default=None, compare=False)
     """
@@ -67,13 +74,13 @@ class CatchallKey:
         return 1
 
 
-@dataclass
+@dataclass(slots=True)
 class Declaration:
     name: str
     value: Expression
 
 
-@dataclass
+@dataclass(slots=True)
 class UnsupportedStatement:
     keyword: str
     """
@@ -90,7 +97,7 @@ class UnsupportedStatement:
     expressions: list[Expression]
 
 
-@dataclass
+@dataclass(slots=True)
 class PatternMessage:
     """
     A message without selectors and with a single pattern.
@@ -103,14 +110,303 @@ class PatternMessage:
 Variants = dict[tuple[str | CatchallKey, ...], Pattern]
 
 
-@dataclass
+class SharedVariants(MutableMapping[tuple[str | CatchallKey, ...], Pattern]):
+    """
+    A compact alternative to a `Variants` dict,
+    for select messages with many variants that share parts of their patterns.
+
+    Each variant is stored as a sequence of indices into a table of shared segments.
+    Its keys are stored as a single number, from the position of each key
+    among all the keys of its selector.
+    Rather than as separate objects, these are all kept in flat arrays.
+
+    A variant is expanded into a separate pattern when it is first accessed with `[]`.
+    Expanded patterns are retained, so changes made to them are preserved.
+
+    Use `view()` or `view_items()` to read patterns without expanding them.
+    """
+
+    __slots__ = (
+        "segments",
+        "_selector_keys",
+        "_key_pos",
+        "_codes",
+        "_ends",
+        "_indices",
+        "_slots",
+        "_expanded",
+        "_deleted",
+        "_extra",
+    )
+
+    segments: list[tuple[str | Expression | Markup, ...]]
+    """
+    The shared pattern segments. These must not be modified.
+    """
+
+    def __init__(
+        self,
+        segments: Iterable[tuple[str | Expression | Markup, ...]],
+        variants: Iterable[tuple[tuple[str | CatchallKey, ...], Sequence[int]]],
+    ) -> None:
+        self.segments = list(segments)
+        items = {keys: indices for keys, indices in variants}
+        size = len(next(iter(items), ()))
+        # The position of each key of each selector, only created for lookups
+        self._key_pos: list[dict[str | CatchallKey, int]] | None = None
+        # Maps codes to variant slots, if the codes are not in increasing order
+        self._slots: dict[int, int] | None = None
+        self._expanded: dict[int, Pattern] | None = None
+        self._deleted: set[int] | None = None
+        # Variants that are added later, or that can't be stored in the arrays
+        self._extra: dict[tuple[str | CatchallKey, ...], Pattern] | None = None
+
+        if len(set(map(len, items))) > 1:
+            for keys in [keys for keys in items if len(keys) != size]:
+                self._add_extra(keys, self._join(items.pop(keys)))
+        keys_list = list(items)
+        self._selector_keys = tuple(
+            tuple(dict.fromkeys(map(itemgetter(i), keys_list))) for i in range(size)
+        )
+        radix = prod(map(len, self._selector_keys))
+        if radix > 2**64:
+            for keys, indices in items.items():
+                self._add_extra(keys, self._join(indices))
+            items.clear()
+            keys_list.clear()
+            radix = 0
+
+        # The variant keys as mixed-radix numbers, in variant order
+        self._codes: array[int]
+        tc = _typecode(radix)
+        if len(keys_list) == radix and keys_list == list(product(*self._selector_keys)):
+            # All combinations of keys are included, in order.
+            self._codes = array(tc, range(radix))
+        else:
+            self._codes = array(tc, map(self._code, keys_list))  # type: ignore[arg-type]
+            if any(a >= b for a, b in pairwise(self._codes)):
+                self._slots = {code: slot for slot, code in enumerate(self._codes)}
+        values = list(items.values())
+        self._indices = array(
+            _typecode(len(self.segments)), chain.from_iterable(values)
+        )
+        # The end of each variant's segment indices
+        ends = list(accumulate(map(len, values)))
+        self._ends = array(_typecode(ends[-1] + 1 if ends else 0), ends)
+
+    def view(self, keys: tuple[str | CatchallKey, ...]) -> Pattern:
+        """
+        The pattern of a variant, without expanding it.
+
+        The returned pattern may share its placeholders with other variants,
+        and must not be modified.
+        """
+        slot = self._slot(keys)
+        if slot == -1:
+            if self._extra is None:
+                raise KeyError(keys)
+            return self._extra[keys]
+        return self._view(slot)
+
+    def view_items(
+        self,
+    ) -> Iterator[tuple[tuple[str | CatchallKey, ...], Pattern]]:
+        """
+        Iterate over the variants in order, without expanding them.
+
+        The patterns must not be modified.
+        """
+        for slot, keys in self._slot_keys():
+            yield keys, self._view(slot)
+        if self._extra is not None:
+            yield from self._extra.items()
+
+    def _raw_items(
+        self,
+    ) -> Iterator[tuple[tuple[str | CatchallKey, ...], tuple[int, ...] | Pattern]]:
+        """
+        Iterate over the variants in order,
+        with the segment indices of each variant that is not expanded
+        and the pattern of each one that is.
+        """
+        for slot, keys in self._slot_keys():
+            if self._expanded is not None and slot in self._expanded:
+                yield keys, self._expanded[slot]
+            else:
+                start = self._ends[slot - 1] if slot else 0
+                yield keys, tuple(self._indices[start : self._ends[slot]])
+        if self._extra is not None:
+            yield from self._extra.items()
+
+    def __getitem__(self, keys: tuple[str | CatchallKey, ...]) -> Pattern:
+        slot = self._slot(keys)
+        if slot == -1:
+            if self._extra is None:
+                raise KeyError(keys)
+            return self._extra[keys]
+        if self._expanded is None:
+            self._expanded = {}
+        elif slot in self._expanded:
+            return self._expanded[slot]
+        pattern = self._expanded[slot] = deepcopy(self._view(slot))
+        return pattern
+
+    def __setitem__(self, keys: tuple[str | CatchallKey, ...], value: Pattern) -> None:
+        slot = self._slot(keys)
+        if slot == -1:
+            self._add_extra(keys, value)
+        else:
+            if self._expanded is None:
+                self._expanded = {}
+            self._expanded[slot] = value
+
+    def __delitem__(self, keys: tuple[str | CatchallKey, ...]) -> None:
+        slot = self._slot(keys)
+        if slot == -1:
+            if self._extra is None:
+                raise KeyError(keys)
+            del self._extra[keys]
+        else:
+            if self._deleted is None:
+                self._deleted = set()
+            self._deleted.add(slot)
+            if self._expanded is not None:
+                self._expanded.pop(slot, None)
+
+    def __contains__(self, keys: object) -> bool:
+        if not isinstance(keys, tuple):
+            return False
+        return self._slot(keys) != -1 or (
+            self._extra is not None and keys in self._extra
+        )
+
+    def __iter__(self) -> Iterator[tuple[str | CatchallKey, ...]]:
+        for _, keys in self._slot_keys():
+            yield keys
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        size = len(self._codes)
+        if self._deleted is not None:
+            size -= len(self._deleted)
+        if self._extra is not None:
+            size += len(self._extra)
+        return size
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Mapping) or len(self) != len(other):
+            return False
+        view = other.view if isinstance(other, SharedVariants) else other.get
+        return all(
+            keys in other and pattern == view(keys)
+            for keys, pattern in self.view_items()
+        )
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.view_items())!r})"
+
+    def _code(self, keys: tuple[object, ...]) -> int | None:
+        """The keys as a mixed-radix number, or None if any key is not known."""
+        if len(keys) != len(self._selector_keys):
+            return None
+        if self._key_pos is None:
+            self._key_pos = [
+                {key: pos for pos, key in enumerate(sel_keys)}
+                for sel_keys in self._selector_keys
+            ]
+        code = 0
+        for key, pos in zip(keys, self._key_pos):
+            idx = pos.get(key)  # type: ignore[call-overload]
+            if idx is None:
+                return None
+            code = code * len(pos) + idx
+        return code
+
+    def _slot(self, keys: tuple[object, ...]) -> int:
+        """The array index of the variant with these keys, or -1 if there is none."""
+        code = self._code(keys)
+        if code is None:
+            return -1
+        if self._is_product():
+            slot = code
+        elif self._slots is None:
+            slot = bisect_left(self._codes, code)
+            if slot == len(self._codes) or self._codes[slot] != code:
+                return -1
+        else:
+            slot = self._slots.get(code, -1)
+        if self._deleted is not None and slot in self._deleted:
+            return -1
+        return slot
+
+    def _is_product(self) -> bool:
+        """Are the variants all the combinations of keys, in order?"""
+        return len(self._codes) == prod(map(len, self._selector_keys)) and (
+            self._slots is None
+        )
+
+    def _slot_keys(self) -> Iterator[tuple[int, tuple[str | CatchallKey, ...]]]:
+        """The array index and keys of each variant that has not been deleted."""
+        slot_keys: Iterator[tuple[int, tuple[str | CatchallKey, ...]]]
+        if self._is_product():
+            slot_keys = enumerate(product(*self._selector_keys))
+        else:
+            slot_keys = ((slot, self._keys(slot)) for slot in range(len(self._codes)))
+        if self._deleted is None:
+            return slot_keys
+        return (sk for sk in slot_keys if sk[0] not in self._deleted)
+
+    def _keys(self, slot: int) -> tuple[str | CatchallKey, ...]:
+        code = self._codes[slot]
+        keys: list[str | CatchallKey] = []
+        for sel_keys in reversed(self._selector_keys):
+            code, idx = divmod(code, len(sel_keys))
+            keys.append(sel_keys[idx])
+        keys.reverse()
+        return tuple(keys)
+
+    def _view(self, slot: int) -> Pattern:
+        if self._expanded is not None and slot in self._expanded:
+            return self._expanded[slot]
+        start = self._ends[slot - 1] if slot else 0
+        return self._join(self._indices[start : self._ends[slot]])
+
+    def _join(self, indices: Iterable[int]) -> Pattern:
+        pattern: Pattern = []
+        for idx in indices:
+            for el in self.segments[idx]:
+                if isinstance(el, str) and pattern and isinstance(pattern[-1], str):
+                    pattern[-1] += el
+                else:
+                    pattern.append(el)
+        return pattern
+
+    def _add_extra(self, keys: tuple[str | CatchallKey, ...], value: Pattern) -> None:
+        if self._extra is None:
+            self._extra = {}
+        self._extra[keys] = value
+
+
+_typecode_limits = [(2 ** (8 * array(tc).itemsize), tc) for tc in "BHIQ"]
+
+
+def _typecode(size: int) -> str:
+    """The smallest unsigned `array` typecode for values less than `size`."""
+    for limit, tc in _typecode_limits:
+        if size <= limit:
+            return tc
+    raise OverflowError(size)
+
+
+@dataclass(slots=True)
 class SelectMessage:
     """
     A message with one or more selectors and a corresponding number of variants.
     """
 
     selectors: list[Expression]
-    variants: Variants
+    variants: Variants | SharedVariants
     declarations: list[Declaration | UnsupportedStatement] = field(default_factory=list)
 
 
@@ -1,4 +1,4 @@
-from .parse import properties_parse
+from .parse import properties_iter_entries, properties_parse
 from .serialize import properties_serialize
 
-__all__ = ["properties_parse", "properties_serialize"]
+__all__ = ["properties_iter_entries", "properties_parse", "properties_serialize"]
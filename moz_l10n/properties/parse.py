@@ -2,32 +2,13 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
-from collections.abc import Callable
-from re import sub
-from typing import cast, overload
+from array import array
+from collections.abc import Callable, Iterable, Iterator
+from re import compile
+from typing import Generic, TextIO, cast, overload
+from unicodedata import lookup
 
-from translate.storage.properties import propfile
-
-from ..resource import Comment, Entry, Resource, Section, V
-
-
-def parse_comment(lines: list[str]) -> str:
-    return "\n".join(sub("^# ?", "", line) for line in lines if line.startswith("#"))
-
-
-class propfile_shim(propfile):  # type: ignore[misc]
-    def detect_encoding(
-        self, text: bytes | str, default_encodings: list[str] | None = None
-    ) -> tuple[str, str]:
-        """
-        Allow propfile().parse() to parse str inputs.
-        """
-        if isinstance(text, str):
-            return (text, default_encodings[0] if default_encodings else "utf-8")
-        else:
-            return cast(
-                tuple[str, str], super().detect_encoding(text, default_encodings)
-            )
+from ..resource import Comment, Entry, IdTable, LazyEntry, Resource, Section, V
 
 
 @overload
@@ -35,6 +16,8 @@ def properties_parse(
     source: bytes | str,
     encoding: str = "utf-8",
     parse_message: Callable[[str], str] | None = None,
+    id_table: IdTable | None = None,
+    lazy: bool = False,
 ) -> Resource[str, None]: ...
 
 
@@ -43,6 +26,8 @@ def properties_parse(
     source: bytes | str,
     encoding: str = "utf-8",
     parse_message: Callable[[str], V] | None = None,
+    id_table: IdTable | None = None,
+    lazy: bool = False,
 ) -> Resource[V, None]: ...
 
 
@@ -50,30 +35,423 @@ def properties_parse(
     source: bytes | str,
     encoding: str = "utf-8",
     parse_message: Callable[[str], V] | None = None,
+    id_table: IdTable | None = None,
+    lazy: bool = False,
 ) -> Resource[V, None]:
     """
     Parse a .properties file into a message resource
+
+    If an `id_table` is given, entry identifiers are interned in it.
+
+    If `lazy` is set, entries are created as `LazyEntry` instances,
+    which process their value and comment from the source text
+    only when they are first accessed.
     """
-    pf = propfile_shim(personality="java-utf8")
-    if encoding != "utf-8":
-        pf.default_encoding = encoding
-    pf.parse(source)
+    if isinstance(source, str):
+        text = source
+    else:
+        text = source.decode("utf-8-sig" if encoding == "utf-8" else encoding)
     entries: list[Entry[V, None] | Comment] = []
     resource = Resource([Section([], entries)])
-    for unit in pf.getunits():
-        if unit.name or unit.value:
-            entries.append(
-                Entry(
-                    id=[unit.name],
-                    value=parse_message(unit.source) if parse_message else unit.source,
-                    comment=parse_comment(unit.comments),
-                )
+    lazy_source = PropertiesSource(text, parse_message) if lazy else None
+    for entry in parse_lines(text.split("\n"), parse_message, id_table, lazy_source):
+        if isinstance(entry, Entry) or entries or resource.comment:
+            entries.append(entry)
+        else:
+            resource.comment = entry.comment
+    return resource
+
+
+@overload
+def properties_iter_entries(
+    file: TextIO,
+    parse_message: None = None,
+    chunk_size: int = 65536,
+    id_table: IdTable | None = None,
+) -> Iterator[Entry[str, None] | Comment]: ...
+
+
+@overload
+def properties_iter_entries(
+    file: TextIO,
+    parse_message: Callable[[str], V],
+    chunk_size: int = 65536,
+    id_table: IdTable | None = None,
+) -> Iterator[Entry[V, None] | Comment]: ...
+
+
+def properties_iter_entries(
+    file: TextIO,
+    parse_message: Callable[[str], V] | None = None,
+    chunk_size: int = 65536,
+    id_table: IdTable | None = None,
+) -> Iterator[Entry[V, None] | Comment]:
+    """
+    Parse a .properties text stream into entries and standalone comments,
+    yielding each one as soon as it's complete.
+
+    The stream is read in chunks of `chunk_size` characters,
+    so memory use is bounded by the size of the largest single entry
+    rather than that of the whole file.
+
+    The results match those of `properties_parse`,
+    except that a leading standalone comment is yielded as a `Comment`
+    rather than being set as the resource comment.
+    To match its line handling exactly, open the file with `newline=""`.
+
+    If an `id_table` is given, entry identifiers are interned in it.
+    """
+    return parse_lines(read_lines(file, chunk_size), parse_message, id_table)
+
+
+def read_lines(file: TextIO, chunk_size: int) -> Iterator[str]:
+    """
+    Read lines from `file`, split at `\\n` characters only.
+    """
+    parts: list[str] = []
+    while chunk := file.read(chunk_size):
+        lines = chunk.split("\n")
+        if len(lines) > 1:
+            parts.append(lines[0])
+            yield "".join(parts)
+            yield from lines[1:-1]
+            parts = [lines[-1]]
+        else:
+            parts.append(chunk)
+    yield "".join(parts)
+
+
+class PropertiesSource(Generic[V]):
+    """
+    The source text of lazily parsed .properties entries,
+    along with the spans of their values and comments.
+    """
+
+    def __init__(self, text: str, parse_message: Callable[[str], V] | None) -> None:
+        self.text = text
+        self.parse_message = parse_message
+        self.spans = array("I" if len(text) < 2**32 else "Q")
+
+    def add(
+        self, value_start: int, value_end: int, comment_start: int, comment_end: int
+    ) -> int:
+        """
+        Add the spans of an entry, returning its position.
+        """
+        pos = len(self.spans) // 4
+        self.spans.extend((value_start, value_end, comment_start, comment_end))
+        return pos
+
+    def entry_value(self, pos: int) -> V:
+        start, end = self.spans[4 * pos : 4 * pos + 2]
+        source = decode(join_value(self.text[start:end]))
+        return self.parse_message(source) if self.parse_message else cast(V, source)
+
+    def entry_comment(self, pos: int) -> str:
+        start, end = self.spans[4 * pos + 2 : 4 * pos + 4]
+        if start == end:
+            return ""
+        return parse_comment(
+            [line.rstrip("\r\n") for line in self.text[start:end].split("\n")]
+        )
+
+
+def join_value(raw: str) -> str:
+    """
+    Join the lines of a raw value that may be continued on multiple lines,
+    as in `parse_lines`.
+    """
+    lines = raw.split("\n")
+    value = ""
+    for idx, line in enumerate(lines):
+        value += line.rstrip("\r\n").lstrip() if idx else line.rstrip("\r\n")
+        if not is_continuation(value):
+            return value.lstrip() if idx else value
+        value = value[:-1]
+    # A continuation at the end of the file
+    return value
+
+
+def parse_lines(
+    lines: Iterable[str],
+    parse_message: Callable[[str], V] | None = None,
+    id_table: IdTable | None = None,
+    lazy_source: PropertiesSource[V] | None = None,
+) -> Iterator[Entry[V, None] | Comment]:
+    """
+    Parse the lines of a .properties file into entries and standalone comments.
+
+    The lines should be split at `\\n` characters only, without their line endings.
+
+    This matches the "java-utf8" dialect of the translate-toolkit `propfile` parser:
+    Lines starting with `#`, `!`, `//`, `;` or `/*` are comments,
+    but only `#` comment lines are included in the output.
+    The first comment block followed by an empty line is standalone,
+    while later comments are attached to the following entry.
+
+    If a `lazy_source` is given, the lines must be those of its text,
+    and entries are created as `LazyEntry` instances.
+    """
+    comments: list[str] = []
+    name = ""
+    value = ""
+    in_value = False
+    in_comment = False
+    was_header = False
+    # Source offsets, only used for lazy entries
+    line_start = line_end = -1
+    key_start = value_start = value_end = comment_start = 0
+
+    def entry() -> Entry[V, None]:
+        id = [id_table(name) if id_table is not None else name]
+        if lazy_source is not None:
+            pos = lazy_source.add(
+                value_start,
+                value_end,
+                comment_start if comments else key_start,
+                key_start - 1 if comments else key_start,
             )
+            return LazyEntry(id, lazy_source, pos)
+        source = decode(value)
+        return Entry(
+            id,
+            parse_message(source) if parse_message else cast(V, source),
+            comment=parse_comment(comments) if comments else "",
+        )
+
+    for line in lines:
+        line_start = line_end + 1
+        line_end = line_start + len(line)
+        line = line.rstrip("\r\n")
+        if in_value:
+            value += line.lstrip()
+            value_end = line_start + len(line)
+            in_value = is_continuation(value)
+            if in_value:
+                value = value[:-1]
+                continue
+            value = value.lstrip()
+        else:
+            stripped = line.strip()
+            if not comments:
+                comment_start = line_start
+            if in_comment:
+                comments.append(line)
+                if stripped.endswith("*/") and not stripped.startswith("/*"):
+                    in_comment = False
+                continue
+            if stripped.startswith(("#", "!", "//", ";", "/*")):
+                comments.append(line)
+                if stripped.startswith("/*") and not stripped.endswith("*/"):
+                    in_comment = True
+                continue
+            if not stripped:
+                comments.append("")
+                if not was_header and "".join(comments).strip():
+                    comment = parse_comment(comments)
+                    if comment:
+                        yield Comment(comment)
+                    comments = []
+                    was_header = True
+                continue
+
+            pos = find_delimiter(line)
+            key_start = line_start
+            value_end = line_start + len(line)
+            if pos == -1:
+                name = key_strip(line)
+                value = ""
+                value_start = value_end
+            else:
+                name = key_strip(line[:pos])
+                value = line[pos + 1 :].lstrip()
+                value_start = value_end - len(value)
+                if is_continuation(value):
+                    in_value = True
+                    value = value[:-1]
+                    continue
+
+        if name or value:
+            yield entry()
         else:
-            comment = parse_comment(unit.comments)
+            comment = parse_comment(comments)
             if comment:
-                if entries or resource.comment:
-                    entries.append(Comment(comment))
+                yield Comment(comment)
+        comments = []
+        name = value = ""
+
+    if in_value and (name or value):
+        yield entry()
+    elif comments and comments != [""]:
+        comment = parse_comment(comments)
+        if comment:
+            yield Comment(comment)
+
+
+def scan_keys(lines: Iterable[str]) -> Iterator[str]:
+    """
+    The keys of the entries that `parse_lines` would yield for `lines`,
+    without decoding their values or collecting comments.
+    """
+    name = ""
+    value = ""
+    in_value = False
+    in_comment = False
+
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if in_value:
+            value += line.lstrip()
+            in_value = is_continuation(value)
+            if in_value:
+                value = value[:-1]
+                continue
+            value = value.lstrip()
+        else:
+            stripped = line.strip()
+            if in_comment:
+                if stripped.endswith("*/") and not stripped.startswith("/*"):
+                    in_comment = False
+                continue
+            if stripped.startswith(("#", "!", "//", ";", "/*")):
+                if stripped.startswith("/*") and not stripped.endswith("*/"):
+                    in_comment = True
+                continue
+            if not stripped:
+                continue
+
+            pos = find_delimiter(line)
+            if pos == -1:
+                name = key_strip(line)
+                value = ""
+            else:
+                name = key_strip(line[:pos])
+                value = line[pos + 1 :].lstrip()
+                if is_continuation(value):
+                    in_value = True
+                    value = value[:-1]
+                    continue
+
+        if name or value:
+            yield name
+        name = value = ""
+
+    if in_value and (name or value):
+        yield name
+
+
+def parse_comment(lines: list[str]) -> str:
+    return "\n".join(
+        line[2:] if line[1:2] == " " else line[1:]
+        for line in lines
+        if line.startswith("#")
+    )
+
+
+def is_continuation(value: str) -> bool:
+    """
+    An odd number of trailing backslashes continues the value on the next line.
+    """
+    return (len(value) - len(value.rstrip("\\"))) % 2 == 1
+
+
+def find_delimiter(line: str) -> int:
+    """
+    Find the position of the key-value delimiter in `line`, or -1 if there is none.
+
+    The first unescaped `=` or `:` is used,
+    unless it's preceded by an unescaped space followed by non-space characters.
+    """
+    eq = line.find("=")
+    if eq > 0:
+        key = line[:eq]
+        if ":" not in key and "\\" not in key and " " not in key.strip():
+            return eq
+    start = len(line) - len(line.lstrip())
+    m = re_delimiter.search(line, start)
+    if m and m.start() == 0 and line.endswith("\\"):
+        # Match the translate-toolkit quirk of checking line[-1] for escapes
+        m = re_delimiter.search(line, 1)
+    ms = re_space.search(line, start)
+    if not m:
+        return ms.start() if ms else -1
+    pos = m.start()
+    if ms and ms.start() < pos and line[ms.start() : pos].strip():
+        return ms.start()
+    return pos
+
+
+re_delimiter = compile(r"(?<!\\)[:=]")
+re_space = compile(r"(?<!\\) ")
+
+
+def key_strip(key: str) -> str:
+    """
+    Strip whitespace around a key, retaining an escaped trailing whitespace character.
+    """
+    stripped = key.rstrip()
+    if stripped.endswith("\\"):
+        stripped += key[len(stripped) : len(stripped) + 1]
+    return stripped.lstrip()
+
+
+escapes = {"\\": "\\", "'": "'", '"': '"', "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+def decode(value: str) -> str:
+    """
+    Process the character \\escapes in a .properties value.
+
+    Unknown escapes are replaced by the escaped character,
+    and `\\u` escapes for control characters other than `\\f\\n\\r\\t` are left as-is.
+    """
+    pos = value.find("\\")
+    if pos == -1:
+        return value
+    end = len(value)
+    res: list[str] = []
+    start = 0
+    while pos != -1:
+        res.append(value[start:pos])
+        pos += 1
+        if pos == end:
+            res.append("\\")
+            start = end
+            break
+        char = value[pos]
+        pos += 1
+        if char in escapes:
+            res.append(escapes[char])
+        elif char == "u" or char == "U":
+            code = 0
+            digits = 0
+            while digits < 4 and pos < end:
+                hex = value[pos].lower()
+                if hex.isdigit():
+                    code = (code << 4) + ord(hex) - 48
+                elif hex in "abcdef":
+                    code = (code << 4) + ord(hex) - 87
                 else:
-                    resource.comment = comment
-    return resource
+                    break
+                digits += 1
+                pos += 1
+            res.append(
+                chr(code) if code >= 32 or code in (9, 10, 12, 13) else f"\\u{code:04x}"
+            )
+        elif char == "N":
+            if pos < end and value[pos] == "{":
+                pos += 1
+                name_end = value.find("}", pos)
+                if name_end == -1:
+                    res.append("\\N")
+                else:
+                    res.append(lookup(value[pos:name_end]))
+                    pos = name_end + 1
+            else:
+                res.append("\\N")
+        elif char != "\n":
+            res.append(char)
+        start = pos
+        pos = value.find("\\", pos)
+    res.append(value[start:])
+    return "".join(res)
@@ -2,12 +2,10 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
-from collections.abc import Callable, Generator
+from collections.abc import Callable, Generator, Sequence
 from typing import Literal
 
-from translate.storage.properties import propunit
-
-from ..resource import Entry, M, Metadata, Resource, V
+from ..resource import Entry, M, Metadata, Resource, V, get_meta
 
 
 def properties_serialize(
@@ -33,12 +31,14 @@ def properties_serialize(
     Re-parsing a serialized .properties file is not guaranteed to result in the same Resource,
     as the serialization may lose information about message sections and metadata.
     """
+    # translate-toolkit is slow to import, so it's only imported when needed.
+    from translate.storage.properties import propunit
 
     personality = "java-utf8" if encoding == "utf-8" or encoding == "utf-16" else "java"
     at_empty_line = True
 
     def comment(
-        comment: str, meta: list[Metadata[M]] | None, standalone: bool
+        comment: str, meta: Sequence[Metadata[M]] | None, standalone: bool
     ) -> Generator[str, None, None]:
         nonlocal at_empty_line
         if trim_comments:
@@ -64,13 +64,13 @@ def properties_serialize(
                 yield "\n"
                 at_empty_line = True
 
-    yield from comment(resource.comment, resource.meta, True)
+    yield from comment(resource.comment, get_meta(resource), True)
     for section in resource.sections:
-        yield from comment(section.comment, section.meta, True)
+        yield from comment(section.comment, get_meta(section), True)
         id_prefix = ".".join(section.id) + "." if section.id else ""
         for entry in section.entries:
             if isinstance(entry, Entry):
-                yield from comment(entry.comment, entry.meta, False)
+                yield from comment(entry.comment, get_meta(entry), False)
                 unit = propunit(personality=personality)
                 unit.out_delimiter_wrappers = " "
                 unit.name = id_prefix + ".".join(entry.id)
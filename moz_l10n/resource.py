@@ -2,8 +2,9 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
-from dataclasses import dataclass, field
-from typing import Generic, TypeVar
+from collections.abc import Sequence
+from dataclasses import dataclass, field, fields
+from typing import TYPE_CHECKING, Any, Generic, Protocol, TypeVar
 
 M = TypeVar("M")
 """
@@ -16,7 +17,7 @@ The Message value type.
 """
 
 
-@dataclass
+@dataclass(slots=True)
 class Metadata(Generic[M]):
     """
     Metadata is attached to a resource, section, or a single entry.
@@ -41,7 +42,7 @@ class Metadata(Generic[M]):
     """
 
 
-@dataclass
+@dataclass(slots=True)
 class Comment:
     comment: str
     """
@@ -55,8 +56,62 @@ class Comment:
     """
 
 
-@dataclass
-class Entry(Generic[V, M]):
+class _LazyMeta:
+    """
+    Shared methods for dataclasses with a lazy `meta` field.
+
+    Comparing, printing, pickling or copying a node uses `get_meta()`,
+    so none of these create an empty `meta` list for it or its copy.
+    """
+
+    __slots__ = ()
+
+    if not TYPE_CHECKING:
+
+        def __getattr__(self, name: str) -> Any:
+            # An empty `meta` list is only created when it's first accessed.
+            if name == "meta":
+                self.meta = []
+                return self.meta
+            raise AttributeError(name)
+
+    def _values(self) -> tuple[Any, ...]:
+        node: Any = self
+        return tuple(
+            list(get_meta(node)) if f.name == "meta" else getattr(node, f.name)
+            for f in fields(node)
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._values() == other._values()
+
+    def __repr__(self) -> str:
+        node: Any = self
+        args = ", ".join(
+            f"{f.name}={value!r}" for f, value in zip(fields(node), self._values())
+        )
+        return f"{self.__class__.__qualname__}({args})"
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Only the slots that are set, so an unset `meta` stays unset.
+        state: dict[str, Any] = {}
+        for cls in self.__class__.__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                try:
+                    state[name] = object.__getattribute__(self, name)
+                except AttributeError:
+                    pass
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+
+@dataclass(slots=True, eq=False, repr=False)
+class Entry(_LazyMeta, Generic[V, M]):
     """
     A message entry.
 
@@ -98,11 +153,105 @@ class Entry(Generic[V, M]):
     meta: list[Metadata[M]] = field(default_factory=list)
     """
     Metadata attached to this entry.
+
+    The empty list is only created when `meta` is first accessed;
+    use `get_meta()` to read it without doing so.
+    """
+
+    def __init__(
+        self,
+        id: list[str],
+        value: V,
+        comment: str = "",
+        meta: list[Metadata[M]] | None = None,
+    ) -> None:
+        self.id = id
+        self.value = value
+        self.comment = comment
+        if meta is not None:
+            self.meta = meta
+
+
+_V_co = TypeVar("_V_co", covariant=True)
+
+
+class EntrySource(Protocol[_V_co]):
+    """
+    The source from which the fields of a `LazyEntry` are loaded,
+    usually shared by all the entries of one resource.
+
+    Each entry has its own `pos`, which identifies its part of the source.
     """
 
+    def entry_value(self, pos: Any) -> _V_co: ...
+
+    def entry_comment(self, pos: Any) -> str: ...
 
-@dataclass
-class Section(Generic[V, M]):
+
+class LazyEntry(Entry[V, M]):
+    """
+    An entry with a `value` and `comment` that are loaded from its source
+    only when they are first accessed.
+
+    Lazy entries are created by parsers when asked for them,
+    and keep a reference to the whole source of their resource.
+    Use `detach()` or `detach_entries()` to load all of their fields
+    and release the source.
+
+    A lazy entry is equal to an `Entry` with the same fields.
+    `dataclasses.replace()` loads all of its fields,
+    and returns a plain `Entry` rather than a lazy one.
+    """
+
+    __slots__ = ("_source", "_pos")
+
+    def __init__(self, id: list[str], source: EntrySource[V], pos: Any) -> None:
+        self.id = id
+        self._source: EntrySource[V] | None = source
+        self._pos = pos
+
+    def detach(self) -> None:
+        """
+        Load the `value` and `comment` of this entry if they are not yet loaded,
+        and release its reference to its source.
+        """
+        if self._source is not None:
+            # Accessing the fields loads them.
+            self.value, self.comment
+            self._source = None
+            self._pos = None
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Entry):
+            return NotImplemented
+        return (
+            self.id == other.id
+            and self.value == other.value
+            and self.comment == other.comment
+            and list(get_meta(self)) == list(get_meta(other))
+        )
+
+    if not TYPE_CHECKING:
+
+        def __new__(cls, *args: Any, **kwargs: Any) -> Any:
+            # dataclasses.replace() calls the class with all of the entry fields
+            # as keyword arguments, which creates a plain entry.
+            if "value" in kwargs:
+                return Entry(*args, **kwargs)
+            return super().__new__(cls)
+
+        def __getattr__(self, name: str) -> Any:
+            if name == "value":
+                self.value = self._source.entry_value(self._pos)
+                return self.value
+            if name == "comment":
+                self.comment = self._source.entry_comment(self._pos)
+                return self.comment
+            return Entry.__getattr__(self, name)
+
+
+@dataclass(slots=True, eq=False, repr=False)
+class Section(_LazyMeta, Generic[V, M]):
     """
     A section of a resource.
 
@@ -148,11 +297,27 @@ class Section(Generic[V, M]):
     meta: list[Metadata[M]] = field(default_factory=list)
     """
     Metadata attached to this section.
+
+    The empty list is only created when `meta` is first accessed;
+    use `get_meta()` to read it without doing so.
     """
 
+    def __init__(
+        self,
+        id: list[str],
+        entries: list[Entry[V, M] | Comment],
+        comment: str = "",
+        meta: list[Metadata[M]] | None = None,
+    ) -> None:
+        self.id = id
+        self.entries = entries
+        self.comment = comment
+        if meta is not None:
+            self.meta = meta
 
-@dataclass
-class Resource(Generic[V, M]):
+
+@dataclass(slots=True, eq=False, repr=False)
+class Resource(_LazyMeta, Generic[V, M]):
     """
     A message resource.
 
@@ -181,4 +346,71 @@ class Resource(Generic[V, M]):
     meta: list[Metadata[M]] = field(default_factory=list)
     """
     Metadata attached to the whole resource.
+
+    The empty list is only created when `meta` is first accessed;
+    use `get_meta()` to read it without doing so.
+    """
+
+    def __init__(
+        self,
+        sections: list[Section[V, M]],
+        comment: str = "",
+        meta: list[Metadata[M]] | None = None,
+    ) -> None:
+        self.sections = sections
+        self.comment = comment
+        if meta is not None:
+            self.meta = meta
+
+
+def get_meta(
+    node: Resource[Any, M] | Section[Any, M] | Entry[Any, M],
+) -> Sequence[Metadata[M]]:
+    """
+    Get the metadata of a resource, section, or entry,
+    without creating an empty `meta` list for it if it has none.
     """
+    try:
+        return object.__getattribute__(node, "meta")  # type: ignore[no-any-return]
+    except AttributeError:
+        return ()
+
+
+def detach_entries(resource: Resource[Any, Any]) -> None:
+    """
+    Detach all of the lazy entries of a resource from their source,
+    loading any of their fields that have not yet been loaded.
+    """
+    for section in resource.sections:
+        for entry in section.entries:
+            if isinstance(entry, LazyEntry):
+                entry.detach()
+
+
+class IdTable:
+    """
+    An interning table for entry and section identifiers.
+
+    When the same table is passed to `fluent_parse`, `properties_parse`, or `ini_parse`,
+    each distinct identifier string is stored only once
+    across all of the resources that are parsed with it,
+    such as the same file in each of a large number of locales.
+
+    Only the identifier strings are shared;
+    each entry and section still has its own `id` list.
+    """
+
+    def __init__(self) -> None:
+        self._strings: dict[str, str] = {}
+
+    def __call__(self, id: str) -> str:
+        """
+        Get the interned copy of `id`, adding it to the table if necessary.
+        """
+        return self._strings.setdefault(id, id)
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def clear(self) -> None:
+        self._strings.clear()
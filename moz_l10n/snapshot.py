@@ -0,0 +1,787 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+A compact binary snapshot format for resources.
+
+A snapshot consists of a header, with the magic bytes and the format version,
+followed by these parts, compressed together with zlib:
+
+- A string table, with all of its strings as a single UTF-8 block,
+  separated by a character that none of them contain.
+  If there is no such character, the block is preceded by the string lengths.
+- Any pickled values.
+- String references, as indices into the string table.
+- The resource structure, as tags and counts encoded as unsigned varints.
+
+Each distinct string is stored only once.
+In each section, entries with single-string values and no metadata
+are grouped by their value type and id length, and each group is stored
+as its entries' positions and strings only, so that it can be loaded in bulk.
+String lengths and references are stored as packed arrays
+of the smallest integer type that fits all of their values,
+so that they can be decoded without a Python-level loop.
+
+Entry values and metadata values that are not strings, None,
+or `moz_l10n.message` messages may only be stored with pickle,
+which needs to be explicitly allowed when dumping and loading a snapshot.
+"""
+
+import gc
+import pickle
+import re
+import sys
+import zlib
+from array import array
+from collections import deque
+from collections.abc import Iterator, Sequence
+from itertools import accumulate, compress, count, islice, repeat
+from operator import is_
+from typing import Any, TypeVar
+
+from . import message as msg
+from . import resource as res
+
+MAGIC = b"L10NSNAP"
+
+SNAPSHOT_FORMAT = 3
+"""
+The version of the snapshot format.
+Snapshots of other versions can't be loaded.
+"""
+
+# Value tags
+_NONE = 0
+_STR = 1
+_PATTERN_MESSAGE = 2
+_SELECT_MESSAGE = 3
+_PICKLE = 4
+_TEXT_MESSAGE = 5
+
+# Pattern element tags
+_EL_STR = 0
+_EL_EXPRESSION = 1
+_EL_MARKUP = 2
+
+# Expression argument, option & attribute value tags
+_ARG_NONE = 0
+_ARG_STR = 1
+_ARG_VARIABLE = 2
+
+# Expression annotation tags
+_ANN_NONE = 0
+_ANN_FUNCTION = 1
+_ANN_UNSUPPORTED = 2
+
+# Declaration tags
+_DECL = 0
+_DECL_UNSUPPORTED = 1
+
+# Variant key tags
+_KEY_STR = 0
+_KEY_CATCHALL = 1
+_KEY_CATCHALL_VALUE = 2
+
+# Variants tags
+_VARIANTS_DICT = 0
+_VARIANTS_SHARED = 1
+_VARIANT_INDICES = 0
+_VARIANT_PATTERN = 1
+
+# Resource entry tags
+_ENTRY = 0
+_COMMENT = 1
+
+# The minimum size of an entry group
+_MIN_GROUP = 4
+
+_markup_kinds: list[Any] = ["open", "standalone", "close"]
+
+_typecodes = [tc for tc in "BHILQ" if array(tc).itemsize in (1, 2, 4, 8)]
+_multibyte_varint = re.compile(rb"[\x80-\xff]+[\x00-\x7f]")
+_separators = ["\0", "\x1f", "\ufffe", "\uffff"]
+
+
+def snapshot_dumps(
+    resource: res.Resource[Any, Any], allow_pickle: bool = False
+) -> bytes:
+    """
+    Serialize a resource as a compact binary snapshot,
+    which may be loaded with `snapshot_loads`.
+
+    Shared pattern segments of `SharedVariants` are stored only once,
+    and variants that have not been expanded are not expanded.
+
+    Entry and metadata values must be strings, None, or `moz_l10n.message` messages.
+    Other values raise a TypeError, unless `allow_pickle` is set,
+    in which case they are stored with pickle.
+    """
+    strings: dict[str, int] = {}
+    refs: list[int] = []
+    blobs: list[bytes] = []
+    out = bytearray()
+    tag = out.append
+    ref = refs.append
+
+    def uint(n: int) -> None:
+        while n > 0x7F:
+            out.append(n & 0x7F | 0x80)
+            n >>= 7
+        out.append(n)
+
+    def string(s: str) -> None:
+        idx = strings.get(s)
+        if idx is None:
+            idx = strings[s] = len(strings)
+        ref(idx)
+
+    def string_list(ss: list[str]) -> None:
+        uint(len(ss))
+        for s in ss:
+            string(s)
+
+    def value(v: Any) -> None:
+        if isinstance(v, str):
+            tag(_STR)
+            string(v)
+        elif v is None:
+            tag(_NONE)
+        elif type(v) is msg.PatternMessage:
+            pat = v.pattern
+            if not v.declarations and len(pat) == 1 and isinstance(pat[0], str):
+                # A common special case, which is faster to load.
+                tag(_TEXT_MESSAGE)
+                string(pat[0])
+                return
+            tag(_PATTERN_MESSAGE)
+            declarations(v.declarations)
+            pattern(v.pattern)
+        elif type(v) is msg.SelectMessage:
+            tag(_SELECT_MESSAGE)
+            declarations(v.declarations)
+            uint(len(v.selectors))
+            for sel in v.selectors:
+                expression(sel)
+            variants(v.variants)
+        elif not allow_pickle:
+            raise TypeError(
+                f"Unsupported resource snapshot value type {type(v).__name__}"
+            )
+        else:
+            tag(_PICKLE)
+            uint(len(blobs))
+            blobs.append(pickle.dumps(v, pickle.HIGHEST_PROTOCOL))
+
+    def declarations(decls: list[msg.Declaration | msg.UnsupportedStatement]) -> None:
+        uint(len(decls))
+        for decl in decls:
+            if isinstance(decl, msg.Declaration):
+                tag(_DECL)
+                string(decl.name)
+                expression(decl.value)
+            else:
+                tag(_DECL_UNSUPPORTED)
+                string(decl.keyword)
+                value(decl.body)
+                uint(len(decl.expressions))
+                for expr in decl.expressions:
+                    expression(expr)
+
+    def pattern(els: Sequence[str | msg.Expression | msg.Markup]) -> None:
+        uint(len(els))
+        for el in els:
+            if isinstance(el, str):
+                tag(_EL_STR)
+                string(el)
+            elif isinstance(el, msg.Expression):
+                tag(_EL_EXPRESSION)
+                expression(el)
+            else:
+                tag(_EL_MARKUP)
+                tag(_markup_kinds.index(el.kind))
+                string(el.name)
+                options(el.options)
+                attributes(el.attributes)
+
+    def expression(expr: msg.Expression) -> None:
+        arg_value(expr.arg)
+        ann = expr.annotation
+        if ann is None:
+            tag(_ANN_NONE)
+        elif isinstance(ann, msg.FunctionAnnotation):
+            tag(_ANN_FUNCTION)
+            string(ann.name)
+            options(ann.options)
+        else:
+            tag(_ANN_UNSUPPORTED)
+            string(ann.source)
+        attributes(expr.attributes)
+
+    def arg_value(v: str | msg.VariableRef | None) -> None:
+        if isinstance(v, str):
+            tag(_ARG_STR)
+            string(v)
+        elif v is None:
+            tag(_ARG_NONE)
+        else:
+            tag(_ARG_VARIABLE)
+            string(v.name)
+
+    def options(opts: dict[str, str | msg.VariableRef]) -> None:
+        uint(len(opts))
+        for name, v in opts.items():
+            string(name)
+            arg_value(v)
+
+    def attributes(attrs: dict[str, str | msg.VariableRef | None]) -> None:
+        uint(len(attrs))
+        for name, v in attrs.items():
+            string(name)
+            arg_value(v)
+
+    def variant_keys(keys: tuple[str | msg.CatchallKey, ...]) -> None:
+        uint(len(keys))
+        for key in keys:
+            if isinstance(key, str):
+                tag(_KEY_STR)
+                string(key)
+            elif key.value is None:
+                tag(_KEY_CATCHALL)
+            else:
+                tag(_KEY_CATCHALL_VALUE)
+                string(key.value)
+
+    def variants(vars: msg.Variants | msg.SharedVariants) -> None:
+        if isinstance(vars, msg.SharedVariants):
+            tag(_VARIANTS_SHARED)
+            uint(len(vars.segments))
+            for segment in vars.segments:
+                pattern(segment)
+            uint(len(vars))
+            for keys, v in vars._raw_items():
+                variant_keys(keys)
+                if isinstance(v, tuple):
+                    tag(_VARIANT_INDICES)
+                    uint(len(v))
+                    for idx in v:
+                        uint(idx)
+                else:
+                    tag(_VARIANT_PATTERN)
+                    pattern(v)
+        else:
+            tag(_VARIANTS_DICT)
+            uint(len(vars))
+            for keys, pat in vars.items():
+                variant_keys(keys)
+                pattern(pat)
+
+    def metadata(meta: Sequence[res.Metadata[Any]]) -> None:
+        uint(len(meta))
+        for m in meta:
+            string(m.key)
+            value(m.value)
+
+    def entry_group(key: tuple[int, int], group: list[Any]) -> None:
+        kind, id_len = key
+        tag(kind)
+        uint(id_len)
+        uint(len(group))
+        prev = -1
+        for idx, _ in group:
+            uint(idx - prev)
+            prev = idx
+        for _, entry in group:
+            for s in entry.id:
+                string(s)
+            string(entry.value if kind == _STR else entry.value.pattern[0])
+            string(entry.comment)
+
+    get_meta = res.get_meta
+    string(resource.comment)
+    metadata(get_meta(resource))
+    uint(len(resource.sections))
+    for section in resource.sections:
+        string_list(section.id)
+        string(section.comment)
+        metadata(get_meta(section))
+        entries = section.entries
+        uint(len(entries))
+        groups: dict[tuple[int, int], list[tuple[int, Any]]] = {}
+        others: list[tuple[int, Any]] = []
+        for item in enumerate(entries):
+            key = _group_key(item[1])
+            if key is None:
+                others.append(item)
+            else:
+                groups.setdefault(key, []).append(item)
+        for key, group in list(groups.items()):
+            if len(group) < _MIN_GROUP:
+                others += groups.pop(key)
+        others.sort(key=lambda item: item[0])
+        uint(len(groups))
+        for key, group in groups.items():
+            entry_group(key, group)
+        for _, entry in others:
+            if isinstance(entry, res.Entry):
+                tag(_ENTRY)
+                string_list(entry.id)
+                value(entry.value)
+                string(entry.comment)
+                metadata(get_meta(entry))
+            else:
+                tag(_COMMENT)
+                string(entry.comment)
+
+    structure = out
+    out = bytearray()
+    uint(len(strings))
+    text = "".join(strings)
+    sep = next((sep for sep in _separators if sep not in text), None)
+    if sep is None:
+        uint(0)
+        out += _pack([len(s) for s in strings])
+    else:
+        # Splitting the text on a separator is faster than slicing it by lengths.
+        uint(ord(sep) + 1)
+        text = sep.join(strings)
+    data = text.encode("utf-8", "surrogatepass")
+    uint(len(data))
+    out += data
+    uint(len(blobs))
+    for blob in blobs:
+        uint(len(blob))
+        out += blob
+    out += _pack(refs)
+    out += structure
+    body = zlib.compress(out, 1)
+    out = bytearray(MAGIC)
+    uint(SNAPSHOT_FORMAT)
+    return bytes(out) + body
+
+
+def _group_key(entry: Any) -> tuple[int, int] | None:
+    """
+    The value kind and id length of an entry that may be a part of a group,
+    or None if it can't be.
+    """
+    if not isinstance(entry, res.Entry) or not entry.id or res.get_meta(entry):
+        return None
+    value = entry.value
+    if isinstance(value, str):
+        return _STR, len(entry.id)
+    if (
+        type(value) is msg.PatternMessage
+        and not value.declarations
+        and len(value.pattern) == 1
+        and isinstance(value.pattern[0], str)
+    ):
+        return _TEXT_MESSAGE, len(entry.id)
+    return None
+
+
+def snapshot_loads(data: bytes, allow_pickle: bool = False) -> res.Resource[Any, Any]:
+    """
+    Load a resource from a binary snapshot created by `snapshot_dumps`.
+
+    Raises a ValueError if `data` is not a valid snapshot.
+    Snapshots with pickled values are only loaded if `allow_pickle` is set,
+    which should only be done for trusted data.
+    """
+    if not data.startswith(MAGIC):
+        raise ValueError("Not a resource snapshot")
+    try:
+        version, pos = _read_uint(data, len(MAGIC))
+        if version != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported resource snapshot version {version}")
+        decompressor = zlib.decompressobj()
+        data = decompressor.decompress(data[pos:])
+        if not decompressor.eof:
+            raise IndexError("Truncated resource snapshot")
+        if decompressor.unused_data:
+            raise ValueError("Unexpected data at end of resource snapshot")
+        count, pos = _read_uint(data, 0)
+        sep, pos = _read_uint(data, pos)
+        if not sep:
+            lengths, pos = _unpack(data, pos)
+        size, pos = _read_uint(data, pos)
+        if pos + size > len(data):
+            raise IndexError("Truncated string table")
+        text = data[pos : pos + size].decode("utf-8", "surrogatepass")
+        pos += size
+        if sep:
+            strings = text.split(chr(sep - 1)) if count else []
+            valid = len(strings) == count and (count or not text)
+        else:
+            ends = list(accumulate(lengths))
+            strings = [text[end - n : end] for end, n in zip(ends, lengths)]
+            valid = len(strings) == count and (ends[-1] if ends else 0) == len(text)
+        if not valid:
+            raise ValueError("Invalid resource snapshot string table")
+        count, pos = _read_uint(data, pos)
+        if count and not allow_pickle:
+            raise ValueError("Resource snapshot contains pickled values")
+        blobs: list[bytes] = []
+        for _ in range(count):
+            size, pos = _read_uint(data, pos)
+            blobs.append(data[pos : pos + size])
+            pos += size
+        refs, pos = _unpack(data, pos)
+        loader = _Loader(
+            map(strings.__getitem__, refs),
+            iter(_read_uints(data, pos)),
+            blobs,
+        )
+        # The loaded objects can't form reference cycles,
+        # so there's no need for garbage collection while creating them.
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            resource = loader.resource()
+        finally:
+            if gc_enabled:
+                gc.enable()
+    except (IndexError, StopIteration, UnicodeDecodeError, zlib.error) as error:
+        raise ValueError("Invalid resource snapshot") from error
+    for read in (loader.string, loader.next):
+        try:
+            read()
+        except StopIteration:
+            continue
+        raise ValueError("Unexpected data at end of resource snapshot")
+    return resource
+
+
+def _pack(ints: list[int]) -> bytes:
+    """
+    The count, typecode, and little-endian contents of an `array` of `ints`.
+    """
+    bits = max(ints, default=0).bit_length()
+    tc = next(tc for tc in _typecodes if array(tc).itemsize * 8 >= bits)
+    arr = array(tc, ints)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    header = bytearray()
+    n = len(ints)
+    while n > 0x7F:
+        header.append(n & 0x7F | 0x80)
+        n >>= 7
+    header.append(n)
+    header += tc.encode("ascii")
+    return bytes(header) + arr.tobytes()
+
+
+def _unpack(data: bytes, pos: int) -> tuple["array[int]", int]:
+    """
+    Read an array written by `_pack` in `data` at `pos`,
+    returning it and the position after it.
+    """
+    count, pos = _read_uint(data, pos)
+    tc = chr(data[pos])
+    if tc not in _typecodes:
+        raise ValueError(f"Invalid resource snapshot array type {tc!r}")
+    arr = array(tc)
+    end = pos + 1 + count * arr.itemsize
+    if end > len(data):
+        raise IndexError("Truncated array")
+    arr.frombytes(data[pos + 1 : end])
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr, end
+
+
+def _read_uint(data: bytes, pos: int) -> tuple[int, int]:
+    """
+    Decode one varint in `data` at `pos`,
+    returning its value and the position after it.
+    """
+    n = 0
+    shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        if b < 0x80:
+            return n | b << shift, pos
+        n |= (b & 0x7F) << shift
+        shift += 7
+
+
+def _read_uints(data: bytes, pos: int) -> list[int]:
+    """
+    Decode all varints in `data` from `pos` onwards.
+
+    Runs of single-byte values are copied directly.
+    """
+    ints: list[int] = []
+    for match in _multibyte_varint.finditer(data, pos):
+        start, end = match.span()
+        ints += data[pos:start]
+        n = 0
+        shift = 0
+        for b in data[start:end]:
+            n |= (b & 0x7F) << shift
+            shift += 7
+        ints.append(n)
+        pos = end
+    if data[-1:] >= b"\x80":
+        raise IndexError("Truncated varint")
+    ints += data[pos:]
+    return ints
+
+
+_T = TypeVar("_T")
+
+
+def _new_all(cls: type[_T], count: int, **fields: list[Any]) -> list[_T]:
+    """
+    Create `count` instances of `cls` with the given field values,
+    without calling its `__init__` and without a Python-level loop.
+    """
+    objs = list(map(cls.__new__, repeat(cls, count)))
+    for name, values in fields.items():
+        deque(map(setattr, objs, repeat(name), values), 0)
+    return objs
+
+
+_new = object.__new__
+
+
+class _Loader:
+    def __init__(
+        self,
+        strings: Iterator[str],
+        ints: Iterator[int],
+        blobs: list[bytes],
+    ) -> None:
+        self.strings = strings
+        self.string = strings.__next__
+        self.ints = ints
+        self.next = ints.__next__
+        self.blobs = blobs
+
+    def resource(self) -> res.Resource[Any, Any]:
+        string = self.string
+        next = self.next
+        res_comment = string()
+        res_meta = self.metadata(next())
+        sections: list[res.Section[Any, Any]] = []
+        for _ in range(next()):
+            id = [string() for _ in range(next())]
+            entries: list[res.Entry[Any, Any] | res.Comment] = []
+            section_comment = string()
+            section_meta = self.metadata(next())
+            sections.append(res.Section(id, entries, section_comment, section_meta))
+            entry_count = next()
+            group_count = next()
+            if not group_count:
+                entries += [self.entry() for _ in range(entry_count)]
+                continue
+            slots: list[Any] = [None] * entry_count
+            complete = False
+            for _ in range(group_count):
+                kind = next()
+                id_len = next()
+                size = next()
+                deltas = list(islice(self.ints, size))
+                if len(deltas) != size:
+                    raise IndexError("Truncated resource snapshot entry group")
+                group = self.entry_group(kind, id_len, size)
+                if group_count == 1 and size == entry_count:
+                    # All of the section's entries are in this group
+                    if deltas.count(1) != size:
+                        raise ValueError("Invalid resource snapshot entry group")
+                    slots = group
+                    complete = True
+                else:
+                    positions = islice(accumulate(deltas, initial=-1), 1, None)
+                    deque(map(slots.__setitem__, positions, group), 0)
+            if not complete:
+                for idx in compress(count(), map(is_, slots, repeat(None))):
+                    slots[idx] = self.entry()
+            entries += slots
+        return res.Resource(sections, res_comment, res_meta)
+
+    def entry(self) -> res.Entry[Any, Any] | res.Comment:
+        string = self.string
+        next = self.next
+        if next() != _ENTRY:
+            return res.Comment(string())
+        # Inline the most common cases
+        n = next()
+        id = [string()] if n == 1 else [string() for _ in range(n)]
+        tag = next()
+        value: Any
+        if tag == _STR:
+            value = string()
+        elif tag == _TEXT_MESSAGE:
+            value = msg.PatternMessage([string()])
+        else:
+            value = self.value(tag)
+        comment = string()
+        n = next()
+        meta = self.metadata(n) if n else None
+        return res.Entry(id, value, comment, meta)
+
+    def entry_group(
+        self, kind: int, id_len: int, size: int
+    ) -> list[res.Entry[Any, Any]]:
+        width = id_len + 2
+        strs = list(islice(self.strings, size * width))
+        if not id_len or len(strs) != size * width:
+            raise IndexError("Invalid resource snapshot entry group")
+        if id_len == 1:
+            ids = list(map(list, zip(strs[0::width])))
+        else:
+            ids = list(map(list, zip(*(strs[i::width] for i in range(id_len)))))
+        values: list[Any] = strs[id_len::width]
+        if kind == _TEXT_MESSAGE:
+            values = _new_all(
+                msg.PatternMessage,
+                size,
+                pattern=list(map(list, zip(values))),
+                declarations=list(map(list, repeat((), size))),
+            )
+        elif kind != _STR:
+            raise ValueError(f"Unknown resource snapshot value tag {kind}")
+        return _new_all(
+            res.Entry, size, id=ids, value=values, comment=strs[id_len + 1 :: width]
+        )
+
+    def metadata(self, count: int) -> list[res.Metadata[Any]] | None:
+        # An empty list is not created here, so that it's only created on access.
+        if count == 0:
+            return None
+        return [
+            res.Metadata(self.string(), self.value(self.next())) for _ in range(count)
+        ]
+
+    def value(self, tag: int) -> Any:
+        if tag == _STR:
+            return self.string()
+        if tag == _TEXT_MESSAGE:
+            return msg.PatternMessage([self.string()])
+        if tag == _PATTERN_MESSAGE:
+            decls = self.declarations()
+            return msg.PatternMessage(self.pattern(), decls)
+        if tag == _SELECT_MESSAGE:
+            decls = self.declarations()
+            selectors = [self.expression() for _ in range(self.next())]
+            return msg.SelectMessage(selectors, self.variants(), decls)
+        if tag == _NONE:
+            return None
+        if tag == _PICKLE:
+            return pickle.loads(self.blobs[self.next()])
+        raise ValueError(f"Unknown resource snapshot value tag {tag}")
+
+    def declarations(self) -> list[msg.Declaration | msg.UnsupportedStatement]:
+        next = self.next
+        decls: list[msg.Declaration | msg.UnsupportedStatement] = []
+        for _ in range(next()):
+            if next() == _DECL:
+                decls.append(msg.Declaration(self.string(), self.expression()))
+            else:
+                keyword = self.string()
+                body = self.value(next())
+                exprs = [self.expression() for _ in range(next())]
+                decls.append(msg.UnsupportedStatement(keyword, body, exprs))
+        return decls
+
+    def pattern(self) -> msg.Pattern:
+        string = self.string
+        next = self.next
+        pattern: msg.Pattern = []
+        for _ in range(next()):
+            tag = next()
+            if tag == _EL_STR:
+                pattern.append(string())
+            elif tag == _EL_EXPRESSION:
+                pattern.append(self.expression())
+            else:
+                kind = _markup_kinds[next()]
+                name = string()
+                opts = self.options()
+                attrs = self.attributes(next())
+                pattern.append(msg.Markup(kind, name, opts, attrs))
+        return pattern
+
+    def expression(self) -> msg.Expression:
+        next = self.next
+        expr = _new(msg.Expression)
+        tag = next()
+        if tag == _ARG_STR:
+            expr.arg = self.string()
+        elif tag == _ARG_VARIABLE:
+            expr.arg = ref = _new(msg.VariableRef)
+            ref.name = self.string()
+        else:
+            expr.arg = None
+        tag = next()
+        if tag == _ANN_NONE:
+            expr.annotation = None
+        elif tag == _ANN_FUNCTION:
+            expr.annotation = ann = _new(msg.FunctionAnnotation)
+            ann.name = self.string()
+            ann.options = self.options()
+        else:
+            expr.annotation = msg.UnsupportedAnnotation(self.string())
+        n = next()
+        expr.attributes = self.attributes(n) if n else {}
+        return expr
+
+    def arg_value(self, tag: int) -> Any:
+        if tag == _ARG_STR:
+            return self.string()
+        if tag == _ARG_VARIABLE:
+            ref = _new(msg.VariableRef)
+            ref.name = self.string()
+            return ref
+        return None
+
+    def options(self) -> dict[str, str | msg.VariableRef]:
+        next = self.next
+        opts: dict[str, str | msg.VariableRef] = {}
+        for _ in range(next()):
+            name = self.string()
+            opts[name] = self.arg_value(next())
+        return opts
+
+    def attributes(self, count: int) -> dict[str, str | msg.VariableRef | None]:
+        next = self.next
+        attrs: dict[str, str | msg.VariableRef | None] = {}
+        for _ in range(count):
+            name = self.string()
+            attrs[name] = self.arg_value(next())
+        return attrs
+
+    def variant_keys(self) -> tuple[str | msg.CatchallKey, ...]:
+        next = self.next
+        keys: list[str | msg.CatchallKey] = []
+        for _ in range(next()):
+            tag = next()
+            if tag == _KEY_STR:
+                keys.append(self.string())
+            elif tag == _KEY_CATCHALL:
+                keys.append(msg.CatchallKey())
+            else:
+                keys.append(msg.CatchallKey(self.string()))
+        return tuple(keys)
+
+    def variants(self) -> msg.Variants | msg.SharedVariants:
+        next = self.next
+        if next() == _VARIANTS_DICT:
+            return {self.variant_keys(): self.pattern() for _ in range(next())}
+        segments = [tuple(self.pattern()) for _ in range(next())]
+        indices: list[tuple[tuple[str | msg.CatchallKey, ...], list[int]]] = []
+        expanded: list[tuple[tuple[str | msg.CatchallKey, ...], msg.Pattern]] = []
+        for _ in range(next()):
+            keys = self.variant_keys()
+            if next() == _VARIANT_INDICES:
+                indices.append((keys, [next() for _ in range(next())]))
+            else:
+                # An empty placeholder retains the variant order.
+                indices.append((keys, []))
+                expanded.append((keys, self.pattern()))
+        shared = msg.SharedVariants(segments, indices)
+        for keys, pattern in expanded:
+            shared[keys] = pattern
+        return shared
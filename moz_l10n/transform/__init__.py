@@ -1,3 +1,3 @@
-from .add_entries import add_entries
+from .add_entries import add_entries, add_entries_bulk
 
-__all__ = ["add_entries"]
+__all__ = ["add_entries", "add_entries_bulk"]
@@ -2,13 +2,34 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
-from dataclasses import replace
-from typing import Any
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from os import cpu_count
+from typing import Any, TypeVar
 
 from .. import resource as res
 
 RS = res.Section[Any, Any]
 RE = res.Entry[Any, Any]
+T = TypeVar("T")
+
+EntryKey = tuple[tuple[str, ...], tuple[str, ...]]
+"The (section id, entry id) of an entry."
+
+SourcePlan = list[tuple[RS, list[tuple[RE, EntryKey]]]]
+"The source sections, each with its entries and their keys."
+
+Position = tuple[int, T | None, int]
+"""
+A position within a list that is being added to,
+as a `(gap, anchor, hint)` tuple.
+
+Gap `i` is the space before item `i` of the original list,
+with gap `len(list)` at its end.
+Within the gap, the position is right after the added `anchor` item,
+or at the start of the gap if `anchor` is None.
+`hint` is the index of `anchor` within the gap at the time it was added.
+"""
 
 
 def add_entries(
@@ -22,51 +43,189 @@ def add_entries(
 
     Returns a count of added entries.
     """
+    return merge_entries(target, source_plan(source))
+
+
+def add_entries_bulk(
+    targets: Sequence[res.Resource[res.V, res.M]],
+    source: res.Resource[res.V, res.M],
+    processes: int | None = 1,
+) -> list[int]:
+    """
+    Modifies each of `targets` by adding entries from `source` that are not already present in it,
+    as with calling `add_entries(target, source)` for each target.
+
+    The source is only processed once, rather than separately for each target.
+
+    If `processes` is not 1, the targets are merged in a pool of that many worker processes,
+    or as many as there are CPUs if it's None.
+    In that case the sections of each target are replaced with merged copies,
+    and the added entries are not shared with `source`.
+
+    Returns a list of the counts of added entries for each target.
+    """
+    plan = source_plan(source)
+    if processes == 1 or len(targets) < 2:
+        return [merge_entries(target, plan) for target in targets]
+    workers = processes or cpu_count() or 1
+    chunksize = max(1, len(targets) // (4 * workers))
+    with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(plan,)) as ex:
+        results = ex.map(merge_in_worker, targets, chunksize=chunksize)
+        counts: list[int] = []
+        for target, (sections, added) in zip(targets, results):
+            target.sections[:] = sections
+            counts.append(added)
+    return counts
+
+
+worker_plan: SourcePlan = []
+
+
+def init_worker(plan: SourcePlan) -> None:
+    global worker_plan
+    worker_plan = plan
+
+
+def merge_in_worker(
+    target: res.Resource[res.V, res.M]
+) -> tuple[list[res.Section[res.V, res.M]], int]:
+    added = merge_entries(target, worker_plan)
+    return target.sections, added
+
+
+def source_plan(source: res.Resource[Any, Any]) -> SourcePlan:
+    plan: SourcePlan = []
+    for section in source.sections:
+        section_id = tuple(section.id)
+        plan.append(
+            (
+                section,
+                [
+                    (entry, (section_id, tuple(entry.id)))
+                    for entry in section.entries
+                    if isinstance(entry, res.Entry)
+                ],
+            )
+        )
+    return plan
+
+
+def merge_entries(target: res.Resource[Any, Any], plan: SourcePlan) -> int:
+    # Rather than inserting each added entry or section into its list directly,
+    # they're collected into gaps between the original items,
+    # and each modified list is rebuilt only once at the end.
+    section_gaps: dict[int, list[RS]] = {}
+    section_pos: dict[int, Position[RS]] = {}
+    entry_gaps: dict[int, tuple[RS, dict[int, list[RE | res.Comment]]]] = {}
+    entry_pos: dict[EntryKey, tuple[RS, Position[RE]]] = {}
+    comment_sections: dict[tuple[tuple[str, ...], str], RS] = {}
+
+    def index_section(section: RS, pos: Position[RS]) -> None:
+        section_id = tuple(section.id)
+        section_pos[id(section)] = pos
+        comment_sections.setdefault((section_id, section.comment), section)
+        for idx, entry in enumerate(section.entries):
+            if isinstance(entry, res.Entry):
+                key = (section_id, tuple(entry.id))
+                entry_pos.setdefault(key, (section, (idx + 1, None, -1)))
+
+    for idx, section in enumerate(target.sections):
+        index_section(section, (idx + 1, None, -1))
 
     added = 0
-    cur_tgt_section: RS | None = None
-    for src_section in source.sections:
-        tgt_match = [s for s in target.sections if s.id == src_section.id]
-        prev_pos: tuple[RS, int] | None = None
+    cur_tgt_section: Position[RS] | None = None
+    for src_section, src_entries in plan:
+        section_id = tuple(src_section.id)
+        prev_pos: tuple[RS, Position[RE]] | None = None
         new_entries: list[RE | res.Comment] = []
-        for entry in src_section.entries:
-            if isinstance(entry, res.Entry):
-                target_pos = next(
-                    (
-                        (s, i)
-                        for s in tgt_match
-                        for i, e in enumerate(s.entries)
-                        if isinstance(e, res.Entry) and e.id == entry.id
-                    ),
-                    None,
-                )
-                if target_pos:
-                    prev_pos = target_pos
-                    cur_tgt_section = target_pos[0]
+        for entry, key in src_entries:
+            target_pos = entry_pos.get(key, None)
+            if target_pos:
+                prev_pos = target_pos
+                cur_tgt_section = section_pos[id(target_pos[0])]
+            else:
+                # Entry has no section-id + entry-id match in target,
+                # so needs to be added.
+                added += 1
+                sc = src_section.comment
+                if prev_pos and prev_pos[0].comment == sc:
+                    # The preceding entry did have a match in a section
+                    # exactly matching this one, so we can add an entry there.
+                    ps = prev_pos[0]
+                    gap = prev_pos[1][0]
+                    gap_entries = get_entry_gap(entry_gaps, ps, gap)
+                    idx = insert_after(gap_entries, prev_pos[1], entry)
+                    prev_pos = (ps, (gap, entry, idx))
+                    entry_pos.setdefault(key, prev_pos)
                 else:
-                    # Entry has no section-id + entry-id match in target,
-                    # so needs to be added.
-                    added += 1
-                    sc = src_section.comment
-                    if prev_pos and prev_pos[0].comment == sc:
-                        # The preceding entry did have a match in a section
-                        # exactly matching this one, so we can add an entry there.
-                        idx = prev_pos[1] + 1
-                        prev_pos[0].entries.insert(idx, entry)
-                        prev_pos = (prev_pos[0], idx)
+                    ts = comment_sections.get((section_id, sc), None)
+                    if ts:
+                        # An exactly matching section exists in target,
+                        # so add this entry there.
+                        gap = len(ts.entries)
+                        gap_entries = get_entry_gap(entry_gaps, ts, gap)
+                        gap_entries.append(entry)
+                        prev_pos = (ts, (gap, entry, len(gap_entries) - 1))
+                        entry_pos.setdefault(key, prev_pos)
                     else:
-                        ts = next((s for s in tgt_match if s.comment == sc), None)
-                        if ts:
-                            # An exactly matching section exists in target,
-                            # so add this entry there.
-                            ts.entries.append(entry)
-                            prev_pos = (ts, len(ts.entries) - 1)
-                        else:
-                            # A new section needs to be added for this entry.
-                            new_entries.append(entry)
-                            prev_pos = None
+                        # A new section needs to be added for this entry.
+                        new_entries.append(entry)
+                        prev_pos = None
         if new_entries:
-            idx = target.sections.index(cur_tgt_section) + 1 if cur_tgt_section else 0
-            cur_tgt_section = replace(src_section, entries=new_entries)
-            target.sections.insert(idx, cur_tgt_section)
+            # An empty meta list is not created for either section.
+            new_section = res.Section(
+                src_section.id,
+                new_entries,
+                src_section.comment,
+                list(res.get_meta(src_section)) or None,
+            )
+            gap = cur_tgt_section[0] if cur_tgt_section else 0
+            gap_sections = section_gaps.setdefault(gap, [])
+            idx = insert_after(gap_sections, cur_tgt_section, new_section)
+            cur_tgt_section = (gap, new_section, idx)
+            index_section(new_section, cur_tgt_section)
+
+    for section, gaps in entry_gaps.values():
+        section.entries[:] = fill_gaps(section.entries, gaps)
+    if section_gaps:
+        target.sections[:] = fill_gaps(target.sections, section_gaps)
     return added
+
+
+def get_entry_gap(
+    entry_gaps: dict[int, tuple[RS, dict[int, list[RE | res.Comment]]]],
+    section: RS,
+    gap: int,
+) -> list[RE | res.Comment]:
+    sg = entry_gaps.get(id(section), None)
+    if sg is None:
+        sg = entry_gaps[id(section)] = (section, {})
+    return sg[1].setdefault(gap, [])
+
+
+def insert_after(gap_items: list[T], pos: Position[T] | None, item: T) -> int:
+    """
+    Insert `item` into `gap_items` right after the position `pos`,
+    which must be in the same gap.
+
+    Returns the index of `item` within `gap_items`.
+    """
+    if pos is None or pos[1] is None:
+        idx = 0
+    else:
+        _, anchor, hint = pos
+        if 0 <= hint < len(gap_items) and gap_items[hint] is anchor:
+            idx = hint + 1
+        else:
+            idx = next(i for i, gi in enumerate(gap_items) if gi is anchor) + 1
+    gap_items.insert(idx, item)
+    return idx
+
+
+def fill_gaps(items: list[T], gaps: dict[int, list[T]]) -> list[T]:
+    filled = list(gaps.get(0, ()))
+    for idx, item in enumerate(items, 1):
+        filled.append(item)
+        if idx in gaps:
+            filled.extend(gaps[idx])
+    return filled
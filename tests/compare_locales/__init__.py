@@ -10,7 +10,7 @@ import re
 from importlib.resources import files
 from itertools import zip_longest
 
-from l10n_parser import Entity, getParser
+from l10n_parser import Entity, Junk, Parser, getParser
 
 
 class ParserTestMixin:
@@ -51,3 +51,38 @@ class ParserTestMixin:
             else:
                 self.assertIsInstance(entity, ref[0])
                 self.assertIn(ref[1], entity.all)
+
+        # scanKeys() finds the same keys and junk as walk()
+        junk = []
+        self.assertEqual(
+            self.parser.scanKeys(junk),
+            [entity.key for entity in entities if isinstance(entity, Entity)],
+        )
+        self.assertEqual(
+            [j.span for j in junk],
+            [entity.span for entity in entities if isinstance(entity, Junk)],
+        )
+
+        # unescapeValues() decodes the same values as each entity's val
+        fresh = [
+            entity
+            for entity in self.parser.parseUnicode(unicode_content).walk()
+            if isinstance(entity, Entity)
+        ]
+        self.assertEqual(
+            self.parser.unescapeValues(fresh),
+            [entity.val for entity in entities if isinstance(entity, Entity)],
+        )
+
+        if type(self.parser).walk is Parser.walk:
+            # walk() parses in a single pass,
+            # but must match repeated getNext() calls
+            self.parser.readUnicode(unicode_content)
+            ctx = self.parser.ctx
+            offset = 0
+            for entity in entities:
+                next = self.parser.getNext(ctx, offset)
+                self.assertIs(type(next), type(entity))
+                self.assertEqual(next.span, entity.span)
+                offset = next.span[1]
+            self.assertEqual(offset, len(ctx.contents) if ctx else 0)
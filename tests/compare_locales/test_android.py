@@ -4,7 +4,7 @@
 
 import unittest
 
-from l10n_parser import Comment, Junk, Whitespace
+from l10n_parser import Comment, Entity, Junk, Whitespace
 from l10n_parser.android import DocumentWrapper
 
 from . import ParserTestMixin
@@ -110,3 +110,58 @@ class TestAndroidParser(ParserTestMixin, unittest.TestCase):
                 (DocumentWrapper, "</resources>"),
             ),
         )
+
+    def test_positions(self):
+        source = """\
+<?xml version="1.0" encoding="utf-8"?>
+<resources xmlns:xliff="urn:oasis:names:tc:xliff:document:1.2">
+  <!-- Grüße -->
+  <string name="foo">value</string>
+  <string name="bär">a <xliff:g id="x">%s</xliff:g> b</string>
+  <string name="empty"/>
+  <bad>junk</bad>
+</resources>
+"""
+        self.parser.readUnicode(source)
+        entities = list(self.parser.walk())
+        foo, bar, empty = [e for e in entities if isinstance(e, Entity)]
+        self.assertEqual(foo.position(), (4, 3))
+        self.assertEqual(foo.position(-1), (4, 36))
+        self.assertEqual(foo.value_position(), (4, 22))
+        self.assertEqual(foo.pre_comment.position(), (3, 3))
+        self.assertEqual(source[slice(*foo.key_span)], "foo")
+        self.assertEqual(source[slice(*foo.val_span)], "value")
+        self.assertEqual(bar.value_position(), (5, 22))
+        self.assertEqual(source[slice(*bar.key_span)], "bär")
+        self.assertEqual(
+            source[slice(*bar.val_span)], 'a <xliff:g id="x">%s</xliff:g> b'
+        )
+        self.assertEqual(empty.value_position(), (6, 25))
+        self.assertEqual(empty.value_position(-1), (6, 25))
+        (junk,) = [e for e in entities if isinstance(e, Junk)]
+        self.assertEqual(junk.all, "<bad>junk</bad>")
+        self.assertEqual(junk.position(), (7, 3))
+        self.assertEqual(junk.position(-1), (7, 18))
+        self.assertEqual(entities[-1].position(), (8, 1))
+
+    def test_wrap(self):
+        source = """\
+<?xml version="1.0" encoding="utf-8"?>
+<resources>
+  <string name="text">a &amp; b</string>
+  <string name="cdata"><![CDATA[<b>a</b>]]></string>
+  <string name="empty"/>
+</resources>
+"""
+        self.parser.readUnicode(source)
+        text, cdata, empty = list(self.parser)
+        self.assertEqual(
+            text.wrap("x & y").all, '<string name="text">x &amp; y</string>'
+        )
+        self.assertEqual(
+            cdata.wrap("<i>x</i>").all,
+            '<string name="cdata"><![CDATA[<i>x</i>]]></string>',
+        )
+        self.assertEqual(empty.wrap("x").all, '<string name="empty">x</string>')
+        # The parsed entity is not modified
+        self.assertEqual(text.all, '<string name="text">a &amp; b</string>')
@@ -0,0 +1,125 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import shutil
+import tempfile
+import unittest
+from os import makedirs
+from os.path import dirname, join
+
+from l10n_parser import Comparison, ReferenceIndex, compare_locales, parse
+
+reference = {
+    "browser/app.properties": "one = One\ntwo = Two words\nthree = Three\n",
+    "browser/app.ftl": "msg = Message\n  .attr = Attribute\n-term = Term\n",
+    "browser/app.dtd": '<!ENTITY one "One">\n',
+    "browser/.hidden/app.dtd": '<!ENTITY one "One">\n',
+    "readme.txt": "Not localizable",
+}
+
+localizations = {
+    "de": {
+        "browser/app.properties": "one = Eins\ntwo = Two words\nfour = Vier\njunk\n",
+        "browser/app.ftl": "# Comment\nmsg = Message\n  .attr = Attribute\n",
+    },
+    "fr": {
+        "browser/app.properties": "one = Un\ntwo = Deux\nthree = Trois\none = Un\n",
+        "browser/app.ftl": "msg = Message\n  .attr = Attribut\n-term = Terme\n",
+        "browser/app.dtd": '<!ENTITY one "Un">\n<!ENTITY',
+    },
+}
+
+
+class TestReferenceIndex(unittest.TestCase):
+    def test_compare(self):
+        index = ReferenceIndex(
+            parse("app.properties", reference["browser/app.properties"])
+        )
+        self.assertEqual(
+            index.compare(parse("app.properties", "two = Two words\nfour = 4\nx\n")),
+            Comparison(
+                missing=["one", "three"],
+                obsolete=["four"],
+                unchanged=1,
+                junk=1,
+                missing_words=2,
+                unchanged_words=2,
+            ),
+        )
+        self.assertEqual(
+            index.compare(None),
+            Comparison(missing=["one", "two", "three"], missing_words=4),
+        )
+
+    def test_po(self):
+        index = ReferenceIndex(parse("app.po", 'msgid "a"\nmsgstr ""\n'))
+        self.assertEqual(
+            index.compare(parse("app.po", 'msgid "a"\nmsgstr ""\n')),
+            Comparison(missing=[("a", None)], missing_words=1),
+        )
+        self.assertEqual(
+            index.compare(parse("app.po", 'msgid "a"\nmsgstr "A"\n')),
+            Comparison(changed=1, changed_words=1),
+        )
+
+
+class TestCompareLocales(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        for root, files in [("en-US", reference)] + [
+            (locale, files) for locale, files in localizations.items()
+        ]:
+            for name, source in files.items():
+                path = join(self.dir, root, name)
+                makedirs(dirname(path), exist_ok=True)
+                with open(path, "w", encoding="utf-8") as file:
+                    file.write(source)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_compare_locales(self):
+        dirs = {locale: join(self.dir, locale) for locale in localizations}
+        for processes in (1, 2):
+            with self.subTest(processes=processes):
+                results = compare_locales(join(self.dir, "en-US"), dirs, processes)
+                self.assertEqual(list(results), ["de", "fr"])
+                de = results["de"]
+                self.assertEqual(
+                    list(de),
+                    ["browser/app.dtd", "browser/app.ftl", "browser/app.properties"],
+                )
+                self.assertEqual(
+                    de["browser/app.dtd"], Comparison(["one"], [], missing_words=1)
+                )
+                self.assertEqual(
+                    de["browser/app.ftl"],
+                    Comparison(
+                        ["-term"], unchanged=1, missing_words=1, unchanged_words=2
+                    ),
+                )
+                self.assertEqual(
+                    de["browser/app.properties"],
+                    Comparison(
+                        ["three"],
+                        ["four"],
+                        changed=1,
+                        unchanged=1,
+                        junk=1,
+                        missing_words=1,
+                        changed_words=1,
+                        unchanged_words=2,
+                    ),
+                )
+                fr = results["fr"]
+                self.assertEqual(
+                    fr["browser/app.dtd"],
+                    Comparison(changed=1, junk=1, changed_words=1),
+                )
+                self.assertEqual(
+                    fr["browser/app.ftl"], Comparison(changed=2, changed_words=3)
+                )
+                self.assertEqual(
+                    fr["browser/app.properties"], Comparison(changed=3, changed_words=4)
+                )
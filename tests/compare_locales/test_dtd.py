@@ -219,6 +219,38 @@ escaped value">
         self.assertEqual(entity.raw_val, "&unknownEntity;")
         self.assertEqual(entity.val, "&unknownEntity;")
 
+    def test_unescape_values(self):
+        self.parser.readContents(
+            b"""\
+<!ENTITY named "&amp;&lt">
+<!ENTITY tab "&Tab;&#0;&#x9;">
+<!ENTITY plain "no refs">
+<!ENTITY unknown "&unknownEntity;">
+"""
+        )
+        entities = list(self.parser)
+        ref = ["&<", "\t\ufffd\t", "no refs", "&unknownEntity;"]
+        self.assertEqual(self.parser.unescapeValues(entities), ref)
+        self.assertEqual([e.val for e in entities], ref)
+
+        # Values that include the separator, or end next to it
+        self.parser.readUnicode(
+            '<!ENTITY k0 "ult\t\x00">\n<!ENTITY k1 "&#0;">\n'
+            '<!ENTITY k2 "&Tab;\x00&Tab;">\n<!ENTITY k3 "&amp">\n'
+            '<!ENTITY k4 "#38;">\n<!ENTITY k5 "&">\n<!ENTITY k6 "amp;">\n'
+        )
+        entities = list(self.parser)
+        ref = ["ult\t\x00", "\ufffd", "\t\x00\t", "&", "#38;", "&", "amp;"]
+        self.assertEqual(self.parser.unescapeValues(entities), ref)
+        self.assertEqual([e.val for e in entities], ref)
+        self.parser.readUnicode(
+            '<!ENTITY k3 "&amp">\n<!ENTITY k4 "#38;">\n'
+            '<!ENTITY k5 "&">\n<!ENTITY k6 "amp;">\n'
+        )
+        entities = list(self.parser)
+        ref = ["&", "#38;", "&", "amp;"]
+        self.assertEqual(self.parser.unescapeValues(entities), ref)
+
     def test_comment_val(self):
         self.parser.readContents(
             b"""\
@@ -4,11 +4,14 @@
 
 import unittest
 
+from fluent.syntax import FluentParser as FTLParser
+
 from l10n_parser import (
     Comment,
     FluentComment,
     FluentEntity,
     FluentMessage,
+    FluentParser,
     FluentTerm,
     Junk,
     Whitespace,
@@ -329,3 +332,82 @@ msg = value
 
         with self.assertRaises(StopIteration):
             next(entities)
+
+
+class TestFluentEdit(unittest.TestCase):
+    source = """\
+### Resource comment
+
+# Comment
+one = One
+  .attr = Attribute
+
+two = Two
+
+-term = Term
+three = { -term }
+"""
+
+    def assertEdit(self, parser, start, end, text):
+        expected = parser.ctx.contents[:start] + text + parser.ctx.contents[end:]
+        parser.edit(start, end, text)
+        self.assertEqual(parser.ctx.contents, expected)
+        self.assertEqual(
+            parser.getResource().to_json(), FTLParser().parse(expected).to_json()
+        )
+        self.assertEqual(
+            [(type(entry), entry.all) for entry in parser.walk()],
+            [
+                (type(entry), entry.all)
+                for entry in FluentParser().parseUnicode(expected).walk()
+            ],
+        )
+
+    def test_edits(self):
+        edits = [
+            # change a value
+            ("Two", "Zwei"),
+            # add an attribute
+            ("Term\n", "Term\n  .attr = A\n"),
+            # attach a comment
+            ("\n-term", "\n# Term comment\n-term"),
+            # break and fix a message
+            ("three = {", "three = "),
+            ("three = ", "three = {"),
+            # split and join entries
+            ("Zwei\n", "Zwei\nfour = Four\n"),
+            ("Zwei\nfour", "Zwei four"),
+            # indent a message into the previous one
+            ("\nthree", "\n  three"),
+            # add a group comment
+            ("### Resource comment\n", "### Resource comment\n\n## Group\n"),
+        ]
+        parser = FluentParser()
+        parser.readUnicode(self.source)
+        for old, new in edits:
+            with self.subTest(old=old, new=new):
+                start = parser.ctx.contents.index(old)
+                self.assertEdit(parser, start, start + len(old), new)
+
+    def test_ends(self):
+        parser = FluentParser()
+        parser.readUnicode(self.source)
+        self.assertEdit(parser, 0, 0, "zero = Zero\n")
+        end = len(parser.ctx.contents)
+        self.assertEdit(parser, end, end, "four = Four")
+        self.assertEdit(parser, end - 1, end, "")
+        self.assertEdit(parser, 0, len(parser.ctx.contents), "")
+        self.assertEdit(parser, 0, 0, "one = One\n")
+
+    def test_unread(self):
+        parser = FluentParser()
+        parser.edit(0, 0, "one = One\n")
+        self.assertEqual([entity.key for entity in parser], ["one"])
+
+    def test_invalid_range(self):
+        parser = FluentParser()
+        parser.readUnicode(self.source)
+        with self.assertRaises(ValueError):
+            parser.edit(5, 4, "")
+        with self.assertRaises(ValueError):
+            parser.edit(0, len(self.source) + 1, "")
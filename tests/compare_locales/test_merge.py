@@ -0,0 +1,104 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import unittest
+
+from l10n_parser import merge_entries, parse
+from l10n_parser.base import PlaceholderEntity
+
+
+def merged(path, reference, localization, skips=()):
+    ref = parse(path, reference)
+    l10n = parse(path, localization)
+    return "".join(merge_entries(ref, ref.walk(), l10n.walk(), skips))
+
+
+class TestMerge(unittest.TestCase):
+    ref_properties = "# note\none = One\ntwo = Two\nthree = Three\n"
+
+    def test_complete(self):
+        l10n = "one = Eins\ntwo = Zwei\nthree = Drei\n"
+        self.assertEqual(merged("a.properties", self.ref_properties, l10n), l10n)
+
+    def test_missing(self):
+        self.assertEqual(
+            merged("a.properties", self.ref_properties, "two = Zwei"),
+            "two = Zwei\n# note\none = One\nthree = Three\n",
+        )
+
+    def test_junk(self):
+        self.assertEqual(
+            merged("a.properties", self.ref_properties, "one = Eins\njunk\n"),
+            "one = Eins\n\ntwo = Two\nthree = Three\n",
+        )
+
+    def test_skips(self):
+        self.assertEqual(
+            merged(
+                "a.properties",
+                self.ref_properties,
+                "one = Eins\ntwo = Zwei\nthree = Drei\n",
+                skips={"two"},
+            ),
+            "one = Eins\nthree = Drei\n\ntwo = Two\n",
+        )
+
+    def test_placeholder(self):
+        ref = parse("a.properties", self.ref_properties)
+        l10n = parse("a.properties", "one = Eins\ntwo = Zwei\nthree = Drei\n")
+        entries = [
+            PlaceholderEntity(entry.key) if entry.key == "two" else entry
+            for entry in l10n.walk()
+        ]
+        self.assertEqual(
+            "".join(merge_entries(ref, ref.walk(), entries)),
+            "one = Eins\nthree = Drei\n\ntwo = Two\n",
+        )
+
+    def test_skip_only(self):
+        # Android does l10n fallback at runtime, so nothing is added
+        ref = """<?xml version="1.0" encoding="utf-8"?>
+<resources>
+  <string name="one">One</string>
+  <string name="two">Two</string>
+</resources>
+"""
+        l10n = """<?xml version="1.0" encoding="utf-8"?>
+<resources>
+  <string name="one">Eins</string>
+  <string name="two">Zwei</string>
+</resources>
+"""
+        exp = """<?xml version="1.0" encoding="utf-8"?>
+<resources>
+  <string name="one">Eins</string>
+</resources>
+"""
+        self.assertEqual(merged("strings.xml", ref, l10n, skips={"two"}), exp)
+
+    def test_sticky(self):
+        ref = """<?xml version="1.0" encoding="utf-8"?>
+<resources xmlns:tools="http://schemas.android.com/tools">
+  <string name="one">One</string>
+</resources>
+"""
+        l10n = """<?xml version="1.0" encoding="utf-8"?>
+<resources xmlns:tools="http://example.com/tools">
+  <string name="one">Eins</string>
+</resources>
+"""
+        exp = """<?xml version="1.0" encoding="utf-8"?>
+<resources xmlns:tools="http://schemas.android.com/tools">
+  <string name="one">Eins</string>
+</resources>
+"""
+        self.assertEqual(merged("strings.xml", ref, l10n), exp)
+
+    def test_copy(self):
+        ref = "#filter emptyLines\n\n#define one One\n#define two Two\n"
+        l10n = "#define one Eins\n#define two Zwei\n"
+        self.assertEqual(merged("a.inc", ref, l10n), l10n)
+        self.assertEqual(merged("a.inc", ref, "#define one Eins\n"), ref)
+        self.assertEqual(merged("a.inc", ref, l10n, skips={"one"}), ref)
+        self.assertEqual(merged("a.inc", ref, l10n + "junk\n"), ref)
@@ -2,13 +2,15 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
+import re
 import shutil
 import tempfile
 import textwrap
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from os.path import join
 
-from l10n_parser import OffsetComment, Parser
+from l10n_parser import Entity, OffsetComment, Parser, getParser, parse
 
 
 class TestParserContext(unittest.TestCase):
@@ -26,6 +28,30 @@ third line
         self.assertEqual(ctx.linecol(len("first line") + 1), (2, 1))
         self.assertEqual(ctx.linecol(len(ctx.contents)), (4, 1))
 
+    def test_linecols(self):
+        ctx = Parser.Context("first line\nsecond line\n\nfourth line")
+        positions = [0, 5, 10, 11, 22, 23, 24, len(ctx.contents)]
+        expected = [ctx.linecol(pos) for pos in positions]
+        self.assertEqual(
+            expected,
+            [(1, 1), (1, 6), (1, 11), (2, 1), (2, 12), (3, 1), (4, 1), (4, 12)],
+        )
+        self.assertEqual(ctx.linecols(positions), expected)
+        self.assertEqual(ctx.linecols(reversed(positions)), expected[::-1])
+        self.assertEqual(ctx.linecols([]), [])
+
+    def test_search(self):
+        ctx = Parser.Context("a b a b")
+        a = re.compile("a")
+        x = re.compile("x")
+        self.assertEqual(ctx.search(a, 0), 0)
+        self.assertEqual(ctx.search(a, 1), 4)
+        self.assertEqual(ctx.search(a, 3), 4)
+        self.assertEqual(ctx.search(a, 5), -1)
+        self.assertEqual(ctx.search(a, 0), 0)
+        self.assertEqual(ctx.search(x, 0), -1)
+        self.assertEqual(ctx.search(x, 6), -1)
+
     def test_empty_parser(self):
         p = Parser()
         self.assertTupleEqual(tuple(p), tuple())
@@ -72,3 +98,165 @@ class TestUniversalNewlines(unittest.TestCase):
             fh.write(b"one\ntwo\rthree\r\n")
         self.parser.readFile(f)
         self.assertEqual(self.parser.ctx.contents, "one\ntwo\nthree\n")
+
+
+class TestParse(unittest.TestCase):
+    def test_independent(self):
+        shared = getParser("foo.dtd")
+        shared.readUnicode('<!ENTITY shared "Shared">')
+        first = parse("foo.dtd", '<!ENTITY one "One">')
+        second = parse("bar.dtd", b'<!ENTITY two "Two">')
+        self.assertIsNot(first, shared)
+        self.assertIsNot(first.ctx, second.ctx)
+        self.assertEqual([(e.key, e.val) for e in first], [("one", "One")])
+        self.assertEqual([(e.key, e.val) for e in second], [("two", "Two")])
+        self.assertEqual([e.key for e in shared], ["shared"])
+
+    def test_file(self):
+        dir = tempfile.mkdtemp()
+        try:
+            path = join(dir, "file.properties")
+            with open(path, "wb") as fh:
+                fh.write(b"one = One\r\ntwo = Two\r\n")
+            result = parse(path)
+            self.assertEqual(result.ctx.contents, "one = One\ntwo = Two\n")
+            self.assertEqual([e.key for e in result], ["one", "two"])
+        finally:
+            shutil.rmtree(dir)
+
+    def test_threads(self):
+        def keys(n):
+            src = "".join(f'<!ENTITY e{n}.{i} "{i}">\n' for i in range(200))
+            return [entity.key for entity in parse("foo.dtd", src)]
+
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(keys, range(32)))
+        for n, result in enumerate(results):
+            self.assertEqual(result, [f"e{n}.{i}" for i in range(200)])
+
+
+class TestScanKeys(unittest.TestCase):
+    def test_scan_keys(self):
+        cases = [
+            ("foo.properties", "# c\none = 1\ntwo = 2 \\\n  2\n\none = 3\n"),
+            ("foo.dtd", "﻿<!-- c -->\n<!ENTITY one \"1\">\n<!ENTITY one '3'>\n"),
+            ("foo.inc", "# c\n#define one 1\n#define one 3\n"),
+            ("foo.ini", "; c\n[Strings]\none=1\n\n[More]\none=3\n"),
+            ("foo.ftl", "one = 1\n-two = 2\none = 3\n"),
+        ]
+        for path, src in cases:
+            with self.subTest(path=path):
+                parser = parse(path, src)
+                junk = []
+                keys = parser.scanKeys(junk)
+                self.assertEqual(keys, [e.key for e in parser])
+                self.assertEqual(junk, [])
+                self.assertEqual(Parser.countDuplicates(keys), {"one": 2})
+                self.assertEqual(
+                    list(Parser.findDuplicates(parser)), ["one occurs 2 times"]
+                )
+
+    def test_junk(self):
+        parser = parse("foo.properties", "one = 1\njunk\ntwo = 2\n")
+        junk = []
+        self.assertEqual(parser.scanKeys(junk), ["one", "two"])
+        self.assertEqual([j.all for j in junk], ["junk\n"])
+        self.assertEqual(parser.scanKeys(), ["one", "two"])
+
+    def test_empty(self):
+        self.assertEqual(Parser().scanKeys(), [])
+        self.assertEqual(parse("foo.dtd", "").scanKeys(), [])
+
+    def test_fallback(self):
+        # Fragments that can't be skipped when scanning fall back to walking.
+        cases = [
+            ("foo.dtd", "\ufeff"),
+            ("foo.ini", "[a=b]\none=1\n"),
+            ("foo.ftl", "one = 1\n"),
+        ]
+        for path, src in cases:
+            with self.subTest(path=path):
+                parser = parse(path, src)
+                self.assertIsNone(parser._scanKeys(parser.ctx))
+                entities = parser.walk(only_localizable=True)
+                self.assertEqual(
+                    parser.scanKeys(),
+                    [e.key for e in entities if isinstance(e, Entity)],
+                )
+
+
+class TestRewrite(unittest.TestCase):
+    def test_rewrite(self):
+        cases = [
+            (
+                "foo.properties",
+                "# License\n\n# c\none = 1\ntwo = 2 \\\n  2\njunk\nthree = 3\n",
+                {"two": "new", "three": "3 \\u0033"},
+                "# License\n\n# c\none = 1\ntwo = new\njunk\nthree = 3 \\u0033\n",
+            ),
+            (
+                "foo.dtd",
+                "<!-- c -->\n<!ENTITY one \"1\">\n<!ENTITY two '2'>\n",
+                {"one": "&amp;"},
+                "<!-- c -->\n<!ENTITY one \"&amp;\">\n<!ENTITY two '2'>\n",
+            ),
+            (
+                "foo.po",
+                '#. c\nmsgctxt "x"\nmsgid "a"\nmsgstr "b"\n\nmsgid "c"\nmsgstr ""\n',
+                {("c", None): 'msgstr "d"'},
+                '#. c\nmsgctxt "x"\nmsgid "a"\nmsgstr "b"\n\nmsgid "c"\nmsgstr "d"\n',
+            ),
+            (
+                "foo.ftl",
+                "# c\none = 1\n  .attr = A\n\n-two = 2\n",
+                {"one": "{ $n } new", "-two": "3"},
+                "# c\none = { $n } new\n  .attr = A\n\n-two = 3\n",
+            ),
+            (
+                "strings.xml",
+                "<resources>\n  <!-- c -->\n  <string name='one'>1 &amp; 2</string>\n"
+                '  <string name="two"/>\n  <string name="three" />\n</resources>\n',
+                {"one": "&lt;1&gt;", "two": "2"},
+                "<resources>\n  <!-- c -->\n  <string name='one'>&lt;1&gt;</string>\n"
+                '  <string name="two">2</string>\n  <string name="three" />\n'
+                "</resources>\n",
+            ),
+        ]
+        for path, src, changes, exp in cases:
+            with self.subTest(path=path):
+                parser = parse(path, src)
+                self.assertEqual(parser.rewrite({}), src)
+                # The source of each value is the identity change
+                values = {
+                    entity.key: parser.ctx.contents[slice(*entity.val_span)]
+                    for entity in parser
+                    if isinstance(entity, Entity)
+                }
+                self.assertEqual(parser.rewrite(values), src)
+                self.assertEqual(parser.rewrite(changes), exp)
+                # The index is reused
+                self.assertEqual(parser.rewrite(changes), exp)
+
+    def test_duplicates(self):
+        parser = parse("foo.properties", "one = 1\ntwo = 2\none = 3\n")
+        self.assertEqual(parser.rewrite({"one": "x"}), "one = x\ntwo = 2\none = x\n")
+
+    def test_no_value(self):
+        parser = parse("foo.ftl", "one =\n  .attr = A\n")
+        with self.assertRaises(ValueError):
+            parser.rewrite({"one": "1"})
+
+    def test_missing_key(self):
+        parser = parse("foo.properties", "one = 1\n")
+        with self.assertRaises(KeyError):
+            parser.rewrite({"two": "2"})
+        with self.assertRaises(KeyError):
+            Parser().rewrite({"two": "2"})
+        self.assertEqual(Parser().rewrite({}), "")
+
+    def test_reread(self):
+        parser = getParser("foo.properties")
+        parser.readUnicode("one = 1\n")
+        self.assertEqual(parser.rewrite({"one": "x"}), "one = x\n")
+        parser.readUnicode("# c\none = 2\n")
+        self.assertEqual(parser.rewrite({"one": "y"}), "# c\none = y\n")
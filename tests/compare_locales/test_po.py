@@ -3,7 +3,7 @@
 
 import unittest
 
-from l10n_parser import BadEntity, Whitespace
+from l10n_parser import BadEntity, Junk, Whitespace
 
 from . import ParserTestMixin
 
@@ -125,3 +125,34 @@ msgstr ""
             ),
         )
         self.assertListEqual([e.localized for e in self.parser], [True, False])
+
+    def test_junk(self):
+        source = """
+msgid "broken"
+
+msgid "reference"
+msgstr "translated string"
+"""
+        self._test(
+            source,
+            (
+                (Whitespace, "\n"),
+                (Junk, 'msgid "broken"\n\n'),
+                (("reference", None), "translated string"),
+                (Whitespace, "\n"),
+            ),
+        )
+
+        # Junk at the start of the file extends to the next comment, if any.
+        self._test(
+            source.lstrip(),
+            ((Junk, source.lstrip()),),
+        )
+        self._test(
+            source.lstrip().replace("\nmsgid", "\n# comment\nmsgid"),
+            (
+                (Junk, 'msgid "broken"\n\n'),
+                (("reference", None), "translated string", "comment"),
+                (Whitespace, "\n"),
+            ),
+        )
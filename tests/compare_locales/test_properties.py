@@ -126,6 +126,29 @@ seven = \n\r\t\\
         for r, e in zip(ref, self.parser):
             self.assertEqual(e.val, r)
 
+    def test_unescape_values(self):
+        source = rb"""one = some \unicode
+two = \u41
+three = plain
+four = back\\slash
+five = \n\r\t\\ x
+"""
+        ref = ["some unicode", "A", "plain", "back\\slash", "\n\r\t\\ x"]
+        self.parser.readContents(source)
+        entities = list(self.parser)
+        self.assertEqual(self.parser.unescapeValues(entities), ref)
+        self.assertEqual([e.val for e in entities], ref)
+
+        # Values that would unescape to the separator
+        self.parser.readContents(source + rb"six = \u0")
+        entities = list(self.parser)
+        self.assertEqual(self.parser.unescapeValues(entities), ref + ["\0"])
+
+        # A trailing backslash at the end of the file is not an escape
+        self.parser.readContents(source + b"six = end\\")
+        entities = list(self.parser)
+        self.assertEqual(self.parser.unescapeValues(entities), ref + ["end\\"])
+
     def test_trailing_comment(self):
         self._test(
             """first = string
@@ -2,9 +2,18 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
+from copy import deepcopy
 from unittest import TestCase
 
-from moz_l10n import Entry, Resource, Section, add_entries
+from moz_l10n import (
+    Entry,
+    Metadata,
+    Resource,
+    Section,
+    add_entries,
+    add_entries_bulk,
+    get_meta,
+)
 
 
 class TestAddEntries(TestCase):
@@ -92,6 +101,23 @@ class TestAddEntries(TestCase):
             ),
         )
 
+    def test_added_section_meta(self):
+        target = Resource([Section(["1"], [Entry(["foo"], "Foo 1")])])
+        source = Resource(
+            [
+                Section(["0"], [Entry(["x"], "X")]),
+                Section(["2"], [Entry(["y"], "Y")], meta=[Metadata("m", "v")]),
+            ]
+        )
+        self.assertEqual(add_entries(target, source), 2)
+        # Adding a section doesn't create empty meta lists.
+        for section in (target.sections[0], source.sections[0]):
+            self.assertEqual(section.id, ["0"])
+            with self.assertRaises(AttributeError):
+                object.__getattribute__(section, "meta")
+        self.assertEqual(list(get_meta(target.sections[1])), [Metadata("m", "v")])
+        self.assertIsNot(target.sections[1].meta, source.sections[1].meta)
+
     def test_anon_sections(self):
         target = Resource(
             [
@@ -117,3 +143,62 @@ class TestAddEntries(TestCase):
                 ]
             ),
         )
+
+    def test_repeated_additions(self):
+        target = Resource(
+            [Section(["1"], [Entry(["foo"], "Foo 1"), Entry(["bar"], "Bar 1")])]
+        )
+        source = Resource(
+            [
+                Section(["1"], [Entry(["foo"], "Foo 2"), Entry(["a"], "A")]),
+                Section(["2"], [Entry(["x"], "X")]),
+                Section(["1"], [Entry(["foo"], "Foo 2"), Entry(["b"], "B")]),
+                Section(["1"], [Entry(["a"], "A"), Entry(["c"], "C")]),
+                Section(["2"], [Entry(["x"], "X"), Entry(["y"], "Y")]),
+                Section(["3"], [Entry(["z"], "Z")]),
+            ]
+        )
+        self.assertEqual(add_entries(target, source), 6)
+        exp_entries = [
+            Entry(["foo"], "Foo 1"),
+            Entry(["b"], "B"),
+            Entry(["a"], "A"),
+            Entry(["c"], "C"),
+            Entry(["bar"], "Bar 1"),
+        ]
+        self.assertEqual(
+            target,
+            Resource(
+                [
+                    Section(["1"], exp_entries),
+                    Section(["2"], [Entry(["x"], "X"), Entry(["y"], "Y")]),
+                    Section(["3"], [Entry(["z"], "Z")]),
+                ]
+            ),
+        )
+
+    def test_bulk(self):
+        source = Resource(
+            [
+                Section(["0"], [Entry(["x"], "X")]),
+                Section(["1"], [Entry(["foo"], "Foo 2"), Entry(["bar"], "Bar 2")]),
+            ]
+        )
+        exp_source = deepcopy(source)
+
+        def targets():
+            return [
+                Resource([Section(["1"], [Entry(["foo"], "Foo 1")])]),
+                Resource([Section(["0"], [Entry(["x"], "X")])]),
+                Resource([]),
+            ]
+
+        expected = targets()
+        exp_counts = [add_entries(target, source) for target in expected]
+        self.assertEqual(exp_counts, [2, 2, 3])
+        for processes in (1, 2):
+            with self.subTest(processes=processes):
+                tgt = targets()
+                self.assertEqual(add_entries_bulk(tgt, source, processes), exp_counts)
+                self.assertEqual(tgt, expected)
+                self.assertEqual(source, exp_source)
@@ -0,0 +1,180 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import pickle
+import sys
+from os import listdir, utime
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+from unittest import TestCase
+from unittest.mock import patch
+
+from moz_l10n import (
+    Entry,
+    Resource,
+    ResourceCache,
+    Section,
+    load_resources,
+    parse_resource,
+    snapshot_dumps,
+)
+from moz_l10n.cache import PARSER_MODULES, parser_hash
+
+unpickled = False
+
+
+def unpickle_payload() -> None:
+    global unpickled
+    unpickled = True
+
+
+class Payload:
+    def __reduce__(self):
+        return (unpickle_payload, ())
+
+
+class TestResourceCache(TestCase):
+    def setUp(self):
+        self.dir = mkdtemp()
+        self.cache_dir = join(self.dir, "cache")
+
+    def tearDown(self):
+        rmtree(self.dir)
+
+    def test_load(self):
+        cache = ResourceCache(self.cache_dir)
+        source = b"key = Value\n"
+        expected = Resource([Section([], [Entry(["key"], "Value")])])
+        self.assertEqual(cache.load("a.properties", source), expected)
+        self.assertEqual(len(listdir(self.cache_dir)), 1)
+
+        with patch("moz_l10n.cache.parse_resource") as parse:
+            self.assertEqual(cache.load("b.properties", source), expected)
+            other = ResourceCache(self.cache_dir)
+            self.assertEqual(other.load("c.properties", source), expected)
+            parse.assert_not_called()
+
+        # The parser is included in the key
+        self.assertIsNone(cache.get(cache.key("a.ini", source)))
+        self.assertNotEqual(
+            cache.key("a.properties", source), cache.key("a.ftl", source)
+        )
+        self.assertNotEqual(
+            cache.key("a.properties", source), cache.key("a.properties", b"key=x\n")
+        )
+        self.assertEqual(
+            cache.key("a.properties", source), cache.key("b/c.properties", source)
+        )
+
+    def test_parser_change(self):
+        source = b"key = Value\n"
+        ResourceCache(self.cache_dir).load("a.properties", source)
+        with patch("moz_l10n.cache.parser_hash", return_value="changed"):
+            cache = ResourceCache(self.cache_dir)
+            self.assertIsNone(cache.get(cache.key("a.properties", source)))
+
+    def test_parser_hash(self):
+        for name in ("fluent", "ini", "properties"):
+            self.assertIn(f"moz_l10n.{name}.parse", PARSER_MODULES)
+        self.assertEqual(parser_hash(), parser_hash.__wrapped__())
+
+        path = join(self.dir, "test_cache_parser.py")
+        with open(path, "w") as file:
+            file.write("x = 1\n")
+        sys.path.insert(0, self.dir)
+        try:
+            with patch("moz_l10n.cache.PARSER_MODULES", ("test_cache_parser",)):
+                before = parser_hash.__wrapped__()
+                with open(path, "w") as file:
+                    file.write("x = 2\n")
+                self.assertNotEqual(parser_hash.__wrapped__(), before)
+        finally:
+            sys.path.remove(self.dir)
+
+    def test_corrupt_file(self):
+        cache = ResourceCache(self.cache_dir)
+        source = b"key = Value\n"
+        key = cache.key("a.properties", source)
+        cache.load("a.properties", source)
+        path = join(self.cache_dir, key[:2], key)
+        with open(path, "wb") as file:
+            file.write(b"not a pickle")
+        self.assertIsNone(cache.get(key))
+        self.assertEqual(cache.size(), 0)
+        self.assertEqual(
+            cache.load("a.properties", source),
+            parse_resource("a.properties", source),
+        )
+        self.assertIsNotNone(cache.get(key))
+
+    def test_pickled_value(self):
+        cache = ResourceCache(self.cache_dir)
+        source = b"key = Value\n"
+        key = cache.key("a.properties", source)
+        res = Resource([Section([], [Entry(["key"], Payload())])])
+        with self.assertRaises(TypeError):
+            cache.set(key, res)
+        self.assertEqual(cache.size(), 0)
+
+        # A cache file with a pickled value is treated as missing
+        cache.load("a.properties", source)
+        path = join(self.cache_dir, key[:2], key)
+        with open(path, "wb") as file:
+            file.write(snapshot_dumps(res, allow_pickle=True))
+        self.assertIsNone(cache.get(key))
+        self.assertFalse(unpickled)
+        self.assertEqual(cache.size(), 0)
+        self.assertEqual(
+            cache.load("a.properties", source),
+            parse_resource("a.properties", source),
+        )
+
+    def test_eviction(self):
+        cache = ResourceCache(self.cache_dir)
+        keys = []
+        for i in range(10):
+            source = f"key = Value {i}\n".encode()
+            keys.append(cache.key("a.properties", source))
+            cache.load("a.properties", source)
+            path = join(self.cache_dir, keys[-1][:2], keys[-1])
+            utime(path, (i, i))
+        total = cache.size()
+        file_size = total // 10
+
+        # Access the oldest one, making it the most recently used
+        self.assertIsNotNone(cache.get(keys[0]))
+
+        small = ResourceCache(self.cache_dir, max_size=total)
+        small.load("a.properties", b"key = New\n")
+        self.assertLessEqual(small.size(), total * 3 // 4)
+        self.assertGreater(small.size(), total * 3 // 4 - 2 * file_size)
+        self.assertIsNotNone(small.get(keys[0]))
+        self.assertIsNone(small.get(keys[1]))
+        self.assertIsNotNone(small.get(keys[9]))
+
+        small.clear()
+        self.assertEqual(small.size(), 0)
+
+    def test_load_resources(self):
+        paths = []
+        for i in range(4):
+            path = join(self.dir, f"file{i}.properties")
+            with open(path, "wb") as file:
+                file.write(f"key = Value {i}\n".encode())
+            paths.append(path)
+        cache = ResourceCache(self.cache_dir)
+        self.assertIsInstance(pickle.loads(pickle.dumps(cache)), ResourceCache)
+        results = load_resources(paths, processes=2, cache=cache)
+        self.assertEqual(
+            results[paths[1]],
+            Resource([Section([], [Entry(["key"], "Value 1")])]),
+        )
+        self.assertEqual(
+            sum(len(listdir(join(self.cache_dir, d))) for d in listdir(self.cache_dir)),
+            4,
+        )
+        with patch("moz_l10n.cache.parse_resource") as parse:
+            self.assertEqual(load_resources(paths, processes=1, cache=cache), results)
+            parse.assert_not_called()
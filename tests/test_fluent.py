@@ -2,10 +2,13 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
+import pickle
+from copy import deepcopy
 from textwrap import dedent
 from unittest import TestCase
 
 from fluent.syntax import ast as ftl
+from fluent.syntax import serialize
 
 from moz_l10n import (
     CatchallKey,
@@ -13,12 +16,15 @@ from moz_l10n import (
     Entry,
     Expression,
     FunctionAnnotation,
+    IdTable,
     Metadata,
     PatternMessage,
     Resource,
     Section,
     SelectMessage,
+    SharedVariants,
     VariableRef,
+    fluent_astify,
     fluent_parse,
     fluent_parse_message,
     fluent_serialize,
@@ -50,7 +56,7 @@ class TestFluent(TestCase):
         self.assertIsInstance(res.sections[0].entries[0].value, ftl.Pattern)
         self.assertEqual(res.sections[0].entries[1].id, ["key", "attr"])
         self.assertIsInstance(res.sections[0].entries[1].value, ftl.Pattern)
-        self.assertEqual(fluent_serialize(res), source)
+        self.assertEqual("".join(fluent_serialize(res)), source)
 
     def test_equality_same(self):
         source = 'progress = Progress: { NUMBER($num, style: "percent") }.'
@@ -219,7 +225,7 @@ class TestFluent(TestCase):
             ),
         )
         self.assertEqual(
-            fluent_serialize(res),
+            "".join(fluent_serialize(res)),
             dedent(
                 """\
                 ### Resource Comment
@@ -284,7 +290,7 @@ class TestFluent(TestCase):
             ),
         )
         self.assertEqual(
-            fluent_serialize(res, trim_comments=True),
+            "".join(fluent_serialize(res, trim_comments=True)),
             dedent(
                 """\
                 simple = A
@@ -340,7 +346,7 @@ class TestFluent(TestCase):
 
         res.sections[0].entries[1].comment = "comment1"
         self.assertEqual(
-            fluent_serialize(res),
+            "".join(fluent_serialize(res)),
             dedent(
                 """\
                 # attr:
@@ -351,12 +357,13 @@ class TestFluent(TestCase):
             ),
         )
         self.assertEqual(
-            fluent_serialize(res, trim_comments=True), "msg = body\n    .attr = value\n"
+            "".join(fluent_serialize(res, trim_comments=True)),
+            "msg = body\n    .attr = value\n",
         )
 
         res.sections[0].entries[0].comment = "comment0"
         self.assertEqual(
-            fluent_serialize(res),
+            "".join(fluent_serialize(res)),
             dedent(
                 """\
                 # comment0
@@ -369,24 +376,203 @@ class TestFluent(TestCase):
             ),
         )
         self.assertEqual(
-            fluent_serialize(res, trim_comments=True), "msg = body\n    .attr = value\n"
+            "".join(fluent_serialize(res, trim_comments=True)),
+            "msg = body\n    .attr = value\n",
         )
 
+    def test_term(self):
+        res = fluent_parse('-term = Term\n  .gender = x\nmsg = { -term(case: "gen") }')
+        self.assertEqual(res.sections[0].entries[0].id, ["-term"])
+        source = '-term = Term\n    .gender = x\nmsg = { -term(case: "gen") }\n'
+        self.assertEqual("".join(fluent_serialize(res)), source)
+        self.assertEqual(serialize(fluent_astify(res)), source)
+
+        res.sections[0].entries.pop(0)
+        self.assertEqual(
+            "".join(fluent_serialize(res)),
+            '-term = { "" }\n    .gender = x\nmsg = { -term(case: "gen") }\n',
+        )
+
+    def test_partial_nesting(self):
+        source = dedent(
+            """\
+            msg =
+                A { $a ->
+                    [one]
+                        { $b ->
+                            [x] X { $c }
+                           *[y] Y
+                        } B
+                   *[other] O
+                } C
+            """
+        )
+        res = fluent_parse(source, fluent_parse_message)
+        other = CatchallKey("other")
+        message = res.sections[0].entries[0].value
+        self.assertEqual(
+            message,
+            SelectMessage(
+                [
+                    Expression(VariableRef("a"), FunctionAnnotation("number")),
+                    Expression(VariableRef("b"), FunctionAnnotation("string")),
+                ],
+                {
+                    ("one", "x"): ["A X ", Expression(VariableRef("c")), " B C"],
+                    ("one", CatchallKey("y")): ["A Y B C"],
+                    (other, "x"): ["A O C"],
+                    (other, CatchallKey("y")): ["A O C"],
+                },
+            ),
+        )
+        assert isinstance(message, SelectMessage)
+        self.assertEqual(
+            list(message.variants),
+            [
+                ("one", "x"),
+                ("one", CatchallKey("y")),
+                (other, "x"),
+                (other, CatchallKey("y")),
+            ],
+        )
+
+    def test_shared_variants(self):
+        source = dedent(
+            """\
+            msg =
+                A { $a ->
+                    [one]
+                        { $b ->
+                            [x] X { $c }
+                           *[y] Y
+                        } B
+                   *[other] O
+                } C { $d }
+                .attr = { $a ->
+                   *[other] Attr
+                }
+            plain = Plain { $x }
+            """
+        )
+        res = fluent_parse(source, fluent_parse_message)
+        shared_res = fluent_parse(
+            source, lambda pattern: fluent_parse_message(pattern, shared_variants=True)
+        )
+        self.assertEqual(shared_res, res)
+        ftl_str = "".join(fluent_serialize(res))
+        self.assertEqual("".join(fluent_serialize(shared_res)), ftl_str)
+        self.assertEqual(serialize(fluent_astify(shared_res)), ftl_str)
+
+        plain = shared_res.sections[0].entries[2].value
+        self.assertIsInstance(plain, PatternMessage)
+        message = shared_res.sections[0].entries[0].value
+        assert isinstance(message, SelectMessage)
+        variants = message.variants
+        assert isinstance(variants, SharedVariants)
+        other = CatchallKey("other")
+        y = CatchallKey("y")
+        self.assertEqual(
+            list(variants),
+            [("one", "x"), ("one", y), (other, "x"), (other, y)],
+        )
+        self.assertEqual(
+            variants.view((other, "x")),
+            ["A O C ", Expression(VariableRef("d"))],
+        )
+
+        # Expanded patterns do not share their placeholders
+        pattern = variants[(other, "x")]
+        pattern[1].arg = VariableRef("e")
+        pattern.append("!")
+        self.assertEqual(
+            variants[(other, "x")], ["A O C ", Expression(VariableRef("e")), "!"]
+        )
+        self.assertEqual(
+            variants.view((other, y)), ["A O C ", Expression(VariableRef("d"))]
+        )
+        self.assertNotEqual(shared_res, res)
+
+        del variants[("one", "x")]
+        variants[("one", "x")] = ["new"]
+        self.assertEqual(list(variants)[-1], ("one", "x"))
+        self.assertEqual(len(variants), 4)
+
+    def test_shared_variants_mapping(self):
+        other = CatchallKey("other")
+        segments = [("a",), ("b",), (" ", Expression(VariableRef("x")))]
+        variants = SharedVariants(
+            segments,
+            [
+                (("one", "x"), [0, 2]),
+                ((other, "y"), [1]),
+                (("one", "y"), [1, 2]),
+                (("two",), [0]),
+            ],
+        )
+        expected = {
+            ("one", "x"): ["a ", Expression(VariableRef("x"))],
+            (other, "y"): ["b"],
+            ("one", "y"): ["b ", Expression(VariableRef("x"))],
+            ("two",): ["a"],
+        }
+        self.assertEqual(list(variants), list(expected))
+        self.assertEqual(variants, expected)
+        self.assertEqual(dict(variants.view_items()), expected)
+        self.assertEqual(variants.view((CatchallKey(), "y")), ["b"])
+        self.assertIn((other, "y"), variants)
+        self.assertNotIn((other, "x"), variants)
+        self.assertNotIn(("one",), variants)
+        with self.assertRaises(KeyError):
+            variants.view((other, "x"))
+        with self.assertRaises(KeyError):
+            variants[("three",)]
+
+        # Reading and comparing variants does not expand them
+        self.assertEqual(list(variants._raw_items())[0], (("one", "x"), (0, 2)))
+
+        variants[(other, "x")] = ["new"]
+        del variants[("one", "x")]
+        self.assertNotIn(("one", "x"), variants)
+        self.assertEqual(
+            list(variants), [(other, "y"), ("one", "y"), ("two",), (other, "x")]
+        )
+        self.assertEqual(len(variants), 4)
+        self.assertEqual(deepcopy(variants), variants)
+        self.assertEqual(pickle.loads(pickle.dumps(variants)), variants)
+
+    def test_id_table(self):
+        ids = IdTable()
+        source = "msg = Message\n    .attr = Attribute\n-term = Term\n"
+        res1 = fluent_parse(source, id_table=ids)
+        res2 = fluent_parse(source, fluent_parse_message, ids)
+        self.assertEqual(len(ids), 3)
+        entries1 = res1.sections[0].entries
+        entries2 = res2.sections[0].entries
+        self.assertEqual(
+            [entry.id for entry in entries2 if isinstance(entry, Entry)],
+            [["msg"], ["msg", "attr"], ["-term"]],
+        )
+        for e1, e2 in zip(entries1, entries2):
+            assert isinstance(e1, Entry) and isinstance(e2, Entry)
+            self.assertIsNot(e1.id, e2.id)
+            for part1, part2 in zip(e1.id, e2.id):
+                self.assertIs(part1, part2)
+
     def test_meta(self):
         res = fluent_parse("one = foo\ntwo = bar", fluent_parse_message)
         res.sections[0].entries[1].meta = [Metadata("a", 42), Metadata("b", False)]
         try:
-            fluent_serialize(res)
+            "".join(fluent_serialize(res))
             raise Exception("Expected an error")
         except Exception as e:
             self.assertEqual(
                 e.args, ("Metadata requires serialize_metadata parameter",)
             )
         self.assertEqual(
-            fluent_serialize(res, lambda _: None), "one = foo\ntwo = bar\n"
+            "".join(fluent_serialize(res, lambda _: None)), "one = foo\ntwo = bar\n"
         )
         self.assertEqual(
-            fluent_serialize(res, lambda m: f"@{m.key}: {m.value}"),
+            "".join(fluent_serialize(res, lambda m: f"@{m.key}: {m.value}")),
             dedent(
                 """\
                 one = foo
@@ -397,7 +583,7 @@ class TestFluent(TestCase):
             ),
         )
         self.assertEqual(
-            fluent_serialize(res, trim_comments=True), "one = foo\ntwo = bar\n"
+            "".join(fluent_serialize(res, trim_comments=True)), "one = foo\ntwo = bar\n"
         )
 
     def test_junk(self):
@@ -0,0 +1,62 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import sys
+from os.path import dirname
+from subprocess import run
+from unittest import TestCase
+
+import l10n_parser
+import moz_l10n
+
+
+def imported_modules(code: str) -> set[str]:
+    """
+    The modules that are imported by running `code` in a new process.
+    """
+    proc = run(
+        [sys.executable, "-c", f"{code}\nimport sys\nprint(*sys.modules)"],
+        capture_output=True,
+        check=True,
+        cwd=dirname(dirname(__file__)),
+        text=True,
+    )
+    return set(proc.stdout.split())
+
+
+class TestLazyImports(TestCase):
+    def test_moz_l10n(self):
+        modules = imported_modules("import moz_l10n")
+        for name in [
+            "fluent.syntax",
+            "iniparse",
+            "translate.storage.properties",
+            "l10n_parser",
+            "importlib.metadata",
+        ]:
+            self.assertNotIn(name, modules)
+
+        modules = imported_modules("from moz_l10n import properties_parse")
+        self.assertIn("moz_l10n.properties.parse", modules)
+        self.assertNotIn("translate.storage.properties", modules)
+        self.assertNotIn("fluent.syntax", modules)
+
+    def test_l10n_parser(self):
+        modules = imported_modules("import l10n_parser")
+        for name in ["fluent.syntax", "xml.dom.minidom", "l10n_parser.dtd"]:
+            self.assertNotIn(name, modules)
+
+        modules = imported_modules("import l10n_parser; l10n_parser.getParser('a.dtd')")
+        self.assertIn("l10n_parser.dtd", modules)
+        self.assertNotIn("fluent.syntax", modules)
+
+    def test_exports(self):
+        for module in [moz_l10n, l10n_parser]:
+            for name in module.__all__:
+                self.assertIsNotNone(getattr(module, name), name)
+            with self.assertRaises(AttributeError):
+                module.no_such_name
+        self.assertIs(l10n_parser.getParser("a.dtd"), l10n_parser.getParser("b.dtd"))
+        self.assertIsInstance(l10n_parser.getParser("a.dtd"), l10n_parser.DTDParser)
+        self.assertIsInstance(l10n_parser.DTDParser.reKey.pattern, str)
@@ -5,7 +5,17 @@
 from textwrap import dedent
 from unittest import TestCase
 
-from moz_l10n import Comment, Entry, Resource, Section, ini_parse, ini_serialize
+from moz_l10n import (
+    Comment,
+    Entry,
+    IdTable,
+    Metadata,
+    Resource,
+    Section,
+    get_meta,
+    ini_parse,
+    ini_serialize,
+)
 
 # Show full diff in self.assertEqual. https://stackoverflow.com/a/61345284
 # __import__("sys").modules["unittest.util"]._MAX_LENGTH = 999999999
@@ -235,3 +245,31 @@ class TestIni(TestCase):
         self.assertEqual(ini_parse("\n\n"), empty)
         self.assertEqual(ini_parse(" \n\n"), empty)
         self.assertEqual("".join(ini_serialize(empty)), "")
+
+    def test_id_table(self):
+        ids = IdTable()
+        src = "[Strings]\nTitleText=Some Title\n"
+        res1 = ini_parse(src, id_table=ids)
+        res2 = ini_parse(src, id_table=ids)
+        self.assertEqual(res1, res2)
+        self.assertEqual(len(ids), 2)
+        self.assertIs(res1.sections[0].id[0], res2.sections[0].id[0])
+        entry1 = res1.sections[0].entries[0]
+        entry2 = res2.sections[0].entries[0]
+        assert isinstance(entry1, Entry) and isinstance(entry2, Entry)
+        self.assertIs(entry1.id[0], entry2.id[0])
+
+    def test_unset_meta(self):
+        res = ini_parse("[Strings]\nTitleText=Some Title\n")
+        section = res.sections[0]
+        entry = section.entries[0]
+        assert isinstance(entry, Entry)
+        self.assertEqual(
+            "".join(ini_serialize(res)), "[Strings]\nTitleText = Some Title\n"
+        )
+        for node in (res, section, entry):
+            self.assertEqual(get_meta(node), ())
+            with self.assertRaises(AttributeError):
+                object.__getattribute__(node, "meta")
+        entry.meta.append(Metadata("key", "value"))
+        self.assertEqual(get_meta(entry), [Metadata("key", "value")])
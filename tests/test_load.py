@@ -0,0 +1,169 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+from os import makedirs
+from os.path import dirname, join
+from shutil import rmtree
+from tempfile import mkdtemp
+from unittest import TestCase
+
+from moz_l10n import (
+    Entry,
+    LazyEntry,
+    PatternMessage,
+    Resource,
+    Section,
+    count_duplicate_ids,
+    load_resources,
+    parse_resource,
+    scan_resource_ids,
+)
+
+files = {
+    "app.ftl": b"# Comment\nmsg = Message\n",
+    "app.properties": b"key = Value\n",
+    "app.ini": b"[Strings]\nTitle=Some Title\n",
+    "sub/app.dtd": b'<!-- Note -->\n<!ENTITY key "A &amp; B">\n',
+    "sub/defines.inc": b"# Comment\n#define NAME Value\n",
+    "sub/res/values/strings.xml": b'<?xml version="1.0"?>\n<resources>\n  <string name="key">Value</string>\n</resources>\n',
+    "sub/messages.po": b'msgctxt "ctx"\nmsgid "id"\nmsgstr "str"\n',
+    "sub/broken.dtd": b"<!ENTITY key 'Value'\n",
+    "sub/unsupported.txt": b"Not parsed\n",
+    ".hg/hidden.ftl": b"msg = Hidden\n",
+}
+
+
+class TestLoad(TestCase):
+    def setUp(self):
+        self.dir = mkdtemp()
+        for name, source in files.items():
+            path = join(self.dir, name)
+            makedirs(dirname(path), exist_ok=True)
+            with open(path, "wb") as file:
+                file.write(source)
+
+    def tearDown(self):
+        rmtree(self.dir)
+
+    def test_parse_resource(self):
+        self.assertEqual(
+            parse_resource("app.ftl", files["app.ftl"]),
+            Resource(
+                [
+                    Section(
+                        [],
+                        [Entry(["msg"], PatternMessage(["Message"]), "Comment")],
+                    )
+                ]
+            ),
+        )
+        self.assertEqual(
+            parse_resource(join(self.dir, "sub/app.dtd")),
+            Resource([Section([], [Entry(["key"], "A & B", "Note")])]),
+        )
+        self.assertEqual(
+            parse_resource("defines.inc", files["sub/defines.inc"]),
+            Resource([Section([], [Entry(["NAME"], "Value", "Comment")])]),
+        )
+        self.assertEqual(
+            parse_resource("messages.po", files["sub/messages.po"]),
+            Resource([Section([], [Entry(["id", "ctx"], "str")])]),
+        )
+        with self.assertRaises(Exception):
+            parse_resource("broken.dtd", files["sub/broken.dtd"])
+        with self.assertRaises(UserWarning):
+            parse_resource("unsupported.txt", files["sub/unsupported.txt"])
+
+    def test_parse_resource_lazy(self):
+        for name in ("app.ftl", "app.properties", "sub/app.dtd"):
+            with self.subTest(name=name):
+                res = parse_resource(name, files[name], lazy=True)
+                self.assertEqual(res, parse_resource(name, files[name]))
+                entry = res.sections[0].entries[0]
+                self.assertEqual(
+                    isinstance(entry, LazyEntry), name.endswith(".properties")
+                )
+
+    def test_scan_resource_ids(self):
+        for name, source in files.items():
+            if name.startswith(".") or name.endswith(("broken.dtd", ".txt")):
+                continue
+            with self.subTest(name=name):
+                res = parse_resource(name, source)
+                self.assertEqual(
+                    scan_resource_ids(name, source),
+                    [
+                        tuple(section.id + entry.id)
+                        for section in res.sections
+                        for entry in section.entries
+                        if isinstance(entry, Entry)
+                    ],
+                )
+        self.assertEqual(
+            scan_resource_ids("app.ini", files["app.ini"]), [("Strings", "Title")]
+        )
+        self.assertEqual(
+            scan_resource_ids("messages.po", files["sub/messages.po"]), [("id", "ctx")]
+        )
+        self.assertEqual(
+            scan_resource_ids("app.ftl", b"-term = T\nmsg =\n  .attr = A\n"),
+            [("-term",), ("msg", "attr")],
+        )
+        with self.assertRaises(Exception):
+            scan_resource_ids("broken.dtd", files["sub/broken.dtd"])
+        with self.assertRaises(Exception):
+            scan_resource_ids("broken.ftl", b"msg = A\n{junk\n")
+        with self.assertRaises(UserWarning):
+            scan_resource_ids("unsupported.txt", files["sub/unsupported.txt"])
+
+    def test_count_duplicate_ids(self):
+        ids = scan_resource_ids("app.properties", b"a = 1\nb = 2\na = 3\nb = 4\na=5\n")
+        self.assertEqual(count_duplicate_ids(ids), {("a",): 3, ("b",): 2})
+        self.assertEqual(count_duplicate_ids([("a",), ("b",)]), {})
+
+    def test_load_resources(self):
+        results = load_resources(self.dir, processes=1)
+        self.assertEqual(
+            list(results),
+            [
+                join(self.dir, name)
+                for name in [
+                    "app.ftl",
+                    "app.ini",
+                    "app.properties",
+                    "sub/app.dtd",
+                    "sub/broken.dtd",
+                    "sub/defines.inc",
+                    "sub/messages.po",
+                    "sub/res/values/strings.xml",
+                ]
+            ],
+        )
+        self.assertIsInstance(results[join(self.dir, "sub/broken.dtd")], Exception)
+        self.assertEqual(
+            results[join(self.dir, "sub/res/values/strings.xml")],
+            Resource([Section([], [Entry(["key"], "Value")])]),
+        )
+        self.assertEqual(
+            results[join(self.dir, "app.ini")],
+            Resource([Section(["Strings"], [Entry(["Title"], "Some Title")])]),
+        )
+
+        pool_results = load_resources(self.dir, processes=2)
+        self.assertEqual(list(pool_results), list(results))
+        for path, resource in results.items():
+            if isinstance(resource, Exception):
+                self.assertIsInstance(pool_results[path], Exception)
+            else:
+                self.assertEqual(pool_results[path], resource)
+
+    def test_load_paths(self):
+        paths = [join(self.dir, "app.properties"), join(self.dir, "missing.ftl")]
+        results = load_resources(paths, processes=1)
+        self.assertEqual(
+            results[paths[0]],
+            Resource([Section([], [Entry(["key"], "Value")])]),
+        )
+        self.assertIsInstance(results[paths[1]], FileNotFoundError)
+        self.assertEqual(list(load_resources([])), [])
@@ -2,11 +2,27 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
+from dataclasses import replace
 from importlib.resources import files
+from io import StringIO
 from textwrap import dedent
 from unittest import TestCase
 
-from moz_l10n import Entry, Resource, Section, properties_parse, properties_serialize
+from moz_l10n import (
+    Comment,
+    Entry,
+    IdTable,
+    LazyEntry,
+    Resource,
+    Section,
+    detach_entries,
+    get_meta,
+    properties_iter_entries,
+    properties_parse,
+    properties_serialize,
+    snapshot_dumps,
+    snapshot_loads,
+)
 
 
 class TestProperties(TestCase):
@@ -260,3 +276,195 @@ two_lines_triple = This line is one of two and ends in \\and still has another l
         self.assertEqual(
             "".join(properties_serialize(res, trim_comments=True)), "foo = value\n"
         )
+
+    def test_comment_styles(self):
+        src = dedent(
+            """\
+            ! bang comment
+            // slash comment
+            /* block
+               comment */
+            # hash comment
+            key value with spaces
+            colon: value
+            escaped\\=key = value
+            a\\ b = c
+            """
+        )
+        res = properties_parse(src)
+        self.assertEqual(
+            res,
+            Resource(
+                [
+                    Section(
+                        [],
+                        [
+                            Entry(["key"], "value with spaces", comment="hash comment"),
+                            Entry(["colon"], "value"),
+                            Entry(["escaped\\=key"], "value"),
+                            Entry(["a\\ b"], "c"),
+                        ],
+                    )
+                ]
+            ),
+        )
+
+    def test_standalone_comments(self):
+        src = dedent(
+            """\
+            # header
+
+            # standalone
+
+            # attached
+
+            key = value
+            # trailing
+            """
+        )
+        res = properties_parse(src)
+        self.assertEqual(
+            res,
+            Resource(
+                [
+                    Section(
+                        [],
+                        [
+                            Entry(["key"], "value", comment="standalone\nattached"),
+                            Comment("trailing"),
+                        ],
+                    )
+                ],
+                comment="header",
+            ),
+        )
+
+    def test_escapes(self):
+        src = r"key = ä\N{BULLET}\u0001\q\'"
+        res = properties_parse(src)
+        self.assertEqual(res, Resource([Section([], [Entry(["key"], "ä•\\u0001q'")])]))
+
+    def test_encoding(self):
+        res = properties_parse("\ufeffkey = ä".encode("utf-8"))
+        self.assertEqual(res, Resource([Section([], [Entry(["key"], "ä")])]))
+        res = properties_parse("key = ä".encode("iso-8859-1"), encoding="iso-8859-1")
+        self.assertEqual(res, Resource([Section([], [Entry(["key"], "ä")])]))
+
+    def test_iter_entries(self):
+        src = dedent(
+            """\
+            # header
+
+            one = first
+            # comment
+            two = multi \\
+                  line \\
+                  value
+
+            # trailing
+            """
+        )
+        for chunk_size in (1, 2, 3, 5, 8, 100):
+            with self.subTest(chunk_size=chunk_size):
+                entries = list(properties_iter_entries(StringIO(src), None, chunk_size))
+                self.assertEqual(
+                    entries,
+                    [
+                        Comment("header"),
+                        Entry(["one"], "first"),
+                        Entry(["two"], "multi line value", comment="comment"),
+                        Comment("trailing"),
+                    ],
+                )
+        res = properties_parse(src)
+        self.assertEqual(res.comment, "header")
+        self.assertEqual(res.sections[0].entries, entries[1:])
+
+    def test_id_table(self):
+        ids = IdTable()
+        src = "one = first\ntwo = second\n"
+        res1 = properties_parse(src, id_table=ids)
+        res2 = properties_parse(src.encode(), id_table=ids)
+        self.assertEqual(res1, res2)
+        self.assertEqual(len(ids), 2)
+        for e1, e2 in zip(res1.sections[0].entries, res2.sections[0].entries):
+            assert isinstance(e1, Entry) and isinstance(e2, Entry)
+            self.assertIsNot(e1.id, e2.id)
+            self.assertIs(e1.id[0], e2.id[0])
+        entries = list(properties_iter_entries(StringIO(src), id_table=ids))
+        self.assertIs(entries[1].id[0], res1.sections[0].entries[1].id[0])
+
+    def test_unset_meta(self):
+        res = properties_parse("one = first\n")
+        entry = res.sections[0].entries[0]
+        assert isinstance(entry, Entry)
+        self.assertEqual("".join(properties_serialize(res)), "one = first\n")
+        for node in (res, res.sections[0], entry):
+            self.assertEqual(get_meta(node), ())
+
+    def test_lazy(self):
+        src = dedent(
+            """\
+            # header
+
+            one = first
+            # comment
+            #
+            # more
+            two = multi \\
+                  line \\
+                \\u00e4 value
+            three
+              four =\t\\
+            \\\\
+            five : \\
+            """
+        ).replace("\n", "\r\n", 3)
+        res = properties_parse(src, lazy=True)
+        self.assertEqual(res, properties_parse(src))
+        entries = res.sections[0].entries
+        self.assertEqual(len(entries), 5)
+        for entry in entries:
+            assert isinstance(entry, LazyEntry)
+            self.assertIsNotNone(entry._source)
+        self.assertEqual(
+            [entry.comment for entry in entries if isinstance(entry, Entry)],
+            ["", "comment\n\nmore", "", "", ""],
+        )
+        self.assertEqual(
+            "".join(properties_serialize(res)),
+            "".join(properties_serialize(properties_parse(src))),
+        )
+
+        parsed: list[str] = []
+
+        def parse_message(source: str) -> str:
+            parsed.append(source)
+            return source.upper()
+
+        res = properties_parse(src, parse_message=parse_message, lazy=True)
+        self.assertEqual(parsed, [])
+        entry = res.sections[0].entries[1]
+        assert isinstance(entry, LazyEntry)
+        self.assertEqual(entry.value, "MULTI LINE Ä VALUE")
+        self.assertEqual(entry.value, "MULTI LINE Ä VALUE")
+        self.assertEqual(parsed, ["multi line ä value"])
+        entry.value = "changed"
+        detach_entries(res)
+        self.assertIsNone(entry._source)
+        self.assertEqual(entry, Entry(["two"], "changed", "comment\n\nmore"))
+        self.assertEqual(get_meta(entry), ())
+        loaded = snapshot_loads(snapshot_dumps(res))
+        self.assertEqual(loaded, res)
+        self.assertIs(type(loaded.sections[0].entries[1]), Entry)
+
+    def test_lazy_replace(self):
+        res = properties_parse("# note\none = first\n", lazy=True)
+        entry = res.sections[0].entries[0]
+        assert isinstance(entry, LazyEntry)
+        replaced = replace(entry, value="changed")
+        self.assertIs(type(replaced), Entry)
+        self.assertEqual(replaced, Entry(["one"], "changed", "note"))
+        self.assertEqual(entry.value, "first")
+        self.assertIsNotNone(entry._source)
+        self.assertIs(type(replace(replaced, id=["two"])), Entry)
@@ -0,0 +1,60 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import pickle
+from copy import copy, deepcopy
+from unittest import TestCase
+
+from moz_l10n import Entry, Metadata, Resource, Section, get_meta, properties_parse
+
+
+class TestLazyMeta(TestCase):
+    def nodes(self):
+        entry = Entry(["key"], "value")
+        section = Section(["section"], [entry])
+        resource = Resource([section])
+        return resource, section, entry
+
+    def test_compare(self):
+        a = self.nodes()
+        b = self.nodes()
+        for x, y in zip(a, b):
+            self.assertEqual(x, y)
+        meta = [Metadata("k", "v")]
+        self.assertEqual(a[2], Entry(["key"], "value", meta=[]))
+        self.assertNotEqual(a[2], Entry(["key"], "value", meta=meta))
+        self.assertNotEqual(a[1], Section(["section"], [a[2]], meta=meta))
+        self.assertNotEqual(a[0], Resource([a[1]], meta=meta))
+        self.assertEqual(
+            repr(a[2]), "Entry(id=['key'], value='value', comment='', meta=[])"
+        )
+        for node in a + b:
+            self.assertEqual(get_meta(node), ())
+
+    def test_pickle_and_copy(self):
+        nodes = self.nodes()
+        copies = [
+            pickle.loads(pickle.dumps(nodes[0])),
+            copy(nodes[0]),
+            deepcopy(nodes[0]),
+        ]
+        for res in copies:
+            self.assertEqual(res, nodes[0])
+            section = res.sections[0]
+            for node in (res, section, section.entries[0]):
+                self.assertEqual(get_meta(node), ())
+        for node in nodes:
+            self.assertEqual(get_meta(node), ())
+
+    def test_pickle_meta(self):
+        entry = Entry(["key"], "value", meta=[Metadata("k", "v")])
+        self.assertEqual(get_meta(pickle.loads(pickle.dumps(entry))), entry.meta)
+        self.assertEqual(get_meta(deepcopy(entry)), entry.meta)
+
+    def test_lazy_entry(self):
+        res = properties_parse("key = value\n", lazy=True)
+        res2 = pickle.loads(pickle.dumps(res))
+        self.assertEqual(res2, res)
+        self.assertEqual(res2.sections[0].entries[0].value, "value")
+        self.assertEqual(get_meta(res.sections[0].entries[0]), ())
@@ -0,0 +1,255 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import pickle
+from textwrap import dedent
+from unittest import TestCase
+
+from fluent.syntax import ast as ftl
+
+from moz_l10n import (
+    CatchallKey,
+    Comment,
+    Declaration,
+    Entry,
+    Expression,
+    FunctionAnnotation,
+    Markup,
+    Metadata,
+    PatternMessage,
+    Resource,
+    Section,
+    SelectMessage,
+    SharedVariants,
+    UnsupportedAnnotation,
+    UnsupportedStatement,
+    VariableRef,
+    fluent_parse,
+    fluent_parse_message,
+    properties_parse,
+    snapshot_dumps,
+    snapshot_loads,
+)
+
+
+def round_trip(res: Resource, allow_pickle: bool = False) -> Resource:
+    return snapshot_loads(snapshot_dumps(res, allow_pickle), allow_pickle)
+
+
+class TestSnapshot(TestCase):
+    def test_messages(self):
+        x = Expression(VariableRef("x"), FunctionAnnotation("number"))
+        res = Resource(
+            [
+                Section(
+                    [],
+                    [
+                        Entry(["plain"], PatternMessage(["Plain"]), "Note"),
+                        Comment("Standalone"),
+                        Entry(
+                            ["pattern", "attr"],
+                            PatternMessage(
+                                [
+                                    "A ",
+                                    Expression("lit", attributes={"a": None}),
+                                    Markup("open", "b", {"o": VariableRef("y")}),
+                                    Expression(
+                                        None,
+                                        FunctionAnnotation(
+                                            "f", {"a": "1", "b": VariableRef("z")}
+                                        ),
+                                        {"c": "2", "d": VariableRef("w")},
+                                    ),
+                                    Markup("close", "b", attributes={"at": "v"}),
+                                    Expression(None, UnsupportedAnnotation("^x")),
+                                    Markup("standalone", "br"),
+                                ],
+                                [
+                                    Declaration("y", Expression(VariableRef("x"))),
+                                    UnsupportedStatement(".x", None, [x]),
+                                    UnsupportedStatement(".y", "body", []),
+                                ],
+                            ),
+                        ),
+                        Entry(
+                            ["select"],
+                            SelectMessage(
+                                [x, Expression(VariableRef("y"))],
+                                {
+                                    ("one", "a"): ["One ", x],
+                                    ("one", CatchallKey()): ["One other"],
+                                    (CatchallKey("other"), CatchallKey()): [],
+                                },
+                                [Declaration("z", x)],
+                            ),
+                        ),
+                        Entry(["string"], "Value"),
+                        Entry(["none"], None),
+                        Entry(["other"], 42),
+                    ],
+                    "Section comment",
+                    [Metadata("m", "v")],
+                ),
+                Section(["section"], [Entry(["key"], "\U0001f600 \ud800 \0")]),
+            ],
+            "Resource comment",
+            [Metadata("a", None), Metadata("b", [1, 2])],
+        )
+        res2 = round_trip(res, allow_pickle=True)
+        self.assertEqual(res2, res)
+        self.assertEqual(repr(res2), repr(res))
+        sel = res2.sections[0].entries[3].value
+        assert isinstance(sel, SelectMessage)
+        keys = list(sel.variants)
+        self.assertIsNone(keys[1][1].value)
+        self.assertEqual(keys[2][0].value, "other")
+
+    def test_fluent(self):
+        source = dedent(
+            """\
+            # Comment
+
+            ## Group comment
+
+            msg =
+                A { $a ->
+                    [one]
+                        { $b ->
+                            [x] X { $c }
+                           *[y] Y
+                        } B
+                   *[other] O
+                } C { $d }
+                .attr = { NUMBER($a, minimumFractionDigits: 2) ->
+                   *[other] Attr { -term(case: "gen") }
+                }
+            -term = Term
+            """
+        )
+        res = fluent_parse(source, fluent_parse_message)
+        self.assertEqual(round_trip(res), res)
+
+        # Without a message parser, values can only be stored with pickle
+        ftl_res = fluent_parse(source)
+        with self.assertRaisesRegex(TypeError, "Pattern"):
+            snapshot_dumps(ftl_res)
+        ftl_res2 = round_trip(ftl_res, allow_pickle=True)
+        value = ftl_res.sections[1].entries[0].value
+        value2 = ftl_res2.sections[1].entries[0].value
+        self.assertIsInstance(value2, ftl.Pattern)
+        self.assertTrue(value2.equals(value))
+
+    def test_shared_variants(self):
+        source = dedent(
+            """\
+            msg =
+                A { $a ->
+                    [one] One
+                   *[other] { $b ->
+                        [x] X
+                       *[y] Y { $c }
+                    }
+                } B { $d }
+            """
+        )
+        res = fluent_parse(
+            source, lambda pattern: fluent_parse_message(pattern, shared_variants=True)
+        )
+        message = res.sections[0].entries[0].value
+        assert isinstance(message, SelectMessage)
+        variants = message.variants
+        assert isinstance(variants, SharedVariants)
+        keys = list(variants)
+        variants[keys[1]].append("!")
+
+        res2 = round_trip(res)
+        self.assertEqual(res2, res)
+        message2 = res2.sections[0].entries[0].value
+        assert isinstance(message2, SelectMessage)
+        variants2 = message2.variants
+        assert isinstance(variants2, SharedVariants)
+        self.assertEqual(list(variants2), keys)
+        self.assertEqual(len(variants2.segments), len(variants.segments))
+        self.assertEqual(variants2.view(keys[1])[-1], "!")
+
+        # Shared placeholders are loaded only once
+        d = variants2.view(keys[0])[-1]
+        self.assertIsInstance(d, Expression)
+        self.assertIs(variants2.view(keys[2])[-1], d)
+
+    def test_large(self):
+        source = "".join(f"key{i} = Value {i % 300}\n" for i in range(100_000))
+        res = properties_parse(source)
+        data = snapshot_dumps(res)
+        self.assertEqual(snapshot_loads(data), res)
+        self.assertLess(len(data), len(pickle.dumps(res)) // 4)
+
+    def test_entry_groups(self):
+        # Entries with single-string values and no metadata are loaded in bulk,
+        # grouped by their value type and id length.
+        entries: list[Entry | Comment] = []
+        for i in range(20):
+            entries.append(Entry([f"str{i}"], f"value {i}"))
+            if i % 2:
+                entries.append(Entry(["two", f"part{i}"], f"value {i}"))
+            if i % 3 == 0:
+                entries.append(Entry([f"text{i}"], PatternMessage([f"text {i}"])))
+            if i % 5 == 0:
+                entries.append(Comment(f"comment {i}"))
+                entries.append(Entry([f"meta{i}"], "x", meta=[Metadata("m", "v")]))
+            if i == 7:
+                entries.append(Entry(["small", "group", "here"], "y"))
+        res = Resource([Section([], entries), Section(["empty"], [])])
+        res2 = round_trip(res)
+        self.assertEqual(res2, res)
+        self.assertEqual(
+            [repr(entry) for entry in res2.sections[0].entries],
+            [repr(entry) for entry in entries],
+        )
+
+    def test_meta_not_created(self):
+        res = Resource([Section([], [Entry(["key"], "value")])])
+        res2 = round_trip(res)
+        for node in (res, res2):
+            # Neither dumping nor loading creates empty meta lists
+            for obj in (node, node.sections[0], node.sections[0].entries[0]):
+                with self.assertRaises(AttributeError):
+                    object.__getattribute__(obj, "meta")
+        self.assertEqual(res2.sections[0].entries[0].meta, [])
+
+    def test_string_separators(self):
+        # Strings are separated by the first character that none of them contain,
+        # or stored with their lengths if every candidate is used.
+        for chars in ["", "\0", "\0\x1f\ufffe", "\0\x1f\ufffe\uffff"]:
+            res = Resource(
+                [Section([], [Entry([f"key{c}"], f"a{c}b") for c in chars])],
+            )
+            data = snapshot_dumps(res)
+            self.assertEqual(snapshot_loads(data), res)
+            with self.assertRaises(ValueError):
+                snapshot_loads(data[:-1])
+
+    def test_pickle(self):
+        res = Resource([Section([], [Entry(["key"], 42)])])
+        with self.assertRaisesRegex(TypeError, "int"):
+            snapshot_dumps(res)
+        meta_res = Resource([], meta=[Metadata("key", 42)])
+        with self.assertRaisesRegex(TypeError, "int"):
+            snapshot_dumps(meta_res)
+        data = snapshot_dumps(res, allow_pickle=True)
+        with self.assertRaisesRegex(ValueError, "pickled"):
+            snapshot_loads(data)
+        self.assertEqual(snapshot_loads(data, allow_pickle=True), res)
+
+    def test_invalid(self):
+        data = snapshot_dumps(properties_parse("a = b\nc = d\n# x\ne = f\ng = h\n"))
+        with self.assertRaisesRegex(ValueError, "Not a resource snapshot"):
+            snapshot_loads(b"not a snapshot")
+        with self.assertRaisesRegex(ValueError, "Unsupported .* version"):
+            snapshot_loads(data[:8] + b"\x7f" + data[9:])
+        for end in range(8, len(data)):
+            with self.assertRaises(ValueError):
+                snapshot_loads(data[:end])
+        with self.assertRaisesRegex(ValueError, "Unexpected data"):
+            snapshot_loads(data + b"\0")